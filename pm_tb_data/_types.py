@@ -1,6 +1,31 @@
-from typing import Literal
+from typing import Literal, NamedTuple
 
 Hemisphere = Literal["north", "south"]
 
 NORTH: Hemisphere = "north"
 SOUTH: Hemisphere = "south"
+
+
+class Window(NamedTuple):
+    """A row/column window into a 2D grid.
+
+    Like python slices, start indices are inclusive and stop indices are
+    exclusive.
+    """
+
+    row_start: int
+    row_stop: int
+    col_start: int
+    col_stop: int
+
+    @property
+    def row_slice(self) -> slice:
+        return slice(self.row_start, self.row_stop)
+
+    @property
+    def col_slice(self) -> slice:
+        return slice(self.col_start, self.col_stop)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.row_stop - self.row_start, self.col_stop - self.col_start)
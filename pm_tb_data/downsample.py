@@ -0,0 +1,139 @@
+"""NaN-aware block downsampling of gridded TBs.
+
+E.g., to average 3.125km CETB TBs onto the 6.25km grid, or 12.5km NSIDC-0001
+TBs onto the 25km grid, each output grid cell is the mean of the valid (non-NaN)
+values in a `factor`-by-`factor` block of input grid cells.
+
+Blocks are accumulated as a sum and a count of valid values, one block offset
+at a time. Only output-sized temporaries are allocated, instead of the
+full-size (NaN-replaced) copies made by e.g., `np.nanmean`.
+"""
+
+from collections.abc import Hashable
+
+import numpy as np
+import numpy.typing as npt
+import xarray as xr
+
+
+def _get_factors(factor: int | tuple[int, int]) -> tuple[int, int]:
+    row_factor, col_factor = (factor, factor) if isinstance(factor, int) else factor
+    if row_factor < 1 or col_factor < 1:
+        raise ValueError(f"Downsampling factors must be positive integers: {factor}")
+
+    return row_factor, col_factor
+
+
+def block_downsample(
+    data: npt.ArrayLike,
+    *,
+    factor: int | tuple[int, int],
+    min_valid: int = 1,
+    dtype: npt.DTypeLike = np.float32,
+) -> npt.NDArray:
+    """Average `factor`-sized blocks of the last two (row, column) dims of `data`.
+
+    `factor` is either a single integer factor for both dims, or a
+    `(row_factor, col_factor)` tuple. The grid does not need to be square, but
+    its shape must be divisible by the factors.
+
+    NaNs are ignored. Output cells with fewer than `min_valid` valid input
+    cells are NaN. The output (and the accumulation) uses `dtype`, which must
+    be a floating point dtype (to hold NaN), or a `ValueError` is raised.
+    """
+    if not np.issubdtype(dtype, np.floating):
+        raise ValueError(f"{dtype=} must be a floating point dtype.")
+    data = np.asarray(data)
+    row_factor, col_factor = _get_factors(factor)
+    *leading_shape, num_rows, num_cols = data.shape
+    if num_rows % row_factor or num_cols % col_factor:
+        raise ValueError(
+            f"Grid shape {(num_rows, num_cols)} is not divisible by the"
+            f" downsampling factors {(row_factor, col_factor)}."
+        )
+    if not 1 <= min_valid <= row_factor * col_factor:
+        raise ValueError(
+            f"{min_valid=} must be between 1 and the number of cells in a block"
+            f" ({row_factor * col_factor})."
+        )
+
+    out_shape = (*leading_shape, num_rows // row_factor, num_cols // col_factor)
+    total = np.zeros(out_shape, dtype=dtype)
+    count = np.zeros(out_shape, dtype=np.min_scalar_type(row_factor * col_factor))
+    valid = np.empty(out_shape, dtype=bool)
+    for row_offset in range(row_factor):
+        for col_offset in range(col_factor):
+            # A strided view of one cell from each block.
+            cells = data[..., row_offset::row_factor, col_offset::col_factor]
+            np.isnan(cells, out=valid)
+            np.logical_not(valid, out=valid)
+            np.add(total, cells, out=total, where=valid)
+            count += valid
+
+    np.greater_equal(count, min_valid, out=valid)
+    np.divide(total, count, out=total, where=valid)
+    np.logical_not(valid, out=valid)
+    np.copyto(total, np.nan, where=valid)
+
+    return total
+
+
+def _get_grid_dims(tbs: xr.Dataset) -> tuple[Hashable, Hashable]:
+    """Return the (row, column) grid dims: the last two dims of the first TBs."""
+    for data_var in tbs.data_vars.values():
+        if data_var.ndim >= 2:
+            row_dim, col_dim = data_var.dims[-2:]
+            return row_dim, col_dim
+
+    raise ValueError("No gridded (2 or more dimensional) variables to downsample.")
+
+
+def block_downsample_tbs(
+    tbs: xr.Dataset,
+    *,
+    factor: int | tuple[int, int],
+    min_valid: int = 1,
+    dtype: npt.DTypeLike = np.float32,
+) -> xr.Dataset:
+    """Downsample each TB variable in `tbs` (see `block_downsample`).
+
+    The grid dims are the last two dims of the first variable with at least
+    two dims. Each variable whose last two dims are the grid dims is
+    downsampled, keeping its attrs. Variables without the grid dims (e.g.,
+    scalars or a CRS variable) are kept as they are. Coordinates along the grid
+    dims (e.g., `x` and `y`) are averaged over the same blocks.
+    """
+    grid_dims = _get_grid_dims(tbs)
+    row_factor, col_factor = _get_factors(factor)
+    factor_by_dim = dict(zip(grid_dims, (row_factor, col_factor)))
+
+    data_vars: dict[Hashable, xr.Variable] = {}
+    for var_name, data_var in tbs.data_vars.items():
+        if data_var.dims[-2:] == grid_dims:
+            data_vars[var_name] = xr.Variable(
+                data_var.dims,
+                block_downsample(
+                    data_var.values, factor=factor, min_valid=min_valid, dtype=dtype
+                ),
+                attrs=data_var.attrs,
+            )
+        elif set(grid_dims) & set(data_var.dims):
+            raise ValueError(
+                f"The grid dims {grid_dims} must be the last two dims of"
+                f" {var_name}: {data_var.dims}"
+            )
+        else:
+            data_vars[var_name] = data_var.variable
+
+    coords = {}
+    for coord_name, coord in tbs.coords.items():
+        coord_factors = {
+            dim: dim_factor
+            for dim, dim_factor in factor_by_dim.items()
+            if dim in coord.dims
+        }
+        if coord_factors:
+            coord = coord.coarsen(coord_factors).mean(keep_attrs=True)
+        coords[coord_name] = coord.variable
+
+    return xr.Dataset(data_vars, coords=coords, attrs=tbs.attrs)
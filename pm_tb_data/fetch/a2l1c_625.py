@@ -18,14 +18,101 @@ Adapted from au_si25.py
 
 import datetime as dt
 import re
-import warnings
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 import numpy as np
+import numpy.typing as npt
 import xarray as xr
 from netCDF4 import Dataset
+from xarray.core import indexing
+
+from pm_tb_data._types import Hemisphere, Window
+from pm_tb_data.downsample import block_downsample
+from pm_tb_data.fetch.nsidc_binary import ScaledInt16BinaryArray
+from pm_tb_data.fetch.util import select_window, validate_window
+
+# The raw binary (`.dat`) a2l1c TBs are little-endian int16s in 0.01 Kelvins.
+# As in the NSIDC-0763 files they are extracted from, a value of 0 represents
+# missing data. These CF-convention attributes describe the packed (raw) data.
+# Decoded TBs are the raw values divided by `A2L1C_625_SCALE_DIVISOR`, which
+# gives (in floating point) slightly different values than multiplying them by
+# the packed `scale_factor`.
+A2L1C_625_RAW_DTYPE = np.dtype("<i2")
+A2L1C_625_MISSING_VALUE = 0
+A2L1C_625_SCALE_DIVISOR = 100.0
+A2L1C_625_PACKED_ATTRS = {
+    "scale_factor": 0.01,
+    "_FillValue": A2L1C_625_RAW_DTYPE.type(A2L1C_625_MISSING_VALUE),
+}
+
+# The 1680x1680 subset of the EASE2 NH 6.25km grid that a2l1c TBs are provided
+# on. The raw binary (`.dat`) files contain only this subset.
+A2L1C_625_SUBSET_WINDOW = Window(
+    row_start=600, row_stop=600 + 1680, col_start=600, col_stop=600 + 1680
+)
+
+
+# The netCDF4/HDF5 libraries are not thread-safe, so NSIDC-0763 files are only
+# read by one thread at a time.
+_NETCDF_LOCK = threading.Lock()
+
+
+def _map_over_channels(
+    func: Callable[..., npt.NDArray],
+    *iterables: Iterable,
+    max_workers: int,
+    executor: Executor | None = None,
+) -> list[npt.NDArray]:
+    """Apply `func` to each channel's arguments, `max_workers` at a time.
+
+    If an `executor` is given, `func` is mapped over it instead of a pool of
+    `max_workers` threads. The `executor` is not shut down.
+    """
+    if executor is not None:
+        return list(executor.map(func, *iterables))
+
+    if max_workers == 1:
+        return list(map(func, *iterables))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as thread_pool:
+        return list(thread_pool.map(func, *iterables))
+
+
+def _read_a2l1c_625_nc_channel(
+    full_path: Path,
+    scale: int,
+    *,
+    window: Window,
+    dtype: npt.DTypeLike,
+) -> npt.NDArray:
+    """Read the `window` of the TBs in a NSIDC-0763 file onto the 6.25km grid.
+
+    `scale` is the number of native grid cells per 6.25km grid cell along each
+    dimension (1 for the 6.25km channels and 2 for the 3.125km channels).
+    """
+    native_window = Window(*(idx * scale for idx in window))
+    with _NETCDF_LOCK, Dataset(full_path, "r") as nc_ds:
+        tb_var = nc_ds.variables["TB"]
+        num_rows, num_cols = tb_var.shape[-2:]
+        validate_window(native_window, grid_shape=(num_rows, num_cols))
+        # Only the hyperslab covering the window is read from disk.
+        tb_data = np.array(
+            tb_var[..., native_window.row_slice, native_window.col_slice],
+            dtype=dtype,
+        ).squeeze()
+
+    # Need to convert 0 to nan
+    tb_data[tb_data == 0] = np.nan
+
+    # Convert 3.125km to 6.25 grid if needed
+    if scale > 1:
+        tb_data = block_downsample(tb_data, factor=scale, dtype=dtype)
 
-from pm_tb_data._types import Hemisphere
+    return tb_data
 
 
 def _get_a2l1c_625_data_fields_nc(
@@ -36,9 +123,21 @@ def _get_a2l1c_625_data_fields_nc(
     verbose=True,
     tbfn_template: str = "NSIDC-0763-EASE2_{hemlet}{gridres}km-GCOMW1_AMSR2-{year}{doy}-{capchan}-{tim}-SIR-PPS_XCAL-v1.1.nc",  # noqa
     timeframe: str,
+    dtype: npt.DTypeLike = np.float64,
+    window: Window = A2L1C_625_SUBSET_WINDOW,
+    max_workers: int = 1,
+    executor: Executor | None = None,
 ) -> xr.Dataset:
     """Find raw binary files used for 6.25km NH from AMSR2 L1C (NSIDC-0763).
 
+    Only the `window` of the full hemispheric 6.25km grid is read from each
+    file (the same window, at twice the extent, for the 3.125km channels).
+
+    Channels are read and downsampled by up to `max_workers` threads. The
+    netCDF4/HDF5 libraries are not thread-safe, so only one thread reads (and
+    decompresses) data at a time, while the others downsample. To read
+    channels in parallel, pass a `ProcessPoolExecutor` as the `executor`.
+
     Returns an xarray dataset of the variables.
     """
     year = date.strftime("%Y")  # year, 4 char string
@@ -48,15 +147,18 @@ def _get_a2l1c_625_data_fields_nc(
     else:
         raise ValueError(f"Unrecognized timeframe: {timeframe}")
 
-    tbs = {}
     chans = ("18v", "23v", "36h", "36v")
+    full_paths = []
+    scales = []
     for chan in chans:
         if int(chan[:2]) < 30:
             # native SIR grid is 6.25km
             gridres = "6.25"
+            scales.append(1)
         else:
             # native SIR grid is 3.125km
             gridres = "3.125"
+            scales.append(2)
         tbfn = tbfn_template.format(
             hemlet=hemisphere[0].upper(),
             gridres=gridres,
@@ -65,24 +167,20 @@ def _get_a2l1c_625_data_fields_nc(
             capchan=chan.upper(),
             tim=tim,
         )
-        full_path = base_dir / Path(tbfn)
-        nc_ds = Dataset(full_path, "r")
-        tb_data = np.array(nc_ds.variables["TB"]).squeeze()
-
-        # Need to convert 0 to nan
-        tb_data[tb_data == 0] = np.nan
-
-        # Convert 3.125km to 6.25 grid if needed
-        if int(chan[:2]) > 30:
-            dim, _ = tb_data.shape
-            new_dim = dim // 2
-            tb_grouped = tb_data.reshape(-1, 2, new_dim, 2)
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", category=RuntimeWarning)
-                tb_data = np.nanmean(tb_grouped, (-1, -3))
-
-        # Only use a subset of the full hemisphere
-        tbs[chan] = tb_data[600 : 600 + 1680, 600 : 600 + 1680]
+        full_paths.append(base_dir / Path(tbfn))
+
+    tbs = dict(
+        zip(
+            chans,
+            _map_over_channels(
+                partial(_read_a2l1c_625_nc_channel, window=window, dtype=dtype),
+                full_paths,
+                scales,
+                max_workers=max_workers,
+                executor=executor,
+            ),
+        )
+    )
 
     ds = xr.Dataset(
         data_vars={
@@ -97,6 +195,73 @@ def _get_a2l1c_625_data_fields_nc(
     return ds
 
 
+def _get_window_within_subset(window: Window) -> Window:
+    """Return the `window` of the hemispheric grid relative to the a2l1c subset."""
+    subset = A2L1C_625_SUBSET_WINDOW
+    window_within_subset = Window(
+        row_start=window.row_start - subset.row_start,
+        row_stop=window.row_stop - subset.row_start,
+        col_start=window.col_start - subset.col_start,
+        col_stop=window.col_stop - subset.col_start,
+    )
+    validate_window(window_within_subset, grid_shape=subset.shape)
+
+    return window_within_subset
+
+
+def open_a2l1c_625_dat_file(
+    *,
+    filepath: Path,
+    dim: int = A2L1C_625_SUBSET_WINDOW.shape[0],
+    dtype: npt.DTypeLike = np.float64,
+    mask_and_scale: bool = True,
+) -> indexing.LazilyIndexedArray:
+    """Memory-map a raw binary (`.dat`) a2l1c TB file of `dim` x `dim` int16s.
+
+    The file is read as little-endian (`A2L1C_625_RAW_DTYPE`), whatever the
+    byte order of the host.
+
+    Returns a lazily-indexed array suitable for wrapping in an `xr.DataArray`.
+    Values are only read from disk (and converted to Kelvins in `dtype`, with
+    missing data masked as `np.nan`, unless `mask_and_scale` is False) when
+    they are accessed.
+
+    A `FileNotFoundError` is raised if `filepath` does not exist, and a
+    `ValueError` if its size does not match the expected grid.
+    """
+    if not filepath.is_file():
+        raise FileNotFoundError(f"Expected to find a2l1c TB file: {filepath}")
+
+    expected_size = A2L1C_625_RAW_DTYPE.itemsize * dim * dim
+    actual_size = filepath.stat().st_size
+    if actual_size != expected_size:
+        raise ValueError(
+            f"Expected a2l1c TB file of {expected_size} bytes. Got {actual_size}"
+            f" bytes: {filepath}"
+        )
+
+    if not mask_and_scale:
+        raw = np.memmap(filepath, dtype=A2L1C_625_RAW_DTYPE, mode="r", shape=(dim, dim))
+        return indexing.LazilyIndexedArray(indexing.NumpyIndexingAdapter(raw))
+
+    return indexing.LazilyIndexedArray(
+        ScaledInt16BinaryArray(
+            filepath=filepath,
+            shape=(dim, dim),
+            scale_divisor=A2L1C_625_SCALE_DIVISOR,
+            missing_value=A2L1C_625_MISSING_VALUE,
+            dtype=dtype,
+            raw_dtype=A2L1C_625_RAW_DTYPE,
+        )
+    )
+
+
+def _load_tbs(tbs: xr.DataArray) -> npt.NDArray:
+    # Decoded TBs are already read into memory. Raw TBs are still views of the
+    # memory-mapped file, and are copied into memory.
+    return np.require(tbs.values, requirements="O")
+
+
 def _get_a2l1c_625_data_fields(
     *,
     base_dir: Path,
@@ -104,10 +269,22 @@ def _get_a2l1c_625_data_fields(
     hemisphere: Hemisphere,
     verbose=False,
     timeframe: str,
+    dtype: npt.DTypeLike = np.float64,
+    mask_and_scale: bool = True,
+    window: Window = A2L1C_625_SUBSET_WINDOW,
+    lazy: bool = False,
+    max_workers: int = 1,
 ) -> xr.Dataset:
     """Find raw binary files used for 6.25km NH from AMSR2 L1C (NSIDC-0763).
 
-    Returns an xarray dataset of the variables.
+    Returns an xarray dataset of the variables. If `mask_and_scale` is False,
+    the raw int16 variables are returned with CF `scale_factor` and
+    `_FillValue` attributes instead of being decoded.
+
+    The files are memory-mapped (see `open_a2l1c_625_dat_file`), so only the
+    `window` of the hemispheric grid (which must lie within the a2l1c subset)
+    is read and decoded. If `lazy` is True, the data are only read when
+    accessed. Otherwise, channels are read by up to `max_workers` threads.
     """
     chans = ("18v", "23v", "36h", "36v")
     dim = 1680
@@ -129,26 +306,43 @@ def _get_a2l1c_625_data_fields(
         print(f"    ymd: {ymdstr}")
         print(f"    tim: {tim}")
 
-    fn = {}
+    # All of the files are opened (and validated) before any data are read.
     tbs = {}
-
     for chan in chans:
-        fn[chan] = f"{base_dir}/tb_a2im_sir_{chan}_{tim}_e2n6.25_{ymdstr}.dat"
-        tbs[chan] = np.divide(
-            np.fromfile(fn[chan], dtype=np.int16).reshape(dim, dim), 100.0
+        tbs[chan] = open_a2l1c_625_dat_file(
+            filepath=base_dir / f"tb_a2im_sir_{chan}_{tim}_e2n6.25_{ymdstr}.dat",
+            dim=dim,
+            dtype=dtype,
+            mask_and_scale=mask_and_scale,
         )
 
+    attrs = {} if mask_and_scale else A2L1C_625_PACKED_ATTRS
     ds = xr.Dataset(
         data_vars={
-            "v18": (["x", "y"], tbs["18v"]),
-            "v23": (["x", "y"], tbs["23v"]),
-            "h36": (["x", "y"], tbs["36h"]),
-            "v36": (["x", "y"], tbs["36v"]),
+            "v18": (["x", "y"], tbs["18v"], attrs),
+            "v23": (["x", "y"], tbs["23v"], attrs),
+            "h36": (["x", "y"], tbs["36h"], attrs),
+            "v36": (["x", "y"], tbs["36v"], attrs),
         },
         attrs={"description": f"a2l1c tb fields for CDR BT for {date}"},
     )
+    if window != A2L1C_625_SUBSET_WINDOW:
+        ds = ds.map(
+            select_window,
+            window=_get_window_within_subset(window),
+            keep_attrs=True,
+        )
+
+    if lazy:
+        return ds
+
+    loaded_tbs = _map_over_channels(
+        _load_tbs,
+        ds.data_vars.values(),
+        max_workers=max_workers,
+    )
 
-    return ds
+    return ds.copy(data=dict(zip(ds.data_vars, loaded_tbs)))
 
 
 def _normalize_a2l1c_625_tbs(
@@ -184,8 +378,40 @@ def get_a2l1c_625_tbs(
     hemisphere: Hemisphere,
     ncfn_template,
     timeframe: str,
+    dtype: npt.DTypeLike = np.float64,
+    mask_and_scale: bool = True,
+    window: Window = A2L1C_625_SUBSET_WINDOW,
+    lazy: bool = False,
+    max_workers: int = 1,
+    executor: Executor | None = None,
 ) -> xr.Dataset:
-    """Return CETB Tbs for the given date and hemisphere as an xr dataset."""
+    """Return CETB Tbs for the given date and hemisphere as an xr dataset.
+
+    TBs are decoded directly into the given `dtype` (e.g., `np.float32`).
+
+    TBs are returned for the `window` of the full hemispheric EASE2 6.25km grid,
+    which defaults to the standard 1680x1680 a2l1c subset. The raw binary files
+    contain only that subset, so for them `window` must lie within it. For the
+    NSIDC-0763 netCDF files, only the data within the `window` are read.
+
+    The four channels are loaded concurrently by up to `max_workers` threads.
+    The netCDF4/HDF5 libraries are not thread-safe, so only one thread at a
+    time reads data from the NSIDC-0763 netCDF files. Those channels can
+    instead be read (decompressed and downsampled) in parallel on an
+    `executor`, e.g., a `ProcessPoolExecutor` that is re-used across calls.
+    The `executor` is not shut down, and is not used for the raw binary files.
+
+    Raw binary files are memory-mapped. If `lazy` is True, TBs from raw binary
+    files are only read from disk and decoded when they are accessed (e.g.,
+    for a subset of pixels). The NSIDC-0763 netCDF fallback is always read
+    eagerly.
+
+    If `mask_and_scale` is False, the raw int16 TBs are returned with CF
+    `scale_factor` and `_FillValue` attributes instead of being decoded. This
+    is only supported for the raw binary files: the 3.125km channels of the
+    NSIDC-0763 netCDF fallback must be decoded to be downsampled, so a
+    `ValueError` is raised if the raw binary files are not found.
+    """
     try:
         # First, try to load pre-extracted raw binary files
         data_fields = _get_a2l1c_625_data_fields(
@@ -193,8 +419,21 @@ def get_a2l1c_625_tbs(
             date=date,
             hemisphere=hemisphere,
             timeframe=timeframe,
+            dtype=dtype,
+            mask_and_scale=mask_and_scale,
+            window=window,
+            lazy=lazy,
+            max_workers=max_workers,
         )
-    except FileNotFoundError:
+    except FileNotFoundError as bin_err:
+        if not mask_and_scale:
+            raise ValueError(
+                "Packed TBs (`mask_and_scale=False`) are only supported for"
+                f" raw binary a2l1c files, which were not found in {base_dir}."
+                " The NSIDC-0763 netCDF files cannot be used because their"
+                " 3.125km channels must be decoded to be downsampled to 6.25km."
+            ) from bin_err
+
         # If no bin files, attempt to load from 0763 netcdf files
         try:
             data_fields = _get_a2l1c_625_data_fields_nc(
@@ -203,6 +442,10 @@ def get_a2l1c_625_tbs(
                 hemisphere=hemisphere,
                 tbfn_template=ncfn_template,
                 timeframe=timeframe,
+                dtype=dtype,
+                window=window,
+                max_workers=max_workers,
+                executor=executor,
             )
         except FileNotFoundError as err:
             raise FileNotFoundError(
@@ -4,22 +4,29 @@
 """
 
 import datetime as dt
+from collections.abc import Sequence
 from pathlib import Path
 
+import numpy as np
+import numpy.typing as npt
 import xarray as xr
 
-from pm_tb_data._types import Hemisphere
-from pm_tb_data.fetch.amsr.util import AMSR_RESOLUTIONS, normalize_amsr_tbs
+from pm_tb_data._types import NORTH, SOUTH, Hemisphere, Window
+from pm_tb_data.fetch.amsr.util import (
+    AMSR_PASS_TYPES,
+    AMSR_RESOLUTIONS,
+    close_or_defer_close,
+    normalize_amsr_tbs,
+    require_dask_for_chunks,
+)
 
 
-def get_ae_si_tbs_from_disk(
+def get_ae_si_fp_on_disk(
     *,
-    date: dt.date,
-    hemisphere: Hemisphere,
     data_dir: Path,
+    date: dt.date,
     resolution: AMSR_RESOLUTIONS,
-) -> xr.Dataset:
-    """Return TB data from AE_SI12."""
+) -> Path:
     expected_dir = data_dir / date.strftime("%Y.%m.%d")
     expected_fn = f"AMSR_E_L3_SeaIce{resolution}km_V15_{date:%Y%m%d}.hdf"
     expected_fp = expected_dir / expected_fn
@@ -30,18 +37,146 @@ def get_ae_si_tbs_from_disk(
             f" with filepath: {expected_fp}."
         )
 
-    with xr.open_dataset(
-        expected_fp,
+    return expected_fp
+
+
+def _open_ae_si_data_fields(
+    data_filepath: Path,
+    *,
+    chunks: int | dict | str | None = None,
+) -> xr.Dataset:
+    require_dask_for_chunks(chunks)
+
+    return xr.open_dataset(
+        data_filepath,
         #  Specify the netcdf4 engine. The "h5netcdf" option does not seem to
         #  work. Note that the netcdf4 engine results in a dataset that has all
         #  of the variables (no subgroups)
         engine="netcdf4",
-    ) as ds:
+        chunks=chunks,
+    )
+
+
+def get_ae_si_tbs_from_disk(
+    *,
+    date: dt.date,
+    hemisphere: Hemisphere,
+    data_dir: Path,
+    resolution: AMSR_RESOLUTIONS,
+    dtype: npt.DTypeLike = np.float64,
+    mask_and_scale: bool = True,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+    chunks: int | dict | str | None = None,
+    pass_type: AMSR_PASS_TYPES | Sequence[AMSR_PASS_TYPES] = "day",
+) -> xr.Dataset:
+    """Return TB data from AE_SI12.
+
+    TBs are decoded directly into the given `dtype` (e.g., `np.float32`).
+
+    If `mask_and_scale` is False, the TBs are not decoded. Instead, the raw
+    int16 data are returned with CF `scale_factor` and `_FillValue`
+    attributes, which allows them to be decoded later (e.g., with
+    `xr.decode_cf`) or written to netCDF as-is.
+
+    If `channels` (e.g., `["v18", "h36"]`) is given, only those channels are
+    read. A `ValueError` is raised if any of them are not in the data file.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read.
+
+    `pass_type` selects the daily average (`"day"`, the default), ascending
+    (`"asc"`) and/or descending (`"dsc"`) pass TBs, which are all read with a
+    single open of the data file. See `normalize_amsr_tbs` for how they are
+    named.
+
+    If `chunks` is given (see `xarray.open_dataset`), the returned TBs are
+    dask-backed and are only read from disk (and decoded) when computed. This
+    requires the optional `dask` dependency. Closing the returned dataset
+    closes the data file. Otherwise, the TBs are read eagerly and the data
+    file is closed before returning.
+    """
+    expected_fp = get_ae_si_fp_on_disk(
+        data_dir=data_dir,
+        date=date,
+        resolution=resolution,
+    )
+
+    ds = _open_ae_si_data_fields(expected_fp, chunks=chunks)
+    try:
         normalized = normalize_amsr_tbs(
             data_fields=ds,
             resolution=resolution,
             hemisphere=hemisphere,
             data_product="AE_SI",
+            dtype=dtype,
+            mask_and_scale=mask_and_scale,
+            channels=channels,
+            window=window,
+            pass_type=pass_type,
         )
+    except BaseException:
+        ds.close()
+        raise
+    close_or_defer_close(ds.close, tbs=[normalized])
 
     return normalized
+
+
+def get_ae_si_tbs_by_grid_from_disk(
+    *,
+    data_filepath: Path,
+    resolutions: Sequence[AMSR_RESOLUTIONS],
+    hemispheres: Sequence[Hemisphere] = (NORTH, SOUTH),
+    dtype: npt.DTypeLike = np.float64,
+    mask_and_scale: bool = True,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+    chunks: int | dict | str | None = None,
+    pass_type: AMSR_PASS_TYPES | Sequence[AMSR_PASS_TYPES] = "day",
+) -> dict[Hemisphere, dict[AMSR_RESOLUTIONS, xr.Dataset]]:
+    """Return TB data for several grids from an AE_SI data file.
+
+    Returns a mapping of hemisphere to a mapping of resolution to TBs. E.g.,
+    `tbs["north"]["12"]`. The data file (see `get_ae_si_fp_on_disk`) is opened
+    (and its metadata parsed) only once, no matter how many hemispheres and
+    resolutions are requested.
+
+    If `chunks` is given, each of the returned datasets can be closed on its
+    own. The shared data file is closed once all of them have been closed.
+
+    See `get_ae_si_tbs_from_disk` for more information.
+    """
+    tbs_by_grid: dict[Hemisphere, dict[AMSR_RESOLUTIONS, xr.Dataset]] = {}
+    ds = _open_ae_si_data_fields(data_filepath, chunks=chunks)
+    try:
+        for hemisphere in hemispheres:
+            tbs_by_grid[hemisphere] = {}
+            for resolution in resolutions:
+                normalized = normalize_amsr_tbs(
+                    data_fields=ds,
+                    resolution=resolution,
+                    hemisphere=hemisphere,
+                    data_product="AE_SI",
+                    dtype=dtype,
+                    mask_and_scale=mask_and_scale,
+                    channels=channels,
+                    window=window,
+                    pass_type=pass_type,
+                )
+                if not normalized.data_vars:
+                    raise FileNotFoundError(
+                        f"No {hemisphere} {resolution}km TBs in AE_SI file"
+                        f" {data_filepath}."
+                    )
+                tbs_by_grid[hemisphere][resolution] = normalized
+    except BaseException:
+        ds.close()
+        raise
+
+    close_or_defer_close(
+        ds.close,
+        tbs=[tbs for by_res in tbs_by_grid.values() for tbs in by_res.values()],
+    )
+
+    return tbs_by_grid
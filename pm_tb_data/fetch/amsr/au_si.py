@@ -6,27 +6,98 @@
 
 import datetime as dt
 import re
+from collections.abc import Sequence
 from pathlib import Path
+from typing import Literal, TypedDict, cast
 
+import numpy.typing as npt
 import xarray as xr
 from loguru import logger
+from netCDF4 import Dataset
 
-from pm_tb_data._types import Hemisphere
-from pm_tb_data.fetch.amsr.util import AMSR_RESOLUTIONS, normalize_amsr_tbs
+from pm_tb_data._types import NORTH, SOUTH, Hemisphere, Window
+from pm_tb_data.fetch.amsr.util import (
+    AMSR_PASS_TYPES,
+    AMSR_RESOLUTIONS,
+    close_or_defer_close,
+    normalize_amsr_tbs,
+    require_dask_for_chunks,
+)
+from pm_tb_data.fetch.file_index import FileIndex
 
 AU_SI_FN_REGEX = re.compile(
-    r"AMSR_U2_L3_SeaIce12km_(?P<file_type>P|R)(?P<file_version>.*)_(?P<file_date>\d{8}).he5"
+    r"AMSR_U2_L3_SeaIce(?P<resolution>\d{2})km_(?P<file_type>P|R)(?P<file_version>.*)_(?P<file_date>\d{8}).he5"
 )
 
+FileType = Literal["R", "P"]
+
+
+class AuSiFileInfo(TypedDict):
+    filepath: Path
+    file_type: FileType
+    file_version: str
+
+
+def build_au_si_file_index(*, data_dir: Path, index_path: Path) -> FileIndex:
+    """Build or incrementally update an index of the AU_SI files in `data_dir`.
+
+    Every directory beneath `data_dir` is checked, but only directories that
+    are new or whose modification time has changed since the index at
+    `index_path` was last saved are listed. The updated index is saved to
+    `index_path` and returned.
+    """
+    file_index = FileIndex.load(root=data_dir, index_path=index_path)
+    num_updated = file_index.refresh_tree()
+    if num_updated:
+        file_index.save()
+
+    return file_index
+
+
+def get_au_si_files_by_date(
+    *,
+    file_index: FileIndex,
+    resolution: AMSR_RESOLUTIONS,
+) -> dict[dt.date, list[AuSiFileInfo]]:
+    """Map dates to the indexed AU_SI files at the given `resolution`.
+
+    The file type (`P` or `R`) and version of each file are parsed from its
+    filename with `AU_SI_FN_REGEX`.
+    """
+    files_by_date: dict[dt.date, list[AuSiFileInfo]] = {}
+    for filepath in file_index.find(f"AMSR_U2_L3_SeaIce{resolution}km_*.he5"):
+        if not (match := AU_SI_FN_REGEX.match(filepath.name)):
+            continue
+
+        file_date = dt.datetime.strptime(match.group("file_date"), "%Y%m%d").date()
+        files_by_date.setdefault(file_date, []).append(
+            {
+                "filepath": filepath,
+                "file_type": cast(FileType, match.group("file_type")),
+                "file_version": match.group("file_version"),
+            }
+        )
+
+    return files_by_date
+
 
 def get_au_si_fp_on_disk(
     data_dir: Path,
     date: dt.date,
     resolution: AMSR_RESOLUTIONS,
+    file_index: FileIndex | None = None,
 ) -> Path:
-    """Get the filepath to a AU_SI data file on disk."""
+    """Get the filepath to a AU_SI data file on disk.
+
+    `data_dir` is searched recursively. If a `file_index` (see
+    `build_au_si_file_index`) is given, it is searched instead of the
+    filesystem.
+    """
     glob_pattern = f"AMSR_U2_L3_SeaIce{resolution}km_*_{date:%Y%m%d}.he5"
-    results = tuple(data_dir.glob(f"**/{glob_pattern}"))
+    if file_index is not None:
+        results = tuple(file_index.find(glob_pattern, directory=data_dir))
+    else:
+        results = tuple(data_dir.glob(f"**/{glob_pattern}"))
 
     if len(results) != 1:
         raise FileNotFoundError(
@@ -37,25 +108,39 @@ def get_au_si_fp_on_disk(
     return results[0]
 
 
+def _get_au_si_data_fields_group(
+    *,
+    hemisphere: Hemisphere,
+    resolution: AMSR_RESOLUTIONS,
+) -> str:
+    return (
+        f"HDFEOS/GRIDS"
+        f"/{hemisphere[0].upper()}pPolarGrid{resolution}km"
+        "/Data Fields"
+    )
+
+
 def _get_au_si_data_fields(
     *,
     hemisphere: Hemisphere,
     resolution: AMSR_RESOLUTIONS,
     data_filepath: Path,
+    chunks: int | dict | str | None = None,
 ) -> xr.Dataset:
     """Return the data fields from the given `data_filepath` as an xr ds.
 
     Returns an xr dataset of the variables contained in the
     `HDFEOS/GRIDS/{N|S}pPolarGrid{resolution}km/Data Fields` group.
     """
+    require_dask_for_chunks(chunks)
     ds = xr.open_dataset(
         data_filepath,
-        group=(
-            f"HDFEOS/GRIDS"
-            f"/{hemisphere[0].upper()}pPolarGrid{resolution}km"
-            "/Data Fields"
+        group=_get_au_si_data_fields_group(
+            hemisphere=hemisphere,
+            resolution=resolution,
         ),
         engine="netcdf4",
+        chunks=chunks,
     )
 
     return ds
@@ -66,32 +151,164 @@ def get_au_si_tbs_from_disk(
     hemisphere: Hemisphere,
     resolution: AMSR_RESOLUTIONS,
     data_filepath: Path,
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+    chunks: int | dict | str | None = None,
+    pass_type: AMSR_PASS_TYPES | Sequence[AMSR_PASS_TYPES] = "day",
 ) -> xr.Dataset:
-    """Access AU_SI brightness temperatures from data files on local disk."""
+    """Access AU_SI brightness temperatures from data files on local disk.
+
+    If `dtype` is given, TBs are cast to that dtype (e.g., `np.float32`).
+    Otherwise, the dtype of the TBs decoded by `xarray` is kept.
+
+    If `channels` (e.g., `["v18", "h36"]`) is given, only those channels are
+    read. A `ValueError` is raised if any of them are not in the data file.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read.
+
+    `pass_type` selects the daily average (`"day"`, the default), ascending
+    (`"asc"`) and/or descending (`"dsc"`) pass TBs, which are all read with a
+    single open of the data file. See `normalize_amsr_tbs` for how they are
+    named.
+
+    If `chunks` is given (see `xarray.open_dataset`), the returned TBs are
+    dask-backed and are only read from disk (and decoded) when computed. This
+    requires the optional `dask` dependency. Closing the returned dataset
+    closes the data file. Otherwise, the TBs are read eagerly and the data
+    file is closed before returning.
+    """
     data_fields = _get_au_si_data_fields(
         hemisphere=hemisphere,
         resolution=resolution,
         data_filepath=data_filepath,
+        chunks=chunks,
     )
-    tb_data = normalize_amsr_tbs(
-        data_fields,
-        resolution=resolution,
-        hemisphere=hemisphere,
-        data_product="AU_SI",
-    )
+    try:
+        tb_data = normalize_amsr_tbs(
+            data_fields,
+            resolution=resolution,
+            hemisphere=hemisphere,
+            data_product="AU_SI",
+            dtype=dtype,
+            channels=channels,
+            window=window,
+            pass_type=pass_type,
+        )
+    except BaseException:
+        data_fields.close()
+        raise
+    close_or_defer_close(data_fields.close, tbs=[tb_data])
 
     return tb_data
 
 
+def get_au_si_tbs_by_grid_from_disk(
+    *,
+    data_filepath: Path,
+    resolutions: Sequence[AMSR_RESOLUTIONS],
+    hemispheres: Sequence[Hemisphere] = (NORTH, SOUTH),
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+    chunks: int | dict | str | None = None,
+    pass_type: AMSR_PASS_TYPES | Sequence[AMSR_PASS_TYPES] = "day",
+) -> dict[Hemisphere, dict[AMSR_RESOLUTIONS, xr.Dataset]]:
+    """Access AU_SI TBs for several grids from a data file on local disk.
+
+    Returns a mapping of hemisphere to a mapping of resolution to TBs. E.g.,
+    `tbs["north"]["12"]`. The data file is opened (and its metadata parsed)
+    only once, no matter how many hemispheres and resolutions are requested.
+
+    If `chunks` is given, each of the returned datasets can be closed on its
+    own. The shared data file is closed once all of them have been closed.
+
+    See `get_au_si_tbs_from_disk` for more information.
+    """
+    require_dask_for_chunks(chunks)
+    nc_ds = Dataset(data_filepath, "r")
+
+    tbs_by_grid: dict[Hemisphere, dict[AMSR_RESOLUTIONS, xr.Dataset]] = {}
+    try:
+        for hemisphere in hemispheres:
+            tbs_by_grid[hemisphere] = {}
+            for resolution in resolutions:
+                group = _get_au_si_data_fields_group(
+                    hemisphere=hemisphere,
+                    resolution=resolution,
+                )
+                try:
+                    nc_group = nc_ds[group]
+                except (IndexError, KeyError) as err:
+                    raise FileNotFoundError(
+                        f"No {hemisphere} {resolution}km grid in AU_SI file"
+                        f" {data_filepath}. Error was: {err}"
+                    ) from err
+
+                tbs_by_grid[hemisphere][resolution] = normalize_amsr_tbs(
+                    xr.open_dataset(
+                        xr.backends.NetCDF4DataStore(nc_group),
+                        chunks=chunks,
+                    ),
+                    resolution=resolution,
+                    hemisphere=hemisphere,
+                    data_product="AU_SI",
+                    dtype=dtype,
+                    channels=channels,
+                    window=window,
+                    pass_type=pass_type,
+                )
+    except BaseException:
+        nc_ds.close()
+        raise
+
+    close_or_defer_close(
+        nc_ds.close,
+        tbs=[tbs for by_res in tbs_by_grid.values() for tbs in by_res.values()],
+    )
+
+    return tbs_by_grid
+
+
 def get_au_si_tbs(
     *,
     date: dt.date,
     hemisphere: Hemisphere,
     resolution: AMSR_RESOLUTIONS,
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+    chunks: int | dict | str | None = None,
+    pass_type: AMSR_PASS_TYPES | Sequence[AMSR_PASS_TYPES] = "day",
+    file_index: FileIndex | None = None,
 ) -> xr.Dataset:
     """Access NSIDC AU_SI{resolution} data from disk.
 
     Returns full orbit daily average data TBs.
+
+    If `dtype` is given, TBs are cast to that dtype (e.g., `np.float32`).
+
+    If `channels` (e.g., `["v18", "h36"]`) is given, only those channels are
+    read.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read.
+
+    `pass_type` selects the daily average (`"day"`, the default), ascending
+    (`"asc"`) and/or descending (`"dsc"`) pass TBs, which are all read with a
+    single open of the data file. See `normalize_amsr_tbs` for how they are
+    named.
+
+    If `chunks` is given (see `xarray.open_dataset`), the returned TBs are
+    dask-backed and are only read from disk (and decoded) when computed. This
+    requires the optional `dask` dependency. Closing the returned dataset
+    closes the data file. Otherwise, the TBs are read eagerly and the data
+    file is closed before returning.
+
+    If a `file_index` of the AU_SI data directory (see
+    `build_au_si_file_index`) is given, the data file is looked up in the index
+    instead of searching the filesystem.
     """
     # TODO: extract data dir to `seaice_ecdr`. Ultimately this function will
     # probably go away in favor of using the more generic
@@ -99,35 +316,51 @@ def get_au_si_tbs(
     # will pass in this `data_dir` as an argument.
     data_dir = Path(f"/ecs/DP1/AMSA/AU_SI{resolution}.001/")
 
-    # Look for the data using the expected file structure in
-    # `data_dir`. Fallback to a recursive search in the `data_dir` if the data
-    # are not in their expected subdir.
-    # TODO: is it really need this logic? Can we just always recursively search
-    # for the data we want in the given directory? Often we'll want filepaths
-    # for a range of dates, so maybe this needs re-thinking anyway.
-    expected_dir = data_dir / f"{date:%Y.%m.%d}"
-    try:
-        data_filepath = get_au_si_fp_on_disk(
-            data_dir=expected_dir,
-            date=date,
-            resolution=resolution,
-        )
-    except FileNotFoundError:
-        logger.warning(
-            f"Could not find AU_SI{resolution} data in expected directory"
-            f" ({expected_dir})."
-            f" Falling back to recursive search in {data_dir=}"
-        )
+    if file_index is not None:
+        # Lookups in the index are done in memory, so the whole `data_dir` is
+        # searched directly.
         data_filepath = get_au_si_fp_on_disk(
             data_dir=data_dir,
             date=date,
             resolution=resolution,
+            file_index=file_index,
         )
+    else:
+        # Look for the data using the expected file structure in
+        # `data_dir`. Fallback to a recursive search in the `data_dir` if the
+        # data are not in their expected subdir.
+        # TODO: is it really need this logic? Can we just always recursively
+        # search for the data we want in the given directory? Often we'll want
+        # filepaths for a range of dates, so maybe this needs re-thinking
+        # anyway.
+        expected_dir = data_dir / f"{date:%Y.%m.%d}"
+        try:
+            data_filepath = get_au_si_fp_on_disk(
+                data_dir=expected_dir,
+                date=date,
+                resolution=resolution,
+            )
+        except FileNotFoundError:
+            logger.warning(
+                f"Could not find AU_SI{resolution} data in expected directory"
+                f" ({expected_dir})."
+                f" Falling back to recursive search in {data_dir=}"
+            )
+            data_filepath = get_au_si_fp_on_disk(
+                data_dir=data_dir,
+                date=date,
+                resolution=resolution,
+            )
 
     tb_data = get_au_si_tbs_from_disk(
         hemisphere=hemisphere,
         resolution=resolution,
         data_filepath=data_filepath,
+        dtype=dtype,
+        channels=channels,
+        window=window,
+        pass_type=pass_type,
+        chunks=chunks,
     )
 
     return tb_data
@@ -4,30 +4,49 @@ More information about this data product can be found here:
 https://cmr.earthdata.nasa.gov/search/concepts/C1886605827-LANCEAMSR2.html
 """
 
+import asyncio
+import contextlib
 import copy
 import datetime as dt
+import json
 import os
-import shutil
+import re
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from email.utils import formatdate
+from functools import partial
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import Literal, TypedDict, cast
+from typing import Any, TypedDict, TypeVar, cast
+from urllib.parse import urlparse
 
-import earthaccess
 import requests
 import xarray as xr
 from earthaccess.results import DataGranule
 from loguru import logger
+from requests.adapters import HTTPAdapter
 
 from pm_tb_data._types import Hemisphere
 from pm_tb_data.fetch.amsr import au_si
+from pm_tb_data.fetch.amsr.au_si import FileType
+from pm_tb_data.fetch.amsr.lance_manifest import SyncManifest, SyncManifestEntry
 from pm_tb_data.fetch.amsr.util import AMSR_RESOLUTIONS
+from pm_tb_data.fetch.cmr_cache import CMRSearchCache, search_data
 from pm_tb_data.fetch.errors import FetchRemoteDataError
+from pm_tb_data.fetch.file_index import FileIndex
+
+_T = TypeVar("_T")
 
 EXPECTED_LANCE_AMSR2_FILE_VERSION = "04"
 _URS_COOKIE = "urs_user_already_logged"
-_CHUNK_SIZE = 8 * 1024
+# Large chunks keep the per-chunk (Python) overhead of downloads low.
+_CHUNK_SIZE = 1024 * 1024
 # timeout for the server to respond, in seconds.
 _TIMEOUT = 30
+# Every HDF5 (and so every .he5) file starts with this signature.
+_HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+_CONTENT_RANGE_REGEX = re.compile(r"bytes (?P<start>\d+)-\d+/(?:\d+|\*)$")
 
 
 def _get_earthdata_creds():
@@ -68,7 +87,7 @@ def _create_earthdata_authenticated_session(s=None, *, hosts: list[str], verify)
 
         if not (redirected_to_urs):
             print(f"Host {host} did not redirect to URS -- continuing without auth.")
-            return s
+            continue
 
         auth_resp = s.get(
             headers["location"],
@@ -86,10 +105,6 @@ def _create_earthdata_authenticated_session(s=None, *, hosts: list[str], verify)
     return s
 
 
-# TODO: move to `au_si.py`?
-FileType = Literal["R", "P"]
-
-
 class GranuleInfo(TypedDict):
     file_type: FileType
     filename: str
@@ -154,33 +169,692 @@ def _filter_out_last_day(*, granules_by_date: GranuleInfoByDate) -> GranuleInfoB
     return filtered_granules_by_date
 
 
-def download_data(*, data_url: str, output_path: Path, overwrite: bool) -> Path:
+class _LazilyAuthenticatedSession(requests.Session):
+    """Session that authenticates with each data host on its first request.
+
+    Only the hosts of the given `data_urls` are authenticated with, once each,
+    when the first request is made to them. Hosts that are never requested
+    from (e.g., because all of their files already exist locally) are never
+    contacted. Hosts that cannot be reached or authenticated with are logged
+    and skipped; requests to them will then fail (and be reported)
+    individually.
+    """
+
+    def __init__(self, *, data_urls: list[str]):
+        super().__init__()
+        self._hosts_to_authenticate = {urlparse(url).netloc for url in data_urls}
+        self._visited_hosts: set[str] = set()
+        self._host_locks: dict[str, threading.RLock] = {}
+        self._lock = threading.Lock()
+
+    def authenticate_for(self, url: str) -> None:
+        """Authenticate with the host of `url`, unless that was already tried."""
+        host = urlparse(url).netloc
+        if host not in self._hosts_to_authenticate:
+            return
+
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.RLock())
+        # Other requests to the host wait for its authentication. Requests made
+        # while authenticating (by the same thread) are let through.
+        with host_lock:
+            if host in self._visited_hosts:
+                return
+            self._visited_hosts.add(host)
+            try:
+                # The URS redirect is only issued for data requests, so a data
+                # URL is used to authenticate.
+                _create_earthdata_authenticated_session(
+                    self,
+                    hosts=[url],
+                    verify=True,
+                )
+            except Exception as error:
+                logger.warning(f"Failed to authenticate with {host}: {error=}.")
+
+    def request(self, method, url, *args, **kwargs):
+        self.authenticate_for(url)
+
+        return super().request(method, url, *args, **kwargs)
+
+
+def _create_shared_download_session(
+    *,
+    data_urls: list[str],
+    max_workers: int,
+) -> requests.Session:
+    """Create a session for downloading `data_urls`.
+
+    The session authenticates with each host once, on the first request to it
+    (see `_LazilyAuthenticatedSession`). Its connection pool is sized for
+    `max_workers` concurrent downloads, so that connections are kept alive and
+    re-used.
+    """
+    session = _LazilyAuthenticatedSession(data_urls=data_urls)
+    adapter = HTTPAdapter(pool_maxsize=max(max_workers, 10))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+def _get_validators_path(part_path: Path) -> Path:
+    return part_path.with_name(f"{part_path.name}.json")
+
+
+def _save_validators(part_path: Path, *, resp: requests.Response) -> None:
+    """Record the validators of the response that `part_path` is downloaded from.
+
+    They are used to make sure that a resumed download continues the same
+    version of the file (see `_get_if_range`).
+    """
+    with open(_get_validators_path(part_path), "w") as f:
+        json.dump(
+            {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            },
+            f,
+        )
+
+
+def _get_if_range(part_path: Path) -> str | None:
+    """Return an `If-Range` validator for resuming `part_path`, if there is one.
+
+    A strong ETag is preferred. Weak ETags cannot be used with `If-Range`, so
+    the `Last-Modified` date is used instead if there is one.
+    """
+    try:
+        with open(_get_validators_path(part_path)) as f:
+            validators = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    etag = validators.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        return etag
+
+    return validators.get("last_modified")
+
+
+def _discard_partial_download(part_path: Path) -> None:
+    part_path.unlink(missing_ok=True)
+    _get_validators_path(part_path).unlink(missing_ok=True)
+
+
+def _get_content_range_start(resp: requests.Response) -> int | None:
+    """Return the first byte position of a 206 response's `Content-Range`."""
+    # E.g., `Content-Range: bytes 1000-1999/2000`.
+    match = _CONTENT_RANGE_REGEX.match(resp.headers.get("Content-Range", ""))
+    if match is None:
+        return None
+
+    return int(match.group("start"))
+
+
+def _get_expected_size(resp: requests.Response, *, resume_from: int) -> int | None:
+    """Return the expected size of the complete file, if the server reports it."""
+    if resp.status_code == 206:
+        # E.g., `Content-Range: bytes 1000-1999/2000`.
+        total_size = resp.headers.get("Content-Range", "").rpartition("/")[2]
+        if total_size.isdigit():
+            return int(total_size)
+
+    content_length = resp.headers.get("Content-Length")
+    if content_length is None:
+        return None
+
+    return resume_from + int(content_length)
+
+
+def _verify_download(part_path: Path, *, expected_size: int | None) -> None:
+    """Raise a `FetchRemoteDataError` if `part_path` is incomplete or corrupt.
+
+    Incomplete downloads are kept so that they can be resumed. Other invalid
+    downloads are removed.
+    """
+    size = part_path.stat().st_size
+    if expected_size is not None and size < expected_size:
+        raise FetchRemoteDataError(
+            f"Incomplete download of {part_path.name}: got {size} of"
+            f" {expected_size} bytes."
+        )
+
+    with open(part_path, "rb") as f:
+        signature = f.read(len(_HDF5_SIGNATURE))
+
+    if expected_size is not None and size > expected_size:
+        error = f"got {size} bytes, but expected {expected_size}"
+    elif signature != _HDF5_SIGNATURE:
+        error = "it is not an HDF5 file"
+    else:
+        return
+
+    _discard_partial_download(part_path)
+    raise FetchRemoteDataError(f"Invalid download of {part_path.name}: {error}.")
+
+
+def _download_to_path(
+    *,
+    data_url: str,
+    output_path: Path,
+    session: requests.Session,
+    headers: dict[str, str] | None = None,
+    cancel_event: threading.Event | None = None,
+) -> requests.Response:
+    """Download `data_url` to `output_path`, resuming a partial download.
+
+    A partial download is only resumed if the validators (`ETag` or
+    `Last-Modified`) of the response it was started from were recorded. They
+    are sent as `If-Range`, so that the server sends the whole file again if
+    it has changed since. The download is also started over if the server
+    resumes from a different byte than requested.
+
+    Extra request `headers` (e.g., `If-None-Match`) may be given. If the server
+    responds with 304 (Not Modified), `output_path` is left as it is.
+
+    If a `cancel_event` is given and gets set, the download is stopped (and a
+    `FetchRemoteDataError` raised) before the next chunk is written. The
+    partial download is kept, so that it can be resumed.
+
+    Returns the response, so that its status and headers can be inspected.
+    """
+    filename = output_path.name
+    part_path = output_path.with_name(f"{filename}.part")
+    resume_from = part_path.stat().st_size if part_path.is_file() else 0
+    if_range = _get_if_range(part_path) if resume_from else None
+    if resume_from and if_range is None:
+        # Without validators, there is no way to know that the partial
+        # download is of the same version of the file. Start over.
+        resume_from = 0
+    request_headers = {
+        "User-Agent": "pm_tb_data",
+        # Sizes are verified against `Content-Length`, so the data must not be
+        # compressed in transit.
+        "Accept-Encoding": "identity",
+        **(headers or {}),
+    }
+    if resume_from and if_range is not None:
+        request_headers["Range"] = f"bytes={resume_from}-"
+        request_headers["If-Range"] = if_range
+
+    with session.get(
+        data_url,
+        timeout=_TIMEOUT,
+        stream=True,
+        headers=request_headers,
+    ) as resp:
+        restart = False
+        if resume_from and resp.status_code == 416:
+            # The partial download is at least as long as the (unchanged) file
+            # on the server, e.g., because it was complete but failed to be
+            # renamed into place.
+            restart = True
+        elif resume_from and resp.status_code == 206:
+            range_start = _get_content_range_start(resp)
+            restart = range_start != resume_from
+        if restart:
+            logger.warning(f"Could not resume download of {filename}. Restarting.")
+            _discard_partial_download(part_path)
+            return _download_to_path(
+                data_url=data_url,
+                output_path=output_path,
+                session=session,
+                headers=headers,
+                cancel_event=cancel_event,
+            )
+
+        resp.raise_for_status()
+        if resp.status_code == 304:
+            return resp
+
+        if resume_from and resp.status_code == 206:
+            logger.info(f"Resuming download of {filename} from byte {resume_from}.")
+        else:
+            # The whole file is sent, e.g., because there was no partial
+            # download or the file has changed since it was started.
+            resume_from = 0
+            _save_validators(part_path, resp=resp)
+
+        expected_size = _get_expected_size(resp, resume_from=resume_from)
+        with open(part_path, "ab" if resume_from else "wb") as f:
+            for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise FetchRemoteDataError(f"Download of {filename} was cancelled.")
+                f.write(chunk)
+
+    _verify_download(part_path, expected_size=expected_size)
+    part_path.replace(output_path)
+    _get_validators_path(part_path).unlink(missing_ok=True)
+
+    return resp
+
+
+def download_data(
+    *,
+    data_url: str,
+    output_path: Path,
+    overwrite: bool,
+    session: requests.Session | None = None,
+) -> Path:
+    """Download `data_url` to `output_path`.
+
+    Data are downloaded to a `.part` file next to `output_path`. If that file
+    exists (e.g., from an interrupted download), the download is resumed with
+    an HTTP Range request, as long as the file has not changed on the server
+    (see `_download_to_path`). Once the download is verified against the
+    `Content-Length` reported by the server and the HDF5 file signature, it is
+    atomically renamed to `output_path`.
+
+    If an (authenticated) `session` is given, it is used for the download.
+    Otherwise, a new session is created and authenticated with Earthdata Login.
+    """
     output_dir = output_path.parent
     filename = output_path.name
     if output_path.is_file() and not overwrite:
         logger.info(f"Skipped downloading {filename}. Already exists in {output_dir}")
         return output_path
 
-    session = _create_earthdata_authenticated_session(hosts=[data_url], verify=True)
+    if session is None:
+        session = _create_earthdata_authenticated_session(hosts=[data_url], verify=True)
+
+    _download_to_path(data_url=data_url, output_path=output_path, session=session)
+
+    logger.info(f"Wrote AMSR2 LANCE data: {output_path}")
+
+    return output_path
+
+
+class _HostHealth:
+    """Thread-safe record of how each data host last responded during a run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._healthy_by_host: dict[str, bool] = {}
+
+    def record(self, data_url: str, *, healthy: bool) -> None:
+        host = urlparse(data_url).netloc
+        with self._lock:
+            if self._healthy_by_host.get(host) != healthy:
+                logger.info(
+                    f"Marking {host} as {'healthy' if healthy else 'unhealthy'}."
+                )
+            self._healthy_by_host[host] = healthy
+
+    def is_healthy(self, data_url: str) -> bool | None:
+        """Return the host's health, or None if it has not been used yet."""
+        with self._lock:
+            return self._healthy_by_host.get(urlparse(data_url).netloc)
+
+    def order(self, data_urls: list[str]) -> list[str]:
+        """Order `data_urls` healthy hosts first and unhealthy hosts last."""
+        rank = {True: 0, None: 1, False: 2}
+
+        return sorted(data_urls, key=lambda url: rank[self.is_healthy(url)])
+
+
+def _is_host_failure(error: Exception) -> bool:
+    """Return True if `error` shows that the host, not just a granule, failed.
+
+    Connection errors, timeouts and server errors (5xx) count against the host.
+    Other errors (e.g., a 404 for a granule that CMR lists but the host does
+    not have) do not.
+    """
+    if isinstance(
+        error,
+        (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError),
+    ):
+        return True
+
+    return (
+        isinstance(error, requests.HTTPError)
+        and error.response is not None
+        and error.response.status_code >= 500
+    )
+
 
+def _record_download_error(
+    host_health: _HostHealth, *, data_url: str, error: Exception
+) -> None:
+    if _is_host_failure(error):
+        host_health.record(data_url, healthy=False)
+    logger.warning(f"Tried to access {data_url} unsuccessfully: {error=}.")
+
+
+def _probe_data_url(*, data_url: str, session: requests.Session) -> int:
+    """Return the status code of a request for the first byte of `data_url`."""
     with session.get(
         data_url,
         timeout=_TIMEOUT,
         stream=True,
-        headers={"User-Agent": "pm_tb_data"},
+        headers={"User-Agent": "pm_tb_data", "Range": "bytes=0-0"},
     ) as resp:
-        resp.raise_for_status()
-        with TemporaryDirectory() as tmpdir:
-            tmpdir_path = Path(tmpdir)
-            tmp_fp = tmpdir_path / filename
-            with open(tmp_fp, "wb") as f:
-                for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
-                    f.write(chunk)
-            shutil.move(tmp_fp, output_path)
+        return resp.status_code
 
-    logger.info(f"Wrote AMSR2 LANCE data: {output_path}")
 
-    return output_path
+def _race_mirrors(
+    *,
+    data_urls: list[str],
+    session: requests.Session,
+    host_health: _HostHealth,
+) -> list[str]:
+    """Order the mirrored `data_urls` by which responds healthily first.
+
+    If a host is already known to be healthy, its data URL is preferred without
+    probing. Otherwise, all mirrors not known to be unhealthy are probed
+    concurrently (for only the first byte of the file) and the first to
+    respond healthily is preferred. Slower probes are not waited for, but
+    their outcome is still recorded in `host_health` when they finish.
+    """
+    ordered_urls = host_health.order(data_urls)
+    if host_health.is_healthy(ordered_urls[0]):
+        return ordered_urls
+
+    candidate_urls = [
+        url for url in ordered_urls if host_health.is_healthy(url) is not False
+    ] or ordered_urls
+
+    def _record_probe(future: Future, *, data_url: str) -> None:
+        if (error := future.exception()) is not None:
+            if isinstance(error, Exception) and _is_host_failure(error):
+                host_health.record(data_url, healthy=False)
+        elif future.result() < 400:
+            host_health.record(data_url, healthy=True)
+        elif future.result() >= 500:
+            host_health.record(data_url, healthy=False)
+
+    executor = ThreadPoolExecutor(max_workers=len(candidate_urls))
+    url_by_future = {}
+    for data_url in candidate_urls:
+        future = executor.submit(_probe_data_url, data_url=data_url, session=session)
+        future.add_done_callback(partial(_record_probe, data_url=data_url))
+        url_by_future[future] = data_url
+
+    winning_url = None
+    try:
+        for future in as_completed(url_by_future, timeout=_TIMEOUT):
+            if future.exception() is None and future.result() < 400:
+                winning_url = url_by_future[future]
+                break
+    except FuturesTimeoutError:
+        pass
+    finally:
+        # Do not wait for the slower probes to finish.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if winning_url is None:
+        return ordered_urls
+
+    return [winning_url] + [url for url in ordered_urls if url != winning_url]
+
+
+def _order_data_urls(
+    *,
+    data_urls: list[str],
+    session: requests.Session,
+    host_health: _HostHealth,
+    race_mirrors: bool,
+) -> list[str]:
+    """Order a granule's mirrored `data_urls` in the order they should be tried."""
+    if race_mirrors and len(data_urls) > 1:
+        return _race_mirrors(
+            data_urls=data_urls,
+            session=session,
+            host_health=host_health,
+        )
+
+    return host_health.order(data_urls)
+
+
+def _download_granule(
+    *,
+    granule_info: GranuleInfo,
+    output_dir: Path,
+    overwrite: bool,
+    session: requests.Session,
+    host_health: _HostHealth,
+    race_mirrors: bool = False,
+) -> Path | None:
+    """Download the granule, trying each of its data URLs in turn.
+
+    Data URLs on hosts that are known to be healthy are tried first, and those
+    on hosts that are known to be unhealthy are tried last. If `race_mirrors`
+    is True, the order is decided by probing the mirrors concurrently (see
+    `_race_mirrors`).
+
+    Returns the path to the downloaded data, or None if none of the data URLs
+    could be downloaded.
+    """
+    output_path = Path(output_dir / granule_info["filename"])
+    already_downloaded = output_path.is_file() and not overwrite
+    data_urls = _order_data_urls(
+        data_urls=granule_info["data_urls"],
+        session=session,
+        host_health=host_health,
+        race_mirrors=race_mirrors and not already_downloaded,
+    )
+
+    for data_url in data_urls:
+        try:
+            downloaded_path = download_data(
+                data_url=data_url,
+                output_path=output_path,
+                overwrite=overwrite,
+                session=session,
+            )
+            host_health.record(data_url, healthy=True)
+
+            return downloaded_path
+        except Exception as error:
+            _record_download_error(host_health, data_url=data_url, error=error)
+
+    return None
+
+
+def _get_conditional_headers(
+    *, output_path: Path, manifest_entry: SyncManifestEntry | None
+) -> dict[str, str]:
+    """Return headers that ask the server to skip an unchanged `output_path`."""
+    if manifest_entry is None or (
+        manifest_entry["etag"] is None and manifest_entry["last_modified"] is None
+    ):
+        # The file was downloaded before the manifest was used, or the server
+        # sent no validators, so there are none recorded. The file's
+        # modification time is when it was downloaded.
+        return {
+            "If-Modified-Since": formatdate(output_path.stat().st_mtime, usegmt=True)
+        }
+
+    headers = {}
+    if manifest_entry["etag"] is not None:
+        headers["If-None-Match"] = manifest_entry["etag"]
+    if manifest_entry["last_modified"] is not None:
+        headers["If-Modified-Since"] = manifest_entry["last_modified"]
+
+    return headers
+
+
+def _sync_granule(
+    *,
+    granule_info: GranuleInfo,
+    manifest: SyncManifest,
+    manifest_entry: SyncManifestEntry | None,
+    overwrite: bool,
+    session: requests.Session,
+    host_health: _HostHealth,
+    race_mirrors: bool = False,
+) -> SyncManifestEntry | None:
+    """Sync the granule to `manifest.output_dir`, trying each data URL in turn.
+
+    If the granule's file is already in the output directory, a conditional
+    request is made and the file is only downloaded again if it has changed
+    on the server (or if `overwrite` is True). If no validators were recorded
+    for the file, the request is conditional on its modification time. A
+    server that does not support that sends the file again, which is then
+    downloaded again.
+
+    Returns the manifest entry for the synced file, or None if none of the
+    data URLs could be synced.
+    """
+    filename = granule_info["filename"]
+    output_path = manifest.output_dir / filename
+    if manifest_entry is not None and manifest_entry["filename"] != filename:
+        # The granule was superseded (e.g., a P file by an R file).
+        manifest_entry = None
+
+    headers: dict[str, str] = {}
+    if overwrite:
+        manifest_entry = None
+    elif manifest_entry is not None and manifest.is_intact(manifest_entry):
+        headers = _get_conditional_headers(
+            output_path=output_path, manifest_entry=manifest_entry
+        )
+    elif manifest_entry is None and output_path.is_file():
+        headers = _get_conditional_headers(output_path=output_path, manifest_entry=None)
+
+    data_urls = _order_data_urls(
+        data_urls=granule_info["data_urls"],
+        session=session,
+        host_health=host_health,
+        race_mirrors=race_mirrors and not headers,
+    )
+    for data_url in data_urls:
+        try:
+            resp = _download_to_path(
+                data_url=data_url,
+                output_path=output_path,
+                session=session,
+                headers=headers,
+            )
+        except Exception as error:
+            _record_download_error(host_health, data_url=data_url, error=error)
+            continue
+
+        host_health.record(data_url, healthy=True)
+        if resp.status_code == 304:
+            logger.info(f"Skipped downloading {filename}. Not modified.")
+            if manifest_entry is not None:
+                return manifest_entry
+        else:
+            logger.info(f"Wrote AMSR2 LANCE data: {output_path}")
+
+        return {
+            "filename": filename,
+            "file_type": granule_info["file_type"],
+            "size": output_path.stat().st_size,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "data_url": data_url,
+        }
+
+    return None
+
+
+def _prune_superseded_files(
+    *,
+    output_dir: Path,
+    date: dt.date,
+    synced_entry: SyncManifestEntry,
+    previous_entry: SyncManifestEntry | None,
+) -> None:
+    """Remove files for `date` that have been superseded by the synced file.
+
+    The previously synced file for `date` is removed if it had a different
+    filename. If the synced file is an R file, any P files for `date` at the
+    same resolution are removed too.
+    """
+    synced_match = au_si.AU_SI_FN_REGEX.match(synced_entry["filename"])
+    assert synced_match is not None
+
+    superseded_filepaths = set()
+    if previous_entry is not None:
+        if previous_entry["filename"] != synced_entry["filename"]:
+            superseded_filepaths.add(output_dir / previous_entry["filename"])
+
+    if synced_entry["file_type"] == "R":
+        for filepath in output_dir.glob(f"*_P*_{date:%Y%m%d}.he5"):
+            match = au_si.AU_SI_FN_REGEX.match(filepath.name)
+            if match and match.group("resolution") == synced_match.group("resolution"):
+                superseded_filepaths.add(filepath)
+
+    for filepath in sorted(superseded_filepaths):
+        if filepath.is_file():
+            filepath.unlink()
+            logger.info(f"Removed superseded AMSR2 LANCE data: {filepath}")
+
+
+def _collect_downloaded_paths(
+    *,
+    granule_infos: list[GranuleInfo],
+    downloaded_paths: Iterable[Path | None],
+    fail_on_download_error: bool,
+) -> list[Path]:
+    """Drop granules that failed to download, or raise if that is not allowed."""
+    output_paths: list[Path] = []
+    for granule_info, downloaded_path in zip(granule_infos, downloaded_paths):
+        if downloaded_path is not None:
+            output_paths.append(downloaded_path)
+        elif fail_on_download_error:
+            raise RuntimeError(f"Failed do fetch data for {granule_info=}")
+
+    return output_paths
+
+
+def _sync_latest_lance_files(
+    *,
+    granules_by_date: GranuleInfoByDate,
+    output_dir: Path,
+    overwrite: bool,
+    fail_on_download_error: bool,
+    session: requests.Session,
+    host_health: _HostHealth,
+    max_workers: int,
+    race_mirrors: bool,
+) -> list[Path]:
+    """Sync `granules_by_date` to `output_dir`, using its sync manifest.
+
+    See `download_latest_lance_files`.
+    """
+    manifest = SyncManifest.load(output_dir=output_dir)
+    dates = list(granules_by_date)
+    with session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        synced_entries = list(
+            executor.map(
+                lambda date: _sync_granule(
+                    granule_info=granules_by_date[date],
+                    manifest=manifest,
+                    manifest_entry=manifest.entries.get(date),
+                    overwrite=overwrite,
+                    session=session,
+                    host_health=host_health,
+                    race_mirrors=race_mirrors,
+                ),
+                dates,
+            )
+        )
+
+    output_paths: list[Path] = []
+    try:
+        for date, synced_entry in zip(dates, synced_entries):
+            if synced_entry is None:
+                if fail_on_download_error:
+                    granule_info = granules_by_date[date]
+                    raise RuntimeError(f"Failed do fetch data for {granule_info=}")
+                continue
+
+            _prune_superseded_files(
+                output_dir=output_dir,
+                date=date,
+                synced_entry=synced_entry,
+                previous_entry=manifest.entries.get(date),
+            )
+            manifest.entries[date] = synced_entry
+            output_paths.append(output_dir / synced_entry["filename"])
+    finally:
+        # Record the granules that were synced, even if another failed.
+        manifest.save()
+
+    return output_paths
 
 
 # TODO: This and the associated functions (`_get_earthdata_creds` and
@@ -194,6 +868,10 @@ def download_latest_lance_files(
     output_dir: Path,
     overwrite: bool = False,
     fail_on_download_error: bool = False,
+    max_workers: int = 1,
+    race_mirrors: bool = False,
+    use_sync_manifest: bool = False,
+    search_cache: CMRSearchCache | None = None,
 ) -> list[Path]:
     """Download the latest LANCE AMSR2 data files that are ready for NRT.
 
@@ -213,38 +891,222 @@ def download_latest_lance_files(
     We also experienced connection issues with the `lance.nsstc.nasa.gov` data
     source on Feb. 15, 2024.
 
+    Granules are downloaded `max_workers` at a time. All downloads share a
+    single session, which authenticates with each data host once (on the first
+    download from it) and keeps connections alive between downloads.
+
+    The health of each data host is remembered for the rest of the run: hosts
+    that failed (with a connection error, a timeout or a server error) are only
+    tried after the other mirrors. If `race_mirrors` is
+    True, a granule's mirrors are probed concurrently (until a host is known
+    to be healthy), and the first to respond healthily is used. This avoids
+    waiting for a slow or hanging host to time out before falling back.
+
+    If `use_sync_manifest` is True, the downloaded granules are recorded in a
+    manifest in `output_dir` (see `lance_manifest.SyncManifest`). Granules
+    that are already in `output_dir` are then only downloaded again if a
+    conditional request shows that they have changed on the server. Once an R
+    file has been downloaded, the P file it replaces is removed.
+
+    If a `search_cache` is given, the CMR search results are served from it
+    when possible (see `pm_tb_data.fetch.cmr_cache.CMRSearchCache`).
+
     Returns a list of paths to newly downloaded data.
     """
     # LANCE only has the last 14 days worth of data at any given time. For
     # simplicity, query for all of them.
-    results = earthaccess.search_data(short_name="AU_SI12_NRT_R04")
+    results = search_data(search_cache=search_cache, short_name="AU_SI12_NRT_R04")
 
     granules_by_date = _get_granule_info_by_date(data_granules=results)
     filtered_granules_by_date = _filter_out_last_day(granules_by_date=granules_by_date)
 
-    output_paths: list[Path] = []
-    for granule_by_date in filtered_granules_by_date.values():
-        downloaded_data = False
-        for data_url in granule_by_date["data_urls"]:
-            filename = granule_by_date["filename"]
-            output_path = Path(output_dir / filename)
+    granule_infos = list(filtered_granules_by_date.values())
+    session = _create_shared_download_session(
+        data_urls=[
+            data_url
+            for granule_info in granule_infos
+            for data_url in granule_info["data_urls"]
+        ],
+        max_workers=max_workers,
+    )
 
-            try:
-                download_data(
+    host_health = _HostHealth()
+    if use_sync_manifest:
+        return _sync_latest_lance_files(
+            granules_by_date=filtered_granules_by_date,
+            output_dir=output_dir,
+            overwrite=overwrite,
+            fail_on_download_error=fail_on_download_error,
+            session=session,
+            host_health=host_health,
+            max_workers=max_workers,
+            race_mirrors=race_mirrors,
+        )
+
+    with session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        downloaded_paths = list(
+            executor.map(
+                lambda granule_info: _download_granule(
+                    granule_info=granule_info,
+                    output_dir=output_dir,
+                    overwrite=overwrite,
+                    session=session,
+                    host_health=host_health,
+                    race_mirrors=race_mirrors,
+                ),
+                granule_infos,
+            )
+        )
+
+    return _collect_downloaded_paths(
+        granule_infos=granule_infos,
+        downloaded_paths=downloaded_paths,
+        fail_on_download_error=fail_on_download_error,
+    )
+
+
+async def _run_in_thread(func: Callable[..., _T], /, **kwargs: Any) -> _T:
+    """Run `func(**kwargs, cancel_event=...)` in a thread.
+
+    If the calling task is cancelled, the `cancel_event` passed to `func` is set
+    and the thread is waited for before the cancellation is propagated. This
+    way, no thread is left writing to disk after cancellation.
+
+    Downloads only check the `cancel_event` between chunks. If a read is
+    blocked (e.g., on a stalled connection), the cancellation waits for it to
+    return or time out, which takes up to `_TIMEOUT` seconds.
+    """
+    cancel_event = threading.Event()
+    task = asyncio.ensure_future(
+        asyncio.to_thread(func, **kwargs, cancel_event=cancel_event)
+    )
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        cancel_event.set()
+        with contextlib.suppress(Exception):
+            await task
+        raise
+
+
+async def _download_granule_async(
+    *,
+    granule_info: GranuleInfo,
+    output_dir: Path,
+    overwrite: bool,
+    session: requests.Session,
+    host_health: _HostHealth,
+    host_limits: dict[str, asyncio.Semaphore],
+    max_connections_per_host: int,
+) -> Path | None:
+    """Download the granule, trying each of its data URLs in turn.
+
+    Like `_download_granule`, but at most `max_connections_per_host` downloads
+    from each data host run at once.
+    """
+    output_path = output_dir / granule_info["filename"]
+    if output_path.is_file() and not overwrite:
+        logger.info(
+            f"Skipped downloading {output_path.name}. Already exists in {output_dir}"
+        )
+        return output_path
+
+    for data_url in host_health.order(granule_info["data_urls"]):
+        host_limit = host_limits.setdefault(
+            urlparse(data_url).netloc, asyncio.Semaphore(max_connections_per_host)
+        )
+        try:
+            async with host_limit:
+                await _run_in_thread(
+                    _download_to_path,
                     data_url=data_url,
                     output_path=output_path,
-                    overwrite=overwrite,
+                    session=session,
                 )
-                output_paths.append(output_path)
-                downloaded_data = True
-                break
-            except Exception as error:
-                logger.warning(f"Tried to access {data_url} unsuccessfully: {error=}.")
+        except Exception as error:
+            _record_download_error(host_health, data_url=data_url, error=error)
+            continue
 
-        if not downloaded_data and fail_on_download_error:
-            raise RuntimeError(f"Failed do fetch data for {granule_by_date=}")
+        host_health.record(data_url, healthy=True)
+        logger.info(f"Wrote AMSR2 LANCE data: {output_path}")
 
-    return output_paths
+        return output_path
+
+    return None
+
+
+async def download_latest_lance_files_async(
+    *,
+    output_dir: Path,
+    overwrite: bool = False,
+    fail_on_download_error: bool = False,
+    max_concurrency: int = 4,
+    max_connections_per_host: int = 2,
+    search_cache: CMRSearchCache | None = None,
+) -> list[Path]:
+    """Download the latest LANCE AMSR2 data files that are ready for NRT.
+
+    This is the `asyncio` counterpart of `download_latest_lance_files`, for use
+    from within a running event loop. The blocking CMR search, Earthdata Login
+    authentication and downloads are run in threads, so the event loop is
+    never blocked.
+
+    At most `max_concurrency` granules are downloaded at once, and at most
+    `max_connections_per_host` of those downloads are from the same data host.
+
+    Cancelling the calling task stops the downloads in progress before their
+    next chunk is written (after up to `_TIMEOUT` seconds, if a connection has
+    stalled). Partially downloaded files are kept, and are resumed by the next
+    download.
+
+    If a `search_cache` is given, the CMR search results are served from it
+    when possible.
+
+    Returns a list of paths to newly downloaded data.
+    """
+    results = await asyncio.to_thread(
+        partial(search_data, search_cache=search_cache, short_name="AU_SI12_NRT_R04")
+    )
+
+    granules_by_date = _get_granule_info_by_date(data_granules=results)
+    filtered_granules_by_date = _filter_out_last_day(granules_by_date=granules_by_date)
+
+    granule_infos = list(filtered_granules_by_date.values())
+    session = _create_shared_download_session(
+        data_urls=[
+            data_url
+            for granule_info in granule_infos
+            for data_url in granule_info["data_urls"]
+        ],
+        max_workers=max_concurrency,
+    )
+
+    host_health = _HostHealth()
+    host_limits: dict[str, asyncio.Semaphore] = {}
+    concurrency_limit = asyncio.Semaphore(max_concurrency)
+
+    async def _download(granule_info: GranuleInfo) -> Path | None:
+        async with concurrency_limit:
+            return await _download_granule_async(
+                granule_info=granule_info,
+                output_dir=output_dir,
+                overwrite=overwrite,
+                session=session,
+                host_health=host_health,
+                host_limits=host_limits,
+                max_connections_per_host=max_connections_per_host,
+            )
+
+    with session:
+        downloaded_paths = await asyncio.gather(
+            *(_download(granule_info) for granule_info in granule_infos)
+        )
+
+    return _collect_downloaded_paths(
+        granule_infos=granule_infos,
+        downloaded_paths=downloaded_paths,
+        fail_on_download_error=fail_on_download_error,
+    )
 
 
 def access_local_lance_data(
@@ -252,16 +1114,22 @@ def access_local_lance_data(
     date: dt.date,
     data_dir: Path,
     hemisphere: Hemisphere,
+    file_index: FileIndex | None = None,
 ) -> xr.Dataset:
     """Access 12.5km LANCE AMSR2 data from local disk.
 
     Returns full orbit daily average data TBs.
+
+    If a `file_index` of `data_dir` (see `au_si.build_au_si_file_index`) is
+    given, the data file is looked up in the index instead of searching the
+    filesystem.
     """
     data_resolution: AMSR_RESOLUTIONS = "12"
     data_filepath = au_si.get_au_si_fp_on_disk(
         data_dir=data_dir,
         date=date,
         resolution=data_resolution,
+        file_index=file_index,
     )
 
     data_fields = au_si.get_au_si_tbs_from_disk(
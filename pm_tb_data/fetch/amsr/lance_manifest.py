@@ -0,0 +1,113 @@
+"""Persistent record of the LANCE AMSR2 granules synced to an output directory.
+
+`download_latest_lance_files(..., use_sync_manifest=True)` records each granule
+it syncs in a JSON manifest in the output directory. The recorded `ETag` and
+`Last-Modified` response headers are used to make conditional requests on later
+runs, so that granules that have not changed are not downloaded again, and the
+recorded filename is used to detect granules that have been superseded (e.g., a
+P file that has been replaced by an R file).
+"""
+
+import datetime as dt
+import json
+import os
+from pathlib import Path
+from typing import TypedDict
+
+from loguru import logger
+
+from pm_tb_data.fetch.amsr.au_si import FileType
+
+SYNC_MANIFEST_FILENAME = ".lance_sync_manifest.json"
+_MANIFEST_FORMAT_VERSION = 1
+
+
+class SyncManifestEntry(TypedDict):
+    filename: str
+    file_type: FileType
+    # Size of the downloaded file, in bytes.
+    size: int
+    # Validators from the response headers of the last download, if any.
+    etag: str | None
+    last_modified: str | None
+    # The data URL the file was downloaded from.
+    data_url: str
+
+
+class SyncManifest:
+    """Synced granules in `output_dir`, keyed by date."""
+
+    def __init__(
+        self,
+        *,
+        output_dir: Path,
+        entries: dict[dt.date, SyncManifestEntry] | None = None,
+    ):
+        self.output_dir = output_dir
+        self.entries: dict[dt.date, SyncManifestEntry] = entries or {}
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.output_dir / SYNC_MANIFEST_FILENAME
+
+    @classmethod
+    def load(cls, *, output_dir: Path) -> "SyncManifest":
+        """Load the manifest in `output_dir`.
+
+        An empty manifest is returned if there is no manifest in `output_dir`,
+        or if it was written in an incompatible format.
+        """
+        manifest_path = output_dir / SYNC_MANIFEST_FILENAME
+        if not manifest_path.is_file():
+            return cls(output_dir=output_dir)
+
+        with open(manifest_path) as f:
+            serialized = json.load(f)
+
+        if serialized.get("version") != _MANIFEST_FORMAT_VERSION:
+            logger.info(f"Ignoring incompatible sync manifest at {manifest_path}.")
+            return cls(output_dir=output_dir)
+
+        return cls(
+            output_dir=output_dir,
+            entries={
+                dt.date.fromisoformat(date_str): entry
+                for date_str, entry in serialized["entries"].items()
+            },
+        )
+
+    def save(self) -> None:
+        """Atomically write the manifest to `output_dir`.
+
+        Entries for files that no longer exist in `output_dir` are dropped.
+        """
+        self.entries = {
+            date: entry
+            for date, entry in self.entries.items()
+            if (self.output_dir / entry["filename"]).is_file()
+        }
+        tmp_path = self.manifest_path.with_name(
+            f".{self.manifest_path.name}.{os.getpid()}.tmp"
+        )
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "version": _MANIFEST_FORMAT_VERSION,
+                    "entries": {
+                        date.isoformat(): entry
+                        for date, entry in sorted(self.entries.items())
+                    },
+                },
+                f,
+                indent=2,
+            )
+        os.replace(tmp_path, self.manifest_path)
+
+    def is_intact(self, entry: SyncManifestEntry) -> bool:
+        """Return True if the file recorded by `entry` is intact in `output_dir`."""
+        try:
+            size = (self.output_dir / entry["filename"]).stat().st_size
+        except FileNotFoundError:
+            return False
+
+        return size == entry["size"]
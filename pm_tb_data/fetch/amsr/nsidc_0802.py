@@ -18,9 +18,13 @@ it is of length 1 and the `seaice_ecdr` expects no explicit time dim. Just x/y.
 import datetime as dt
 from pathlib import Path
 
+import numpy as np
+import numpy.typing as npt
 import xarray as xr
 
-from pm_tb_data._types import Hemisphere
+from pm_tb_data._types import Hemisphere, Window
+from pm_tb_data.fetch.file_index import FileIndex
+from pm_tb_data.fetch.util import validate_window
 
 
 def get_nsidc_0802_tbs_from_disk(
@@ -28,10 +32,28 @@ def get_nsidc_0802_tbs_from_disk(
     date: dt.date,
     hemisphere: Hemisphere,
     data_dir: Path,
+    dtype: npt.DTypeLike | None = None,
+    window: Window | None = None,
+    file_index: FileIndex | None = None,
 ) -> xr.Dataset:
-    """Return TB data from NSIDC-0802."""
+    """Return TB data from NSIDC-0802.
+
+    If `dtype` is given, floating point variables (the TBs) are cast to that
+    dtype (e.g., `np.float32`). Otherwise, the dtype of the TBs decoded by
+    `xarray` is kept.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read.
+
+    `data_dir` is searched recursively for the data file. If a `file_index` of
+    `data_dir` (see `pm_tb_data.fetch.file_index.FileIndex.refresh_tree`) is
+    given, it is searched instead of the filesystem.
+    """
     fn_glob = f"NSIDC-0802_TB_AMSR2_{hemisphere[0].upper()}_{date:%Y%m%d}_*.nc"
-    results = list(data_dir.rglob(fn_glob))
+    if file_index is not None:
+        results = list(file_index.find(fn_glob, directory=data_dir))
+    else:
+        results = list(data_dir.rglob(fn_glob))
     if not len(results) == 1:
         raise FileNotFoundError(f"No NSIDC-0007 TBs found for {date=} {hemisphere=}")
 
@@ -42,4 +64,13 @@ def get_nsidc_0802_tbs_from_disk(
     # variables, which is expected from code that imports this package.
     ds = ds.squeeze()
 
+    if window is not None:
+        validate_window(window, grid_shape=(ds.sizes["y"], ds.sizes["x"]))
+        ds = ds.isel(y=window.row_slice, x=window.col_slice)
+
+    if dtype is not None:
+        for var_name, var in ds.data_vars.items():
+            if np.issubdtype(var.dtype, np.floating) and var.dtype != dtype:
+                ds[var_name] = var.astype(dtype)
+
     return ds
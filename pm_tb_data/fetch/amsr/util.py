@@ -1,12 +1,48 @@
+import importlib.util
 import re
-from typing import Literal
+import threading
+from collections.abc import Callable, Sequence
+from functools import partial
+from typing import Any, Literal
 
 import numpy as np
+import numpy.typing as npt
 import xarray as xr
 
-from pm_tb_data._types import Hemisphere
+from pm_tb_data._types import Hemisphere, Window
+from pm_tb_data.fetch.util import get_tb_var_names, select_window
 
 AMSR_RESOLUTIONS = Literal["25", "12"]
+# Daily average, ascending and descending pass TBs.
+AMSR_PASS_TYPES = Literal["day", "asc", "dsc"]
+
+# AMSR-E TBs are int16 scaled by 10, and use 0 for missing. These CF-convention
+# attributes describe the packed (raw) AE_SI TB data.
+AE_SI_PACKED_ATTRS = {
+    "scale_factor": 0.1,
+    "_FillValue": np.int16(0),
+}
+
+
+def _decode_ae_si_tbs(
+    raw_tbs: Sequence[npt.NDArray[np.int16]],
+    *,
+    dtype: npt.DTypeLike,
+) -> npt.NDArray:
+    """Decode raw AE_SI TBs into a single (channel, y, x) array of `dtype`.
+
+    The block is allocated once, and each channel is scaled directly into its
+    slice of the block before missing (0) values are set to NaN in place. No
+    intermediate full-size float arrays are created.
+    """
+    out_dtype = np.dtype(dtype)
+    decoded_block = np.empty((len(raw_tbs), *raw_tbs[0].shape), dtype=out_dtype)
+    scale = np.array(10.0, dtype=out_dtype)
+    for raw, decoded in zip(raw_tbs, decoded_block):
+        np.divide(raw, scale, out=decoded, dtype=out_dtype)
+        np.copyto(decoded, np.nan, where=raw == 0)
+
+    return decoded_block
 
 
 def normalize_amsr_tbs(
@@ -14,48 +50,114 @@ def normalize_amsr_tbs(
     resolution: AMSR_RESOLUTIONS,
     hemisphere: Hemisphere,
     data_product: Literal["AU_SI", "AE_SI"],
+    dtype: npt.DTypeLike | None = None,
+    mask_and_scale: bool = True,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+    pass_type: AMSR_PASS_TYPES | Sequence[AMSR_PASS_TYPES] = "day",
 ) -> xr.Dataset:
     """Normalize the given Tbs from AU_SI* and AE_SI* products.
 
-    Currently only returns daily average channels.
-
     Filters out variables that are not Tbs and renames Tbs to the 'standard'
     {channel}{polarization} name. E.g., `SI_25km_NH_06H_DAY` becomes `h06`
+
+    By default, only daily average TBs are returned. `pass_type` selects the
+    daily average (`"day"`), ascending (`"asc"`) and/or descending (`"dsc"`)
+    pass TBs. Several can be requested at once (e.g., `["asc", "dsc"]`).
+    Ascending and descending TBs are named with a pass suffix. E.g.,
+    `SI_25km_NH_06H_ASC` becomes `h06_asc`.
+
+    AE_SI TBs are decoded directly into `dtype`, which defaults to
+    `np.float64`. All AE_SI channels are decoded into a single preallocated
+    (channel, y, x) block, and the returned variables are views of that block.
+    Dask-backed AE_SI TBs are instead decoded lazily. AU_SI TBs (decoded by
+    `xarray`) are cast to `dtype` if it is given.
+
+    If `mask_and_scale` is False, AE_SI TBs are not decoded. Instead, the raw
+    int16 data are returned with CF `scale_factor` and `_FillValue` attributes
+    (see `AE_SI_PACKED_ATTRS`), which allows them to be decoded later (e.g.,
+    with `xr.decode_cf`) or written to netCDF as-is. To get packed AU_SI data,
+    open the data fields with `mask_and_scale=False`.
+
+    If `channels` (e.g., `["v18", "h36"]`) is given, only those channels are
+    read and decoded. A `ValueError` is raised if any of them are not in
+    `data_fields`.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read and decoded.
     """
-    var_pattern = re.compile(
-        f"SI_{resolution}km_{hemisphere[0].upper()}H_"
-        r"(?P<channel>\d{2})(?P<polarization>H|V)_DAY"
-    )
+    pass_types = [pass_type] if isinstance(pass_type, str) else pass_type
+    tb_var_names = {}
+    for current_pass_type in pass_types:
+        var_pattern = re.compile(
+            f"SI_{resolution}km_{hemisphere[0].upper()}H_"
+            r"(?P<channel>\d{2})(?P<polarization>H|V)"
+            f"_{current_pass_type.upper()}"
+        )
+        # Daily average TBs keep the unsuffixed 'standard' names.
+        suffix = "" if current_pass_type == "day" else f"_{current_pass_type}"
+
+        # Only the variables for the requested channels are selected. Data for
+        # the other variables are never read from disk.
+        pass_tb_var_names = get_tb_var_names(
+            var_names=data_fields.keys(),
+            var_pattern=var_pattern,
+            channels=channels,
+        )
+        for tb_name, var in pass_tb_var_names.items():
+            tb_var_names[f"{tb_name}{suffix}"] = var
 
     tb_data_mapping = {}
+    # Raw AE_SI TBs (and their attrs) to decode together, by TB name.
+    ae_si_raw_tbs = {}
+    for tb_name, var in tb_var_names.items():
+        # Preserve variable attrs, but rename the variable and it's dims for
+        # consistency.
+
+        data_var = select_window(data_fields[var], window)
+        attrs = data_var.attrs
+        if data_product == "AE_SI" and not mask_and_scale:
+            assert data_var.dtype == np.int16
+            data = data_var.data
+            attrs = {**attrs, **AE_SI_PACKED_ATTRS}
+        elif data_product == "AE_SI":
+            # AMSR-E TBs are int16 scaled by 10, and use 0 for
+            # missing. These variables lack encoding metadata so `xarray`
+            # doesn't decode the data for us like it would for AU_SI data.
+            assert data_var.dtype == np.int16
+            if data_var.chunks is None:
+                ae_si_raw_tbs[tb_name] = (data_var.data, attrs)
+                continue
 
-    for var in data_fields.keys():
-        if match := var_pattern.match(str(var)):
-            # Preserve variable attrs, but rename the variable and it's dims for
-            # consistency.
-
-            data_var = data_fields[var]
-            if data_product == "AE_SI":
-                # AMSR-E TBs are int16 scaled by 10, and use 0 for
-                # missing. These variables lack encoding metadata so `xarray`
-                # doesn't decode the data for us like it would for AU_SI data.
-                assert data_var.dtype == np.int16
-                data_int16 = data_var.data
-                var_is_missing = data_int16 == 0
-                data = data_int16.astype(np.float64) / 10.0
-                data[var_is_missing] = np.nan
-            elif data_product == "AU_SI":
-                # AMSR2 TB values are properly decoded by xarray
-                data = data_var.data
-            else:
-                raise NotImplementedError(f"{data_product=} is not supported.")
-
-            tb_data_mapping[
-                f"{match.group('polarization').lower()}{match.group('channel')}"
-            ] = xr.DataArray(
+            # Dask-backed TBs are decoded lazily, so only the chunks that are
+            # used are read and decoded.
+            out_dtype = np.dtype(np.float64 if dtype is None else dtype)
+            scale = np.array(10.0, dtype=out_dtype)
+            data = (data_var / scale).astype(out_dtype).where(data_var != 0).data
+        elif data_product == "AU_SI":
+            # AMSR2 TB values are properly decoded by xarray
+            if dtype is not None and data_var.dtype != dtype:
+                data_var = data_var.astype(dtype)
+            data = data_var.data
+        else:
+            raise NotImplementedError(f"{data_product=} is not supported.")
+
+        tb_data_mapping[tb_name] = xr.DataArray(
+            data,
+            dims=("fake_y", "fake_x"),
+            attrs=attrs,
+        )
+
+    if ae_si_raw_tbs:
+        decoded_block = _decode_ae_si_tbs(
+            [raw for raw, _ in ae_si_raw_tbs.values()],
+            dtype=np.float64 if dtype is None else dtype,
+        )
+        for (tb_name, (_, attrs)), data in zip(ae_si_raw_tbs.items(), decoded_block):
+            tb_data_mapping[tb_name] = xr.DataArray(
                 data,
                 dims=("fake_y", "fake_x"),
-                attrs=data_fields[var].attrs,
+                attrs=attrs,
             )
 
     normalized = xr.Dataset(
@@ -63,3 +165,51 @@ def normalize_amsr_tbs(
     )
 
     return normalized
+
+
+def require_dask_for_chunks(chunks: int | dict | str | None) -> None:
+    """Raise an `ImportError` if `chunks` are given but `dask` is not installed.
+
+    `dask` is an optional dependency, only needed for dask-backed (`chunks`)
+    TBs.
+    """
+    if chunks is not None and importlib.util.find_spec("dask") is None:
+        raise ImportError(
+            f"Reading dask-backed TBs ({chunks=}) requires the optional `dask`"
+            " dependency, which is not installed. Install `dask` or omit `chunks`."
+        )
+
+
+def close_or_defer_close(
+    close: Callable[[], Any],
+    *,
+    tbs: Sequence[xr.Dataset],
+) -> None:
+    """Close the file backing `tbs` (with `close`) once it is no longer needed.
+
+    If any of `tbs` are dask-backed, data are still to be read from the file.
+    Each of `tbs` is then given its own close, and the file is closed once all
+    of `tbs` have been closed (e.g., with `tbs[0].close()`). Otherwise, all
+    data have been read and the file is closed immediately.
+    """
+    is_dask_backed = any(
+        data_var.chunks is not None for ds in tbs for data_var in ds.data_vars.values()
+    )
+    if not is_dask_backed:
+        close()
+        return
+
+    open_tbs = set(range(len(tbs)))
+    lock = threading.Lock()
+
+    def _close_one(idx: int) -> None:
+        with lock:
+            if idx not in open_tbs:
+                return
+            open_tbs.discard(idx)
+            if open_tbs:
+                return
+        close()
+
+    for idx, ds in enumerate(tbs):
+        ds.set_close(partial(_close_one, idx))
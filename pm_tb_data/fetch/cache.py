@@ -0,0 +1,167 @@
+"""Local, size-bounded cache of remotely fetched granules.
+
+Granules are stored as `{cache_dir}/{YYYY.MM.DD}/{filename}`, the layout
+expected by the `*_from_disk` readers (e.g., `get_nsidc_0001_tbs_from_disk`), so
+a cache directory can also be used directly as a `data_dir`.
+
+The cache is safe to share between concurrent processes:
+
+* Granules are written to a temporary file and atomically renamed into place,
+  so a partially written granule is never visible.
+* Writing a granule holds an exclusive lock file for that granule, so
+  concurrent requests for the same granule only fetch it once. The lock file
+  is removed once the granule is written.
+* Eviction holds a cache-wide lock file exclusively. Serving a granule from the
+  cache holds the same lock shared, so a granule cannot be evicted between
+  being found and being marked as used.
+
+When the total size of the cached granules exceeds `max_bytes`, the least
+recently used granules are evicted. Serving a granule from the cache updates
+its modification time, which is used to track use.
+"""
+
+import datetime as dt
+import fcntl
+import os
+import shutil
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+from loguru import logger
+
+_LOCK_DIRNAME = ".locks"
+_EVICTION_LOCK_FILENAME = ".eviction.lock"
+
+
+@contextmanager
+def _lock(
+    lock_path: Path, *, shared: bool = False, remove: bool = False
+) -> Iterator[None]:
+    """Hold a lock on `lock_path`, exclusively unless `shared` is True.
+
+    If `remove` is True, the lock file is removed before the lock is released.
+    Processes that were waiting on the removed file then lock a new one.
+    """
+    while True:
+        lock_file = open(lock_path, "a")
+        fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            # The lock file may have been removed (and maybe re-created) by
+            # its previous holder while we waited for it.
+            if os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        lock_file.close()
+
+    try:
+        yield
+    finally:
+        if remove:
+            lock_path.unlink(missing_ok=True)
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
+
+class GranuleCache:
+    """Cache of granule files in `cache_dir`, bounded by `max_bytes`.
+
+    If `max_bytes` is None, the cache grows without bound.
+    """
+
+    def __init__(self, *, cache_dir: Path, max_bytes: int | None = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock_dir = cache_dir / _LOCK_DIRNAME
+        self._lock_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, *, date: dt.date, filename: str) -> Path:
+        """Return the path at which the granule would be cached."""
+        return self.cache_dir / f"{date:%Y.%m.%d}" / filename
+
+    def get(self, *, date: dt.date, filename: str) -> Path | None:
+        """Return the path to the cached granule, or None if it is not cached.
+
+        The granule is marked as the most recently used, so it is only evicted
+        once all other granules have been. Once opened, an evicted granule
+        remains readable until it is closed.
+        """
+        filepath = self.path_for(date=date, filename=filename)
+        with _lock(self._lock_dir / _EVICTION_LOCK_FILENAME, shared=True):
+            try:
+                # Mark the granule as recently used.
+                os.utime(filepath)
+            except FileNotFoundError:
+                return None
+
+        logger.debug(f"Using cached granule {filepath}")
+
+        return filepath
+
+    def put(self, *, date: dt.date, filename: str, fileobj: IO[bytes]) -> Path:
+        """Write the contents of `fileobj` to the cache and return its path.
+
+        If another process cached the granule first, its copy is kept and
+        `fileobj` is not read.
+        """
+        filepath = self.path_for(date=date, filename=filename)
+        with _lock(self._lock_dir / f"{filename}.lock", remove=True):
+            if (cached_filepath := self.get(date=date, filename=filename)) is not None:
+                return cached_filepath
+
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            tmp_filepath = filepath.with_name(f".{filename}.{os.getpid()}.tmp")
+            try:
+                with open(tmp_filepath, "wb") as tmp_file:
+                    shutil.copyfileobj(fileobj, tmp_file)
+                os.replace(tmp_filepath, filepath)
+            finally:
+                tmp_filepath.unlink(missing_ok=True)
+
+        logger.info(f"Cached granule {filepath}")
+        self.evict(keep=filepath)
+
+        return filepath
+
+    def _cached_filepaths(self) -> Iterator[Path]:
+        for date_dir in self.cache_dir.iterdir():
+            if not date_dir.is_dir() or date_dir.name == _LOCK_DIRNAME:
+                continue
+            for filepath in date_dir.iterdir():
+                # Skip in-progress (temporary) files.
+                if not filepath.name.startswith("."):
+                    yield filepath
+
+    def evict(self, *, keep: Path | None = None) -> int:
+        """Evict least recently used granules until the cache fits `max_bytes`.
+
+        The granule at `keep` (e.g., one that was just cached) is never
+        evicted. Returns the number of evicted granules.
+        """
+        if self.max_bytes is None:
+            return 0
+
+        with _lock(self._lock_dir / _EVICTION_LOCK_FILENAME):
+            stats = []
+            for filepath in self._cached_filepaths():
+                try:
+                    stats.append((filepath, filepath.stat()))
+                except FileNotFoundError:
+                    continue
+
+            total_bytes = sum(stat.st_size for _, stat in stats)
+            num_evicted = 0
+            for filepath, stat in sorted(stats, key=lambda item: item[1].st_mtime_ns):
+                if total_bytes <= self.max_bytes:
+                    break
+                if filepath == keep:
+                    continue
+
+                filepath.unlink(missing_ok=True)
+                total_bytes -= stat.st_size
+                num_evicted += 1
+                logger.info(f"Evicted cached granule {filepath}")
+
+        return num_evicted
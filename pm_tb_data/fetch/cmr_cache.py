@@ -0,0 +1,160 @@
+"""Local cache of CMR granule search results.
+
+Searching CMR (e.g., with `earthaccess.search_data`) takes a second or more,
+and the results rarely change within a short period of time. A
+`CMRSearchCache` persists the results of each search to a JSON file in
+`cache_dir`, keyed by the search parameters, and serves them again until they
+are older than its `ttl`.
+
+Only the `meta` and `umm` records of each granule are stored. They are
+rehydrated into `earthaccess` `DataGranule`s when read, so cached results can be
+used exactly like fresh ones (e.g., with `earthaccess.open`). Cached results
+can also be committed as test fixtures, so that tests can run offline.
+"""
+
+import datetime as dt
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import earthaccess
+from earthaccess.results import DataGranule
+from loguru import logger
+
+_CACHE_FORMAT_VERSION = 1
+
+
+def _get_search_key(search_kwargs: dict[str, Any]) -> str:
+    serialized_kwargs = json.dumps(search_kwargs, sort_keys=True, default=str)
+
+    return hashlib.sha256(serialized_kwargs.encode()).hexdigest()
+
+
+class CMRSearchCache:
+    """Cache of CMR granule search results in `cache_dir`.
+
+    Results are searched for again once they are older than `ttl`.
+    """
+
+    def __init__(self, *, cache_dir: Path, ttl: dt.timedelta = dt.timedelta(hours=1)):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, **search_kwargs: Any) -> Path:
+        """Return the path at which the results of the search would be cached."""
+        return self.cache_dir / f"{_get_search_key(search_kwargs)}.json"
+
+    def _load(self, cache_path: Path) -> list[DataGranule] | None:
+        """Return the cached results at `cache_path`, or None if they are stale.
+
+        Unreadable (e.g., corrupt) cached results are treated as missing.
+        """
+        try:
+            with open(cache_path) as f:
+                serialized = json.load(f)
+
+            if serialized.get("version") != _CACHE_FORMAT_VERSION:
+                return None
+
+            searched_at = dt.datetime.fromisoformat(serialized["searched_at"])
+            if dt.datetime.now(dt.timezone.utc) - searched_at > self.ttl:
+                return None
+
+            return [
+                DataGranule(
+                    {"meta": granule["meta"], "umm": granule["umm"]},
+                    cloud_hosted=granule["cloud_hosted"],
+                )
+                for granule in serialized["granules"]
+            ]
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as error:
+            logger.warning(
+                f"Ignoring unreadable cached CMR search results {cache_path}: {error}"
+            )
+            return None
+
+    def _save(
+        self,
+        cache_path: Path,
+        *,
+        search_kwargs: dict[str, Any],
+        granules: list[DataGranule],
+    ) -> None:
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=cache_path.parent,
+            prefix=f".{cache_path.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            json.dump(
+                {
+                    "version": _CACHE_FORMAT_VERSION,
+                    "searched_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+                    "search_kwargs": search_kwargs,
+                    "granules": [
+                        {
+                            "meta": granule["meta"],
+                            "umm": granule["umm"],
+                            "cloud_hosted": granule.cloud_hosted,
+                        }
+                        for granule in granules
+                    ],
+                },
+                f,
+                default=str,
+                separators=(",", ":"),
+            )
+        os.replace(f.name, cache_path)
+
+    def search_data(
+        self, *, refresh: bool = False, **search_kwargs: Any
+    ) -> list[DataGranule]:
+        """Return the results of `earthaccess.search_data(**search_kwargs)`.
+
+        Cached results are returned if they are younger than `ttl`, unless
+        `refresh` is True. Otherwise, CMR is searched and the results cached.
+        Empty results are not cached, because granules for recent dates may
+        become available at any time.
+        """
+        cache_path = self.path_for(**search_kwargs)
+        if not refresh and (granules := self._load(cache_path)) is not None:
+            logger.debug(f"Using cached CMR search results {cache_path}")
+            return granules
+
+        granules = earthaccess.search_data(**search_kwargs)
+        if granules:
+            self._save(cache_path, search_kwargs=search_kwargs, granules=granules)
+        else:
+            # Drop any stale results, so that they are not used again.
+            cache_path.unlink(missing_ok=True)
+
+        return granules
+
+    def clear(self) -> int:
+        """Remove all cached results, forcing the next searches to refresh.
+
+        Returns the number of cached searches that were removed.
+        """
+        num_removed = 0
+        for cache_path in self.cache_dir.glob("*.json"):
+            cache_path.unlink(missing_ok=True)
+            num_removed += 1
+
+        return num_removed
+
+
+def search_data(
+    *, search_cache: CMRSearchCache | None = None, **search_kwargs: Any
+) -> list[DataGranule]:
+    """Search CMR with `earthaccess`, using the `search_cache` if one is given."""
+    if search_cache is None:
+        return earthaccess.search_data(**search_kwargs)
+
+    return search_cache.search_data(**search_kwargs)
@@ -0,0 +1,187 @@
+"""Persistent index of data directory listings.
+
+Listing directories on network storage (e.g., with `Path.glob`) is slow when it
+has to be done once per date. A `FileIndex` records the files (and their sizes)
+found in a set of directories along with each directory's modification time,
+and persists that information to a JSON file. Lookups are then done entirely in
+memory, and refreshing the index only re-lists directories whose modification
+time has changed.
+"""
+
+import fnmatch
+import json
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TypedDict
+
+from loguru import logger
+
+_INDEX_FORMAT_VERSION = 2
+
+
+def _is_in_tree(key: str, *, tree_key: str) -> bool:
+    """Return True if the directory `key` is `tree_key` or beneath it."""
+    return tree_key == "." or key == tree_key or key.startswith(f"{tree_key}/")
+
+
+class DirectoryListing(TypedDict):
+    mtime_ns: int
+    # Mapping of filename to file size, in bytes.
+    files: dict[str, int]
+    # Names of subdirectories.
+    dirs: list[str]
+
+
+class FileIndex:
+    """Index of the files in directories under `root`."""
+
+    def __init__(
+        self,
+        *,
+        root: Path,
+        index_path: Path,
+        listings: dict[str, DirectoryListing] | None = None,
+    ):
+        self.root = root
+        self.index_path = index_path
+        # Listings are keyed by the directory's path relative to `root`.
+        self.listings: dict[str, DirectoryListing] = listings or {}
+
+    @classmethod
+    def load(cls, *, root: Path, index_path: Path) -> "FileIndex":
+        """Load the index at `index_path`.
+
+        An empty index is returned if `index_path` does not exist, was built
+        for a different `root` or in an unknown format, or cannot be read
+        (e.g., because it is corrupt). The index is then rebuilt by the next
+        refresh.
+        """
+        try:
+            with open(index_path) as f:
+                serialized = json.load(f)
+
+            version_matches = serialized.get("version") == _INDEX_FORMAT_VERSION
+            root_matches = serialized.get("root") == str(root)
+            if not (version_matches and root_matches):
+                logger.info(f"Ignoring incompatible file index at {index_path}.")
+                return cls(root=root, index_path=index_path)
+
+            listings = serialized["listings"]
+            if not isinstance(listings, dict):
+                raise TypeError(f"Expected listings to be a dict: {listings!r}")
+        except FileNotFoundError:
+            return cls(root=root, index_path=index_path)
+        except (json.JSONDecodeError, AttributeError, KeyError, TypeError) as error:
+            logger.warning(f"Ignoring unreadable file index {index_path}: {error}")
+            return cls(root=root, index_path=index_path)
+
+        return cls(root=root, index_path=index_path, listings=listings)
+
+    def save(self) -> None:
+        """Atomically write the index to `index_path`."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(
+            f".{self.index_path.name}.{os.getpid()}.tmp"
+        )
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "version": _INDEX_FORMAT_VERSION,
+                    "root": str(self.root),
+                    "listings": self.listings,
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, self.index_path)
+
+    def _key(self, directory: Path) -> str:
+        return directory.relative_to(self.root).as_posix()
+
+    def _refresh_directory(self, directory: Path) -> bool:
+        key = self._key(directory)
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            return self.listings.pop(key, None) is not None
+
+        listing = self.listings.get(key)
+        if listing is not None and listing["mtime_ns"] == mtime_ns:
+            return False
+
+        files = {}
+        dirs = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    files[entry.name] = entry.stat().st_size
+                elif entry.is_dir():
+                    dirs.append(entry.name)
+        self.listings[key] = {"mtime_ns": mtime_ns, "files": files, "dirs": dirs}
+
+        return True
+
+    def refresh(self, directories: Iterable[Path]) -> int:
+        """Update the listings for `directories`.
+
+        Only directories that are new to the index or whose modification time
+        has changed are listed. Listings for directories that no longer exist
+        are dropped. Returns the number of directories that were (re-)listed or
+        dropped.
+        """
+        return sum(self._refresh_directory(directory) for directory in directories)
+
+    def refresh_tree(self, directory: Path | None = None) -> int:
+        """Update the listings for `directory` and every directory beneath it.
+
+        `directory` defaults to `root`. Like `refresh`, only new or modified
+        directories are listed; unmodified directories are only `stat`ed.
+        Listings for directories that are no longer in the tree are dropped.
+        Returns the number of directories that were (re-)listed or dropped.
+        """
+        directory = self.root if directory is None else directory
+        num_updated = 0
+        visited_keys = set()
+        to_visit = [directory]
+        while to_visit:
+            current_dir = to_visit.pop()
+            num_updated += self._refresh_directory(current_dir)
+
+            key = self._key(current_dir)
+            visited_keys.add(key)
+            if (listing := self.listings.get(key)) is not None:
+                to_visit.extend(current_dir / name for name in listing["dirs"])
+
+        tree_key = self._key(directory)
+        for key in list(self.listings):
+            if _is_in_tree(key, tree_key=tree_key) and key not in visited_keys:
+                del self.listings[key]
+                num_updated += 1
+
+        return num_updated
+
+    def files_in(self, directory: Path) -> dict[str, int]:
+        """Return the indexed files (and their sizes) in `directory`.
+
+        Directories that are not in the index are treated as empty.
+        """
+        listing = self.listings.get(self._key(directory))
+        if listing is None:
+            return {}
+
+        return listing["files"]
+
+    def find(self, fn_glob: str, *, directory: Path | None = None) -> Iterator[Path]:
+        """Yield the indexed files matching `fn_glob` in and beneath `directory`.
+
+        `directory` defaults to `root`. This is the in-memory equivalent of
+        `directory.rglob(fn_glob)`.
+        """
+        directory = self.root if directory is None else directory
+        tree_key = self._key(directory)
+        for key, listing in self.listings.items():
+            if not _is_in_tree(key, tree_key=tree_key):
+                continue
+            for filename in fnmatch.filter(listing["files"], fn_glob):
+                yield self.root / key / filename
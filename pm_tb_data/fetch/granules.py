@@ -0,0 +1,176 @@
+"""Search for, open and cache remote granules with `earthaccess`."""
+
+import datetime as dt
+import re
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import IO, Any
+
+import earthaccess
+from earthaccess.results import DataGranule
+from loguru import logger
+
+from pm_tb_data.fetch.cache import GranuleCache
+from pm_tb_data.fetch.cmr_cache import CMRSearchCache, search_data
+from pm_tb_data.fetch.errors import FetchRemoteDataError
+
+
+def open_granule(
+    *,
+    short_name: str,
+    version: str,
+    date: dt.date,
+    granule_name: str,
+    cache: GranuleCache | None = None,
+    search_cache: CMRSearchCache | None = None,
+) -> Any:
+    """Return a file for the granule named `granule_name`.
+
+    A remote file opened with `earthaccess` is returned, unless a `cache` is
+    given. In that case, the path to the cached granule is returned, fetching
+    it into the cache first if needed. CMR is not searched for cached granules.
+
+    If a `search_cache` is given, CMR search results are served from it when
+    possible.
+    """
+    if cache is not None:
+        cached_filepath = cache.get(date=date, filename=granule_name)
+        if cached_filepath is not None:
+            return cached_filepath
+
+    results = search_data(
+        search_cache=search_cache,
+        short_name=short_name,
+        version=version,
+        cloud_hosted=True,
+        granule_name=granule_name,
+    )
+    assert len(results) == 1
+
+    granule_file = earthaccess.open(results)[0]
+    if cache is None:
+        return granule_file
+
+    return cache.put(date=date, filename=granule_name, fileobj=granule_file)
+
+
+def get_granules_by_date(
+    *,
+    short_name: str,
+    version: str,
+    start_date: dt.date,
+    end_date: dt.date,
+    granule_name: str,
+    fn_date_regex: re.Pattern,
+    search_cache: CMRSearchCache | None = None,
+) -> dict[dt.date, DataGranule]:
+    """Search CMR once for the granules between `start_date` and `end_date`.
+
+    `granule_name` may contain wildcards (e.g., `NSIDC0001_TB_PS_N25km_*.nc`).
+    Each granule is mapped to a date by matching its filename (the `native-id`)
+    against `fn_date_regex`, which must define a `date` group (`YYYYMMDD`).
+
+    If a `search_cache` is given, the search results are served from it when
+    possible.
+    """
+    results = search_data(
+        search_cache=search_cache,
+        short_name=short_name,
+        version=version,
+        cloud_hosted=True,
+        granule_name=granule_name,
+        temporal=(start_date.isoformat(), end_date.isoformat()),
+    )
+
+    granules_by_date: dict[dt.date, DataGranule] = {}
+    for granule in results:
+        filename = granule["meta"]["native-id"]
+        if not (match := fn_date_regex.match(filename)):
+            logger.warning(f"Ignoring unexpected filename in CMR results: {filename}")
+            continue
+
+        date = dt.datetime.strptime(match.group("date"), "%Y%m%d").date()
+        # The temporal search also returns granules whose temporal extent
+        # overlaps the start/end of the range.
+        if not (start_date <= date <= end_date):
+            continue
+
+        if date in granules_by_date:
+            raise FetchRemoteDataError(
+                f"Found more than one {short_name} granule for {date:%Y-%m-%d}"
+                f" in CMR results: {filename}"
+            )
+        granules_by_date[date] = granule
+
+    return granules_by_date
+
+
+def _put_in_cache(
+    cache: GranuleCache,
+    filenames: dict[dt.date, str],
+    date: dt.date,
+    remote_file: IO[bytes],
+) -> Path:
+    return cache.put(date=date, filename=filenames[date], fileobj=remote_file)
+
+
+def open_granules_for_date_range(
+    *,
+    granules_by_date: dict[dt.date, DataGranule],
+    start_date: dt.date,
+    end_date: dt.date,
+    max_workers: int = 4,
+    cache: GranuleCache | None = None,
+) -> Iterator[tuple[dt.date, Any]]:
+    """Yield `(date, file)` for each date in the range, in order.
+
+    Granules are opened with `earthaccess.open`, `max_workers` at a time, so
+    only a handful of remote files are open before they are consumed. Dates
+    without a granule are skipped with a warning.
+
+    If a `cache` is given, granules are served from the cache when possible.
+    Other granules are fetched (`max_workers` at a time) into the cache, and
+    the path to the cached granule is yielded instead of a remote file.
+    """
+    num_days = (end_date - start_date).days + 1
+    dates = [start_date + dt.timedelta(days=offset) for offset in range(num_days)]
+    for missing_date in sorted(set(dates) - set(granules_by_date)):
+        logger.warning(f"No granule found for {missing_date:%Y-%m-%d}. Skipping.")
+
+    dates_with_data = [date for date in dates if date in granules_by_date]
+    for batch_start in range(0, len(dates_with_data), max_workers):
+        batch_dates = dates_with_data[batch_start : batch_start + max_workers]
+        if cache is None:
+            files = earthaccess.open(
+                [granules_by_date[date] for date in batch_dates],
+                pqdm_kwargs={"n_jobs": max_workers},
+            )
+            yield from zip(batch_dates, files)
+            continue
+
+        filenames = {
+            date: granules_by_date[date]["meta"]["native-id"] for date in batch_dates
+        }
+        cached_filepaths = {
+            date: cache.get(date=date, filename=filenames[date]) for date in batch_dates
+        }
+        dates_to_fetch = [
+            date for date in batch_dates if cached_filepaths[date] is None
+        ]
+        if dates_to_fetch:
+            remote_files = earthaccess.open(
+                [granules_by_date[date] for date in dates_to_fetch],
+                pqdm_kwargs={"n_jobs": max_workers},
+            )
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                fetched_filepaths = executor.map(
+                    partial(_put_in_cache, cache, filenames),
+                    dates_to_fetch,
+                    remote_files,
+                )
+                cached_filepaths.update(zip(dates_to_fetch, fetched_filepaths))
+
+        for date in batch_dates:
+            yield date, cached_filepaths[date]
@@ -9,17 +9,32 @@ and the 85.5 GHz and 91.7 GHz data are mapped to a 12.5 km grid.
 
 import datetime as dt
 import re
+from collections.abc import Iterator, Sequence
 from pathlib import Path
 from typing import Literal
 
-import earthaccess
+import numpy as np
+import numpy.typing as npt
 import xarray as xr
 
-from pm_tb_data._types import Hemisphere
+from pm_tb_data._types import Hemisphere, Window
+from pm_tb_data.downsample import block_downsample_tbs
+from pm_tb_data.fetch.cache import GranuleCache
+from pm_tb_data.fetch.cmr_cache import CMRSearchCache
+from pm_tb_data.fetch.granules import (
+    get_granules_by_date,
+    open_granule,
+    open_granules_for_date_range,
+)
+from pm_tb_data.fetch.util import get_tb_var_names, select_window
 
 NSIDC_0001_RESOLUTIONS = Literal["25", "12.5"]
 NSIDC_0001_SATS = Literal["F08", "F11", "F13", "F17", "F18"]
 
+_NSIDC_0001_FN_DATE_REGEX = re.compile(
+    r"NSIDC0001_TB_PS_(N|S)[\d.]+km_(?P<date>\d{8})_v6\.0\.nc"
+)
+
 
 def get_nsidc_0001_fp_on_disk(
     *,
@@ -46,27 +61,55 @@ def _normalize_nsidc_0001_tbs(
     *,
     ds: xr.Dataset,
     sat: NSIDC_0001_SATS,
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
 ) -> xr.Dataset:
     var_pattern = re.compile(f"TB_{sat}_" r"(?P<channel>\d{2})(?P<polarization>H|V)")
 
+    # Only the variables for the requested channels are selected. Data for the
+    # other variables are never read from disk.
+    tb_var_names = get_tb_var_names(
+        var_names=ds.keys(),
+        var_pattern=var_pattern,
+        channels=channels,
+    )
+
     tb_data_mapping = {}
-    for var in ds.keys():
-        if match := var_pattern.match(str(var)):
-            # Preserve variable attrs, but rename the variable and it's dims for
-            # consistency.
-            tb_data_mapping[
-                f"{match.group('polarization').lower()}{match.group('channel')}"
-            ] = xr.DataArray(
-                ds[var].isel(time=0),
-                dims=("fake_y", "fake_x"),
-                attrs=ds[var].attrs,
-            )
+    for tb_name, var in tb_var_names.items():
+        data = select_window(ds[var].isel(time=0), window)
+        if dtype is not None and data.dtype != dtype:
+            data = data.astype(dtype)
+
+        # Preserve variable attrs, but rename the variable and it's dims for
+        # consistency.
+        tb_data_mapping[tb_name] = xr.DataArray(
+            data,
+            dims=("fake_y", "fake_x"),
+            attrs=ds[var].attrs,
+        )
 
     normalized = xr.Dataset(tb_data_mapping)
 
     return normalized
 
 
+def downsample_nsidc_0001_tbs_to_25km(
+    tbs: xr.Dataset,
+    *,
+    min_valid: int = 1,
+    dtype: npt.DTypeLike = np.float32,
+) -> xr.Dataset:
+    """Average 12.5km NSIDC-0001 TBs (e.g., 85.5 GHz) onto the 25km grid.
+
+    Each 25km grid cell is the mean of the valid TBs in the 2x2 block of 12.5km
+    grid cells it contains. Cells with fewer than `min_valid` valid TBs are NaN.
+
+    See `pm_tb_data.downsample.block_downsample`.
+    """
+    return block_downsample_tbs(tbs, factor=2, min_valid=min_valid, dtype=dtype)
+
+
 def get_nsidc_0001_tbs_from_disk(
     *,
     date: dt.date,
@@ -74,6 +117,9 @@ def get_nsidc_0001_tbs_from_disk(
     data_dir: Path,
     resolution: NSIDC_0001_RESOLUTIONS,
     sat: NSIDC_0001_SATS,
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
 ) -> xr.Dataset:
     """Return TB data from NSIDC-0001.
 
@@ -81,6 +127,15 @@ def get_nsidc_0001_tbs_from_disk(
 
     The 19.3 GHz, 22.2 GHz, and 37.0 GHz data are provided at a resolution of 25 km,
     and the 85.5 GHz and 91.7 GHz data are mapped to a 12.5 km grid.
+
+    If `dtype` is given, TBs are cast to that dtype (e.g., `np.float32`).
+    Otherwise, the dtype of the TBs decoded by `xarray` is kept.
+
+    If `channels` (e.g., `["v19", "h37"]`) is given, only those channels are
+    read. A `ValueError` is raised if any of them are not in the data file.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read from disk and returned.
     """
     expected_dir = data_dir / date.strftime("%Y.%m.%d")
     filepath = get_nsidc_0001_fp_on_disk(
@@ -96,11 +151,64 @@ def get_nsidc_0001_tbs_from_disk(
             f"No sat data for expected sat in NSIDC-0001 file for {date:%Y-%m-%d}"
             f"  Error was: {err}"
         )
-    normalized_ds = _normalize_nsidc_0001_tbs(ds=ds, sat=sat)
+    normalized_ds = _normalize_nsidc_0001_tbs(
+        ds=ds, sat=sat, dtype=dtype, channels=channels, window=window
+    )
 
     return normalized_ds
 
 
+def get_nsidc_0001_tbs_by_sat_from_disk(
+    *,
+    date: dt.date,
+    hemisphere: Hemisphere,
+    data_dir: Path,
+    resolution: NSIDC_0001_RESOLUTIONS,
+    sats: Sequence[NSIDC_0001_SATS],
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+) -> dict[NSIDC_0001_SATS, xr.Dataset]:
+    """Return TB data from NSIDC-0001 for each of the given `sats`.
+
+    The data file is opened (and its metadata parsed) only once, no matter how
+    many sats are requested. This is useful e.g., during periods of overlap
+    between sats. The requested TBs are read into memory, and the data file is
+    closed before returning.
+
+    See `get_nsidc_0001_tbs_from_disk` for more information.
+    """
+    expected_dir = data_dir / date.strftime("%Y.%m.%d")
+    filepath = get_nsidc_0001_fp_on_disk(
+        data_dir=expected_dir,
+        date=date,
+        resolution=resolution,
+        hemisphere=hemisphere,
+    )
+    with xr.open_datatree(filepath) as tree:
+        missing_sats = [sat for sat in sats if sat not in tree.children]
+        if missing_sats:
+            raise FileNotFoundError(
+                f"No sat data for expected sats {missing_sats} in NSIDC-0001 file"
+                f" for {date:%Y-%m-%d}"
+            )
+
+        normalized_by_sat = {
+            sat: _normalize_nsidc_0001_tbs(
+                # As when a single group is opened, the coordinates of the
+                # root group (e.g., x/y) are not inherited.
+                ds=tree[sat].to_dataset(inherit=False),
+                sat=sat,
+                dtype=dtype,
+                channels=channels,
+                window=window,
+            ).load()
+            for sat in sats
+        }
+
+    return normalized_by_sat
+
+
 def get_nsidc_0001_tbs(
     *,
     date: dt.date,
@@ -108,6 +216,11 @@ def get_nsidc_0001_tbs(
     resolution: NSIDC_0001_RESOLUTIONS,
     sat: NSIDC_0001_SATS,
     version: str = "6",
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+    cache: GranuleCache | None = None,
+    search_cache: CMRSearchCache | None = None,
 ):
     """Return TB data from NSIDC-0001 using `earthaccess`.
 
@@ -115,24 +228,94 @@ def get_nsidc_0001_tbs(
 
     The 19.3 GHz, 22.2 GHz, and 37.0 GHz data are provided at a resolution of 25 km,
     and the 85.5 GHz and 91.7 GHz data are mapped to a 12.5 km grid.
+
+    If `dtype` is given, TBs are cast to that dtype (e.g., `np.float32`).
+    Otherwise, the dtype of the TBs decoded by `xarray` is kept.
+
+    If `channels` (e.g., `["v19", "h37"]`) is given, only those channels are
+    read. A `ValueError` is raised if any of them are not in the data file.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read and returned.
+
+    If a `cache` is given, the granule is served from the cache if it was
+    fetched before. Otherwise, it is fetched into the cache.
+
+    If a `search_cache` is given, CMR search results are served from it when
+    possible (see `pm_tb_data.fetch.cmr_cache.CMRSearchCache`).
     """
 
     expected_fn = (
         f"NSIDC0001_TB_PS_{hemisphere[0].upper()}{resolution}km_{date:%Y%m%d}_v6.0.nc"
     )
-    results = earthaccess.search_data(
+    granule_file = open_granule(
         short_name="NSIDC-0001",
         version=version,
-        cloud_hosted=True,
+        date=date,
         granule_name=expected_fn,
+        cache=cache,
+        search_cache=search_cache,
     )
-    assert len(results) == 1
+    ds = xr.open_dataset(granule_file, group=sat)
 
-    granule_result = results[0]
+    normalized_ds = _normalize_nsidc_0001_tbs(
+        ds=ds, sat=sat, dtype=dtype, channels=channels, window=window
+    )
 
-    _earthaccess_granule = earthaccess.open([granule_result])
-    ds = xr.open_dataset(_earthaccess_granule[0], group=sat)
+    return normalized_ds
 
-    normalized_ds = _normalize_nsidc_0001_tbs(ds=ds, sat=sat)
 
-    return normalized_ds
+def get_nsidc_0001_tbs_for_date_range(
+    *,
+    start_date: dt.date,
+    end_date: dt.date,
+    hemisphere: Hemisphere,
+    resolution: NSIDC_0001_RESOLUTIONS,
+    sat: NSIDC_0001_SATS,
+    version: str = "6",
+    max_workers: int = 4,
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+    cache: GranuleCache | None = None,
+    search_cache: CMRSearchCache | None = None,
+) -> Iterator[tuple[dt.date, xr.Dataset]]:
+    """Yield `(date, tbs)` from NSIDC-0001 for each date in the range.
+
+    A single CMR search is made for the whole range, and granules are opened
+    `max_workers` at a time with `earthaccess`. Dates are yielded in order.
+    Dates without data are skipped with a warning.
+
+    If a `cache` is given, cached granules are read from disk, and the others
+    are fetched into the cache.
+
+    If a `search_cache` is given, the CMR search results are served from it
+    when possible.
+
+    See `get_nsidc_0001_tbs` for more information.
+    """
+    granules_by_date = get_granules_by_date(
+        short_name="NSIDC-0001",
+        version=version,
+        start_date=start_date,
+        end_date=end_date,
+        granule_name=(
+            f"NSIDC0001_TB_PS_{hemisphere[0].upper()}{resolution}km_*_v6.0.nc"
+        ),
+        fn_date_regex=_NSIDC_0001_FN_DATE_REGEX,
+        search_cache=search_cache,
+    )
+
+    for date, granule_file in open_granules_for_date_range(
+        granules_by_date=granules_by_date,
+        start_date=start_date,
+        end_date=end_date,
+        max_workers=max_workers,
+        cache=cache,
+    ):
+        ds = xr.open_dataset(granule_file, group=sat)
+        normalized_ds = _normalize_nsidc_0001_tbs(
+            ds=ds, sat=sat, dtype=dtype, channels=channels, window=window
+        )
+
+        yield date, normalized_ds
@@ -9,54 +9,393 @@ https://nsidc.org/data/nsidc-0007/versions/1#anchor-2
 
 import calendar
 import datetime as dt
+import fnmatch
 import re
+from collections import defaultdict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
+import numpy.typing as npt
 import xarray as xr
+from xarray.backends import BackendArray
+from xarray.core import indexing
 
-from pm_tb_data._types import Hemisphere
-from pm_tb_data.fetch.nsidc_binary import read_binary_tb_file
+from pm_tb_data._types import Hemisphere, Window
+from pm_tb_data.fetch.file_index import FileIndex
+from pm_tb_data.fetch.nsidc_binary import (
+    NSIDC_BINARY_TB_DTYPE,
+    NSIDC_BINARY_TB_MISSING_VALUE,
+    NSIDC_BINARY_TB_PACKED_ATTRS,
+    get_binary_tb_grid_shape,
+    open_binary_tb_file,
+    read_binary_tb_file,
+)
+from pm_tb_data.fetch.util import get_tb_var_names, select_window
 
+# Matches TB filenames (e.g., the file `800929S.37H` contains Sept. 29, 1980 SH
+# Tbs for the horizontal 37GHz channel.
+_TB_FN_RE = re.compile(
+    r"(?P<date>\d{6})(?P<hemisphere>N|S)\.(?P<channel>\d{2})(?P<polarization>H|V)"
+)
 
-def get_nsidc_0007_tbs_from_disk(
-    *, date: dt.date, hemisphere: Hemisphere, data_dir: Path
-) -> xr.Dataset:
-    """Return TB data from NSIDC-0007."""
+
+def _get_month_dir(*, data_dir: Path, year: int, month: int) -> Path:
     # This assumes `data_dir` points to the "nsidc0007_smmr_radiance_seaice_v01"
     # directory. E.g., /projects/DATASETS/nsidc0007_smmr_radiance_seaice_v01/.
-    expected_dir = (
-        data_dir / "TBS" / str(date.year) / calendar.month_abbr[date.month].upper()
-    )
+    return data_dir / "TBS" / str(year) / calendar.month_abbr[month].upper()
+
+
+def _tb_var_name(match: re.Match) -> str:
+    return f"{match.group('polarization').lower()}{match.group('channel')}"
+
+
+def _find_tb_files(
+    *, month_dir: Path, fn_glob: str, file_index: FileIndex | None
+) -> list[Path]:
+    """Find files in `month_dir` matching `fn_glob`.
+
+    If a `file_index` is given, files are looked up in the index instead of
+    listing `month_dir`. `month_dir` is first re-listed (in memory) if its
+    modification time has changed since it was indexed, so that a stale index
+    does not miss new files. This costs a single `stat` when it has not
+    changed.
+    """
+    if file_index is None:
+        return list(month_dir.glob(fn_glob))
+
+    file_index.refresh([month_dir])
+
+    return [
+        month_dir / fn
+        for fn in file_index.files_in(month_dir)
+        if fnmatch.fnmatchcase(fn, fn_glob)
+    ]
+
+
+def build_nsidc_0007_file_index(*, data_dir: Path, index_path: Path) -> FileIndex:
+    """Build or incrementally update an index of the NSIDC-0007 TB files.
+
+    Each `TBS/<year>/<MON>/` directory in `data_dir` is listed only if it is
+    new or its modification time has changed since the index at `index_path`
+    was last saved. The updated index is saved to `index_path` and returned.
+    """
+    file_index = FileIndex.load(root=data_dir, index_path=index_path)
+    month_dirs = [
+        month_dir for month_dir in (data_dir / "TBS").glob("*/*") if month_dir.is_dir()
+    ]
+    # Also check previously-indexed directories, so that listings for
+    # directories that have since been removed are dropped.
+    indexed_dirs = [data_dir / key for key in file_index.listings]
+    num_updated = file_index.refresh(set(month_dirs + indexed_dirs))
+    if num_updated:
+        file_index.save()
+
+    return file_index
+
+
+def get_nsidc_0007_tbs_from_disk(
+    *,
+    date: dt.date,
+    hemisphere: Hemisphere,
+    data_dir: Path,
+    file_index: FileIndex | None = None,
+    dtype: npt.DTypeLike = np.float64,
+    mask_and_scale: bool = True,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+    lazy: bool = False,
+) -> xr.Dataset:
+    """Return TB data from NSIDC-0007.
+
+    TBs are decoded directly into the given `dtype` (e.g., `np.float32`).
+
+    If `mask_and_scale` is False, the TBs are not decoded. Instead, the raw
+    int16 data are returned with CF `scale_factor` and `_FillValue`
+    attributes, which allows them to be decoded later (e.g., with
+    `xr.decode_cf`) or written to netCDF as-is.
+
+    If a `file_index` (see `build_nsidc_0007_file_index`) is given, TB files
+    are looked up in the index instead of listing directories in `data_dir`.
+    Month directories that have changed since they were indexed are re-listed
+    and updated in `file_index`. Call `file_index.save()` (or rebuild the
+    index) to persist the updates.
+
+    If `channels` (e.g., `["v18", "h37"]`) is given, only the files for those
+    channels are read. A `ValueError` is raised if any of them are not found.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read from disk and returned.
+
+    If `lazy` is True, the TB files are memory-mapped (see
+    `open_binary_tb_file`), and data are only read from disk (and decoded)
+    when they are accessed.
+    """
+    expected_dir = _get_month_dir(data_dir=data_dir, year=date.year, month=date.month)
 
     # Get all of the files containing TB data and match the expected format
-    # (e.g., the file `800929S.37H` contains Sept. 29, 1980 SH Tbs for the
-    # horizontal 37GHz channel.
     fn_glob = f"{date:%y%m%d}{hemisphere[0].upper()}.*"
-    results = list(expected_dir.glob(fn_glob))
+    results = _find_tb_files(
+        month_dir=expected_dir,
+        fn_glob=fn_glob,
+        file_index=file_index,
+    )
     if not results:
         raise FileNotFoundError(f"No NSIDC-0007 TBs found for {date=} {hemisphere=}")
 
+    tb_filenames = get_tb_var_names(
+        var_names=[tb_fp.name for tb_fp in results],
+        var_pattern=_TB_FN_RE,
+        channels=channels,
+    )
+
     tb_data_mapping = {}
-    tb_fn_re = re.compile(r".*\.(?P<channel>\d{2})(?P<polarization>H|V)")
-    for tb_fp in results:
-        match = tb_fn_re.match(tb_fp.name)
-        assert match is not None
+    for tb_name, tb_fn in tb_filenames.items():
+        tb_fp = expected_dir / tb_fn
+        attrs = {
+            "source_filename": tb_fp.name,
+            **({} if mask_and_scale else NSIDC_BINARY_TB_PACKED_ATTRS),
+        }
+        if lazy:
+            lazy_data = open_binary_tb_file(
+                filepath=tb_fp,
+                hemisphere=hemisphere,
+                dtype=dtype,
+                mask_and_scale=mask_and_scale,
+            )
+            tb_data_mapping[tb_name] = select_window(
+                xr.DataArray(lazy_data, dims=("fake_y", "fake_x"), attrs=attrs),
+                window,
+            )
+            continue
 
         data = read_binary_tb_file(
             filepath=tb_fp,
             hemisphere=hemisphere,
+            dtype=dtype,
+            mask_and_scale=mask_and_scale,
+            window=window,
         )
 
-        tb_data_mapping[
-            f"{match.group('polarization').lower()}{match.group('channel')}"
-        ] = xr.DataArray(
+        tb_data_mapping[tb_name] = xr.DataArray(
             data,
             dims=("fake_y", "fake_x"),
-            attrs={
-                "source_filename": tb_fp.name,
-            },
+            attrs=attrs,
         )
 
     normalized = xr.Dataset(tb_data_mapping)
 
     return normalized
+
+
+def _get_nsidc_0007_tb_filepaths_for_date_range(
+    *,
+    start_date: dt.date,
+    end_date: dt.date,
+    hemisphere: Hemisphere,
+    data_dir: Path,
+    file_index: FileIndex | None,
+) -> dict[dt.date, dict[str, Path]]:
+    """Map each date in the range to its TB filepaths, keyed by variable name.
+
+    Each month directory is listed only once. Dates without any data are not
+    included in the result.
+    """
+    filepaths_by_date: dict[dt.date, dict[str, Path]] = defaultdict(dict)
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        month_dir = _get_month_dir(data_dir=data_dir, year=year, month=month)
+        tb_fps = _find_tb_files(
+            month_dir=month_dir,
+            fn_glob=f"*{hemisphere[0].upper()}.*",
+            file_index=file_index,
+        )
+        for tb_fp in tb_fps:
+            if not (match := _TB_FN_RE.fullmatch(tb_fp.name)):
+                continue
+            file_date = dt.datetime.strptime(match.group("date"), "%y%m%d").date()
+            if start_date <= file_date <= end_date:
+                filepaths_by_date[file_date][_tb_var_name(match)] = tb_fp
+
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    return dict(filepaths_by_date)
+
+
+class _DateRangeBinaryTBArray(BackendArray):
+    """Lazily read `(time, y, x)` stack of NSIDC binary TB files for one channel.
+
+    `filepaths` has one entry per day, which is None for days without data.
+    Only the days that are indexed are read from disk. Days without data are
+    filled with `np.nan` (or the `_FillValue` if `mask_and_scale` is False).
+    """
+
+    def __init__(
+        self,
+        *,
+        filepaths: list[Path | None],
+        hemisphere: Hemisphere,
+        dtype: npt.DTypeLike,
+        mask_and_scale: bool,
+        window: Window | None,
+        max_workers: int,
+    ):
+        self.filepaths = filepaths
+        self.hemisphere = hemisphere
+        self.read_dtype = dtype
+        self.mask_and_scale = mask_and_scale
+        self.window = window
+        self.max_workers = max_workers
+
+        data_shape = (
+            get_binary_tb_grid_shape(hemisphere) if window is None else window.shape
+        )
+        self.shape = (len(filepaths), *data_shape)
+        if mask_and_scale:
+            self.dtype = np.dtype(dtype)
+            self.fill_value = np.nan
+        else:
+            self.dtype = NSIDC_BINARY_TB_DTYPE
+            self.fill_value = NSIDC_BINARY_TB_MISSING_VALUE
+
+    def __getitem__(self, key):
+        return indexing.explicit_indexing_adapter(
+            key,
+            self.shape,
+            indexing.IndexingSupport.BASIC,
+            self._getitem,
+        )
+
+    def _read_day(self, filepath: Path | None) -> npt.NDArray:
+        if filepath is None:
+            return np.full(self.shape[1:], self.fill_value, dtype=self.dtype)
+
+        return read_binary_tb_file(
+            filepath=filepath,
+            hemisphere=self.hemisphere,
+            dtype=self.read_dtype,
+            mask_and_scale=self.mask_and_scale,
+            window=self.window,
+        )
+
+    def _getitem(self, key):
+        time_key, grid_key = key[0], tuple(key[1:])
+        if isinstance(time_key, int):
+            return self._read_day(self.filepaths[time_key])[grid_key]
+
+        filepaths = self.filepaths[time_key]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            days = list(executor.map(self._read_day, filepaths))
+        if not days:
+            empty = np.empty((0, *self.shape[1:]), dtype=self.dtype)
+            return empty[(slice(None),) + grid_key]
+
+        return np.stack([day[grid_key] for day in days])
+
+
+def get_nsidc_0007_tbs_from_disk_for_date_range(
+    *,
+    start_date: dt.date,
+    end_date: dt.date,
+    hemisphere: Hemisphere,
+    data_dir: Path,
+    max_workers: int = 4,
+    file_index: FileIndex | None = None,
+    dtype: npt.DTypeLike = np.float64,
+    mask_and_scale: bool = True,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+) -> xr.Dataset:
+    """Return NSIDC-0007 TB data for each day in the range as a single dataset.
+
+    The returned dataset has a `time` dimension containing every day from
+    `start_date` through `end_date` (inclusive). SMMR data are generally only
+    available every other day. Days (or channels) without data are filled with
+    `np.nan`. TBs are decoded directly into the given `dtype` (e.g.,
+    `np.float32`).
+
+    TBs are read lazily: only the days that are accessed (e.g., with
+    `.isel(time=...)`) are read from disk, so that memory use is bounded by
+    the data that are actually used rather than by the length of the range.
+
+    If `mask_and_scale` is False, the raw int16 data are returned with CF
+    `scale_factor` and `_FillValue` attributes instead (see
+    `get_nsidc_0007_tbs_from_disk`). Missing days are then filled with the
+    `_FillValue`.
+
+    If `channels` (e.g., `["v18", "h37"]`) is given, only the files for those
+    channels are read. A `ValueError` is raised if any of them are not found
+    for any day in the range.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read from disk and returned.
+
+    The files for the days accessed at once are read concurrently with a pool
+    of at most `max_workers` threads.
+    If a `file_index` (see `build_nsidc_0007_file_index`) is given, TB files
+    are looked up in the index instead of listing directories in `data_dir`.
+    Month directories that have changed since they were indexed are re-listed
+    and updated in `file_index`. Call `file_index.save()` (or rebuild the
+    index) to persist the updates.
+    """
+    if end_date < start_date:
+        raise ValueError(f"{end_date=} must not be before {start_date=}.")
+
+    dates = [
+        start_date + dt.timedelta(days=offset)
+        for offset in range((end_date - start_date).days + 1)
+    ]
+    filepaths_by_date = _get_nsidc_0007_tb_filepaths_for_date_range(
+        start_date=start_date,
+        end_date=end_date,
+        hemisphere=hemisphere,
+        data_dir=data_dir,
+        file_index=file_index,
+    )
+    if not filepaths_by_date:
+        raise FileNotFoundError(
+            f"No NSIDC-0007 TBs found between {start_date=} and {end_date=}"
+            f" for {hemisphere=}"
+        )
+
+    available_var_names = {
+        var for filepaths in filepaths_by_date.values() for var in filepaths
+    }
+    if channels is None:
+        var_names = sorted(available_var_names)
+    elif missing_channels := set(channels) - available_var_names:
+        raise ValueError(
+            f"Requested channels {sorted(missing_channels)} not found."
+            f" Available channels: {sorted(available_var_names)}."
+        )
+    else:
+        var_names = list(channels)
+    lazy_arrays = {
+        var: _DateRangeBinaryTBArray(
+            filepaths=[filepaths_by_date.get(date, {}).get(var) for date in dates],
+            hemisphere=hemisphere,
+            dtype=dtype,
+            mask_and_scale=mask_and_scale,
+            window=window,
+            max_workers=max_workers,
+        )
+        for var in var_names
+    }
+    attrs = {} if mask_and_scale else NSIDC_BINARY_TB_PACKED_ATTRS
+
+    normalized = xr.Dataset(
+        {
+            var: xr.DataArray(
+                indexing.LazilyIndexedArray(lazy_array),
+                dims=("time", "fake_y", "fake_x"),
+                attrs=attrs,
+            )
+            for var, lazy_array in lazy_arrays.items()
+        },
+        coords={
+            "time": np.array(dates, dtype="datetime64[ns]"),
+        },
+    )
+
+    return normalized
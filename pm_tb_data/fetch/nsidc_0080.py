@@ -5,17 +5,30 @@ More information about NSIDC-0080: https://nsidc.org/data/nsidc-0080/versions/2
 
 import datetime as dt
 import re
+from collections.abc import Iterator, Sequence
 from pathlib import Path
 from typing import Literal
 
-import earthaccess
+import numpy.typing as npt
 import xarray as xr
 
-from pm_tb_data._types import Hemisphere
+from pm_tb_data._types import Hemisphere, Window
+from pm_tb_data.fetch.cache import GranuleCache
+from pm_tb_data.fetch.cmr_cache import CMRSearchCache
+from pm_tb_data.fetch.granules import (
+    get_granules_by_date,
+    open_granule,
+    open_granules_for_date_range,
+)
+from pm_tb_data.fetch.util import get_tb_var_names, select_window
 
 NSIDC_0080_RESOLUTION = Literal["25", "12.5"]
 NSIDC_0080_PLATFORM_ID = Literal["F16", "F17", "F18"]
 
+_NSIDC_0080_FN_DATE_REGEX = re.compile(
+    r"NSIDC0080_TB_PS_(N|S)[\d.]+km_(?P<date>\d{8})_v2\.0\.nc"
+)
+
 
 def get_nsidc_0080_fp_on_disk(
     *,
@@ -48,24 +61,36 @@ def _normalize_nsidc_0080_tbs(
     ds: xr.Dataset,
     hemisphere: Hemisphere,
     platform_id: NSIDC_0080_PLATFORM_ID,
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
 ) -> xr.Dataset:
     var_pattern = re.compile(
         f"TB_{platform_id}_{hemisphere[0].upper()}H_"
         r"(?P<channel>\d{2})(?P<polarization>H|V)"
     )
 
+    # Only the variables for the requested channels are selected. Data for the
+    # other variables are never read from disk.
+    tb_var_names = get_tb_var_names(
+        var_names=ds.keys(),
+        var_pattern=var_pattern,
+        channels=channels,
+    )
+
     tb_data_mapping = {}
-    for var in ds.keys():
-        if match := var_pattern.match(str(var)):
-            # Preserve variable attrs, but rename the variable and it's dims for
-            # consistency.
-            tb_data_mapping[
-                f"{match.group('polarization').lower()}{match.group('channel')}"
-            ] = xr.DataArray(
-                ds[var].isel(time=0),
-                dims=("fake_y", "fake_x"),
-                attrs=ds[var].attrs,
-            )
+    for tb_name, var in tb_var_names.items():
+        data = select_window(ds[var].isel(time=0), window)
+        if dtype is not None and data.dtype != dtype:
+            data = data.astype(dtype)
+
+        # Preserve variable attrs, but rename the variable and it's dims for
+        # consistency.
+        tb_data_mapping[tb_name] = xr.DataArray(
+            data,
+            dims=("fake_y", "fake_x"),
+            attrs=ds[var].attrs,
+        )
 
     normalized = xr.Dataset(tb_data_mapping)
 
@@ -79,7 +104,21 @@ def get_nsidc_0080_tbs_from_disk(
     resolution: NSIDC_0080_RESOLUTION,
     platform_id: NSIDC_0080_PLATFORM_ID,
     data_dir: Path = Path("/ecs/DP1/PM/NSIDC-0080.002/"),
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
 ) -> xr.Dataset:
+    """Return TB data from NSIDC-0080.
+
+    If `dtype` is given, TBs are cast to that dtype (e.g., `np.float32`).
+    Otherwise, the dtype of the TBs decoded by `xarray` is kept.
+
+    If `channels` (e.g., `["v19", "h37"]`) is given, only those channels are
+    read. A `ValueError` is raised if any of them are not in the data file.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read from disk and returned.
+    """
     filepath = get_nsidc_0080_fp_on_disk(
         data_dir=data_dir,
         hemisphere=hemisphere,
@@ -87,19 +126,77 @@ def get_nsidc_0080_tbs_from_disk(
         resolution=resolution,
     )
 
-    # TODO: ideally, we would use datatree here. xarray >2024.9 should have
-    # datatree integrated directly.
+    # NOTE: to read data for more than one platform, use
+    # `get_nsidc_0080_tbs_by_platform_from_disk`, which only opens the file
+    # once.
     ds = xr.open_dataset(filepath, group=platform_id)
 
     ds = _normalize_nsidc_0080_tbs(
         ds=ds,
         hemisphere=hemisphere,
         platform_id=platform_id,
+        dtype=dtype,
+        channels=channels,
+        window=window,
     )
 
     return ds
 
 
+def get_nsidc_0080_tbs_by_platform_from_disk(
+    *,
+    hemisphere: Hemisphere,
+    date: dt.date,
+    resolution: NSIDC_0080_RESOLUTION,
+    platform_ids: Sequence[NSIDC_0080_PLATFORM_ID],
+    data_dir: Path = Path("/ecs/DP1/PM/NSIDC-0080.002/"),
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+) -> dict[NSIDC_0080_PLATFORM_ID, xr.Dataset]:
+    """Return TB data from NSIDC-0080 for each of the given `platform_ids`.
+
+    The data file is opened (and its metadata parsed) only once, no matter how
+    many platforms are requested. The requested TBs are read into memory, and
+    the data file is closed before returning.
+
+    See `get_nsidc_0080_tbs_from_disk` for more information.
+    """
+    filepath = get_nsidc_0080_fp_on_disk(
+        data_dir=data_dir,
+        hemisphere=hemisphere,
+        date=date,
+        resolution=resolution,
+    )
+    with xr.open_datatree(filepath) as tree:
+        missing_platform_ids = [
+            platform_id
+            for platform_id in platform_ids
+            if platform_id not in tree.children
+        ]
+        if missing_platform_ids:
+            raise FileNotFoundError(
+                f"No data for expected platforms {missing_platform_ids} in"
+                f" NSIDC-0080 file for {date:%Y-%m-%d}"
+            )
+
+        normalized_by_platform = {
+            platform_id: _normalize_nsidc_0080_tbs(
+                # As when a single group is opened, the coordinates of the
+                # root group (e.g., x/y) are not inherited.
+                ds=tree[platform_id].to_dataset(inherit=False),
+                hemisphere=hemisphere,
+                platform_id=platform_id,
+                dtype=dtype,
+                channels=channels,
+                window=window,
+            ).load()
+            for platform_id in platform_ids
+        }
+
+    return normalized_by_platform
+
+
 def get_nsidc_0080_tbs(
     *,
     hemisphere: Hemisphere,
@@ -107,32 +204,114 @@ def get_nsidc_0080_tbs(
     resolution: NSIDC_0080_RESOLUTION,
     platform_id: NSIDC_0080_PLATFORM_ID,
     version: str = "2",
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+    cache: GranuleCache | None = None,
+    search_cache: CMRSearchCache | None = None,
 ) -> xr.Dataset:
-    """Return TB data from NSIDC-0080 using `earthaccess`"""
+    """Return TB data from NSIDC-0080 using `earthaccess`
+
+    If `dtype` is given, TBs are cast to that dtype (e.g., `np.float32`).
+    Otherwise, the dtype of the TBs decoded by `xarray` is kept.
+
+    If `channels` (e.g., `["v19", "h37"]`) is given, only those channels are
+    read. A `ValueError` is raised if any of them are not in the data file.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read and returned.
+
+    If a `cache` is given, the granule is served from the cache if it was
+    fetched before. Otherwise, it is fetched into the cache.
+
+    If a `search_cache` is given, CMR search results are served from it when
+    possible (see `pm_tb_data.fetch.cmr_cache.CMRSearchCache`).
+    """
     expected_fn = (
         "NSIDC0080_TB_PS"
         f"_{hemisphere[0].upper()}{resolution}km"
         f"_{date:%Y%m%d}_v2.0.nc"
     )
 
-    results = earthaccess.search_data(
+    granule_file = open_granule(
         short_name="NSIDC-0080",
         version=version,
-        cloud_hosted=True,
+        date=date,
         granule_name=expected_fn,
+        cache=cache,
+        search_cache=search_cache,
     )
-    assert len(results) == 1
-    granule_result = results[0]
-    _earthaccess_granule = earthaccess.open([granule_result])
 
-    # TODO: ideally, we would use datatree here. xarray >2024.9 should have
-    # datatree integrated directly.
-    ds = xr.open_dataset(_earthaccess_granule[0], group=platform_id)
+    ds = xr.open_dataset(granule_file, group=platform_id)
 
     ds = _normalize_nsidc_0080_tbs(
         ds=ds,
         hemisphere=hemisphere,
         platform_id=platform_id,
+        dtype=dtype,
+        channels=channels,
+        window=window,
     )
 
     return ds
+
+
+def get_nsidc_0080_tbs_for_date_range(
+    *,
+    start_date: dt.date,
+    end_date: dt.date,
+    hemisphere: Hemisphere,
+    resolution: NSIDC_0080_RESOLUTION,
+    platform_id: NSIDC_0080_PLATFORM_ID,
+    version: str = "2",
+    max_workers: int = 4,
+    dtype: npt.DTypeLike | None = None,
+    channels: Sequence[str] | None = None,
+    window: Window | None = None,
+    cache: GranuleCache | None = None,
+    search_cache: CMRSearchCache | None = None,
+) -> Iterator[tuple[dt.date, xr.Dataset]]:
+    """Yield `(date, tbs)` from NSIDC-0080 for each date in the range.
+
+    A single CMR search is made for the whole range, and granules are opened
+    `max_workers` at a time with `earthaccess`. Dates are yielded in order.
+    Dates without data are skipped with a warning.
+
+    If a `cache` is given, cached granules are read from disk, and the others
+    are fetched into the cache.
+
+    If a `search_cache` is given, the CMR search results are served from it
+    when possible.
+
+    See `get_nsidc_0080_tbs` for more information.
+    """
+    granules_by_date = get_granules_by_date(
+        short_name="NSIDC-0080",
+        version=version,
+        start_date=start_date,
+        end_date=end_date,
+        granule_name=(
+            f"NSIDC0080_TB_PS_{hemisphere[0].upper()}{resolution}km_*_v2.0.nc"
+        ),
+        fn_date_regex=_NSIDC_0080_FN_DATE_REGEX,
+        search_cache=search_cache,
+    )
+
+    for date, granule_file in open_granules_for_date_range(
+        granules_by_date=granules_by_date,
+        start_date=start_date,
+        end_date=end_date,
+        max_workers=max_workers,
+        cache=cache,
+    ):
+        ds = xr.open_dataset(granule_file, group=platform_id)
+        normalized_ds = _normalize_nsidc_0080_tbs(
+            ds=ds,
+            hemisphere=hemisphere,
+            platform_id=platform_id,
+            dtype=dtype,
+            channels=channels,
+            window=window,
+        )
+
+        yield date, normalized_ds
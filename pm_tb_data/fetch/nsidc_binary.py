@@ -2,40 +2,283 @@ from pathlib import Path
 
 import numpy as np
 import numpy.typing as npt
+from loguru import logger
+from xarray.backends import BackendArray
+from xarray.core import indexing
 
-from pm_tb_data._types import Hemisphere
+from pm_tb_data._types import Hemisphere, Window
+from pm_tb_data.fetch.util import validate_window
+
+# Radiances are in 0.1 kelvins, stored as 2-byte integers, with the least
+# significant byte (lsb) first (lower address) and msb second (higher
+# address). Thus, a value of 1577 represents a Tb of 157.7 kelvins. A value of
+# 0 represents missing data.
+NSIDC_BINARY_TB_DTYPE = np.dtype("<i2")
+NSIDC_BINARY_TB_SCALE_FACTOR = 0.1
+NSIDC_BINARY_TB_MISSING_VALUE = 0
+# CF-convention attributes describing the packed (raw) TB data. `xarray`
+# decodes data with these attributes (e.g., via `xr.decode_cf`) to Kelvins, and
+# writes them to netCDF as packed int16s.
+NSIDC_BINARY_TB_PACKED_ATTRS = {
+    "scale_factor": NSIDC_BINARY_TB_SCALE_FACTOR,
+    "_FillValue": NSIDC_BINARY_TB_DTYPE.type(NSIDC_BINARY_TB_MISSING_VALUE),
+}
+
+
+def get_binary_tb_grid_shape(hemisphere: Hemisphere) -> tuple[int, int]:
+    grid_shape = dict(
+        north=(448, 304),
+        south=(332, 316),
+    )[hemisphere]
+
+    return grid_shape
+
+
+def decode_scaled_int16(
+    raw: npt.ArrayLike,
+    *,
+    scale_factor: float | None = None,
+    scale_divisor: float | None = None,
+    missing_value: int | None,
+    dtype: npt.DTypeLike = np.float64,
+) -> npt.NDArray[np.floating]:
+    """Decode scaled int16 values into `dtype`, masking `missing_value` as NaN.
+
+    Values are either multiplied by `scale_factor` or divided by
+    `scale_divisor`. Exactly one of them must be given. The two are not
+    interchangeable: e.g., dividing by 100 does not always give the same
+    floating point values as multiplying by 0.01.
+
+    The scaled values are written directly into an array of the requested
+    `dtype`, without an intermediate float64 array when e.g., `np.float32` is
+    requested.
+    """
+    raw = np.asarray(raw)
+    out_dtype = np.dtype(dtype)
+    if (scale_factor is None) == (scale_divisor is None):
+        raise ValueError("Exactly one of `scale_factor` or `scale_divisor` is needed.")
+    if scale_divisor is not None:
+        decoded = np.divide(
+            raw, np.array(scale_divisor, dtype=out_dtype), dtype=out_dtype
+        )
+    else:
+        decoded = np.multiply(
+            raw, np.array(scale_factor, dtype=out_dtype), dtype=out_dtype
+        )
+    if missing_value is not None:
+        decoded[raw == missing_value] = np.nan
+
+    return decoded
+
+
+class ScaledInt16BinaryArray(BackendArray):
+    """Lazily decoded, memory-mapped view of a binary file of scaled int16s.
+
+    Data are only read from disk, scaled, and masked when indexed, so that
+    consumers that only need a subset of the grid never decode the whole file.
+    The file is read as `raw_dtype`, which sets its byte order. See
+    `decode_scaled_int16` for how values are decoded.
+    """
+
+    def __init__(
+        self,
+        *,
+        filepath: Path,
+        shape: tuple[int, int],
+        scale_factor: float | None = None,
+        scale_divisor: float | None = None,
+        missing_value: int | None,
+        dtype: npt.DTypeLike = np.float64,
+        raw_dtype: npt.DTypeLike = NSIDC_BINARY_TB_DTYPE,
+    ):
+        self.filepath = filepath
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+        self.scale_factor = scale_factor
+        self.scale_divisor = scale_divisor
+        self.missing_value = missing_value
+
+        self._raw = np.memmap(
+            filepath,
+            dtype=raw_dtype,
+            mode="r",
+            shape=shape,
+        )
+
+    def __getitem__(self, key):
+        return indexing.explicit_indexing_adapter(
+            key,
+            self.shape,
+            indexing.IndexingSupport.BASIC,
+            self._getitem,
+        )
+
+    def _getitem(self, key):
+        return decode_scaled_int16(
+            self._raw[key],
+            scale_factor=self.scale_factor,
+            scale_divisor=self.scale_divisor,
+            missing_value=self.missing_value,
+            dtype=self.dtype,
+        )
+
+
+def _get_unreadable_fill_value(*, mask_and_scale: bool) -> float:
+    """Return the value that unreadable files are filled with.
+
+    Unreadable files are treated as all-missing data: `np.nan` once decoded,
+    or the raw missing value otherwise.
+    """
+    return np.nan if mask_and_scale else NSIDC_BINARY_TB_MISSING_VALUE
+
+
+def _report_unreadable_file(
+    *, filepath: Path, error: Exception, fill_value: float
+) -> None:
+    # NOTE: This occurs for file:
+    # /projects/DATASETS/nsidc0007_smmr_radiance_seaice_v01/TBS/1985/AUG/850804S.37H
+    logger.warning(
+        f"ValueError trying to read from binary file {filepath}: {error}."
+        f" Filling with {fill_value}."
+    )
+
+
+def _read_raw_binary_tbs(
+    *,
+    filepath: Path,
+    grid_shape: tuple[int, int],
+    window: Window | None,
+) -> npt.NDArray[np.int16]:
+    if window is None:
+        return np.fromfile(filepath, NSIDC_BINARY_TB_DTYPE).reshape(grid_shape)
+
+    num_rows, num_cols = grid_shape
+    expected_size = NSIDC_BINARY_TB_DTYPE.itemsize * num_rows * num_cols
+    actual_size = filepath.stat().st_size
+    if actual_size != expected_size:
+        raise ValueError(
+            f"Expected file of {expected_size} bytes. Got {actual_size} bytes."
+        )
+
+    # Rows are stored contiguously, so only the band of rows covering the window
+    # is read, starting at the byte offset of the window's first row.
+    window_rows, _ = window.shape
+    row_band = np.fromfile(
+        filepath,
+        NSIDC_BINARY_TB_DTYPE,
+        count=window_rows * num_cols,
+        offset=window.row_start * num_cols * NSIDC_BINARY_TB_DTYPE.itemsize,
+    ).reshape(window_rows, num_cols)
+
+    return np.ascontiguousarray(row_band[:, window.col_slice])
 
 
 def read_binary_tb_file(
     *,
     filepath: Path,
     hemisphere: Hemisphere,
-) -> npt.NDArray[np.floating]:
+    dtype: npt.DTypeLike = np.float64,
+    mask_and_scale: bool = True,
+    window: Window | None = None,
+) -> npt.NDArray:
     """Read 25km NSIDC binary data from disk.
 
     Returns data in Kelvins. No/missing data areas are masked with `np.nan`.
+
+    If `mask_and_scale` is False, the raw int16 data (in 0.1 Kelvins, with 0
+    representing missing data) are returned instead, and `dtype` is
+    ignored. See `NSIDC_BINARY_TB_PACKED_ATTRS`.
+
+    If a `window` is given, only the data within that row/column window of the
+    grid are read from disk and returned.
     """
-    grid_shape = dict(
-        north=(448, 304),
-        south=(332, 316),
-    )[hemisphere]
+    grid_shape = get_binary_tb_grid_shape(hemisphere)
+    if window is not None:
+        validate_window(window, grid_shape=grid_shape)
+    data_shape = grid_shape if window is None else window.shape
 
     try:
-        tb_data = np.fromfile(filepath, np.dtype("<i2")).reshape(grid_shape)
+        tb_data = _read_raw_binary_tbs(
+            filepath=filepath,
+            grid_shape=grid_shape,
+            window=window,
+        )
     except ValueError as e:
-        # TODO: we want a log statement and a warning here!
-        # NOTE: This occurs for file:
-        # /projects/DATASETS/nsidc0007_smmr_radiance_seaice_v01/TBS/1985/AUG/850804S.37H
-        print(f"ValueError trying to read from binary file\n{e}")
-        print(f"file: {filepath}")
-        tb_data = np.zeros(grid_shape, np.dtype("<i2"))
+        _report_unreadable_file(
+            filepath=filepath,
+            error=e,
+            fill_value=_get_unreadable_fill_value(mask_and_scale=mask_and_scale),
+        )
+        tb_data = np.full(
+            data_shape, NSIDC_BINARY_TB_MISSING_VALUE, NSIDC_BINARY_TB_DTYPE
+        )
 
-    # Radiances are in 0.1 kelvins, stored as 2-byte integers, with the least
-    # significant byte (lsb) first (lower address) and msb second (higher
-    # address). Thus, a value of 1577 represents a Tb of 157.7 kelvins.
-    tb_data_kelvins = tb_data * 0.1
+    if not mask_and_scale:
+        return tb_data
 
-    # Mask out values of 0 (missing data):
-    tb_data_kelvins[tb_data == 0] = np.nan
+    tb_data_kelvins = decode_scaled_int16(
+        tb_data,
+        scale_factor=NSIDC_BINARY_TB_SCALE_FACTOR,
+        missing_value=NSIDC_BINARY_TB_MISSING_VALUE,
+        dtype=dtype,
+    )
 
     return tb_data_kelvins
+
+
+def open_binary_tb_file(
+    *,
+    filepath: Path,
+    hemisphere: Hemisphere,
+    dtype: npt.DTypeLike = np.float64,
+    mask_and_scale: bool = True,
+) -> indexing.LazilyIndexedArray:
+    """Memory-map 25km NSIDC binary data from disk without decoding it.
+
+    Returns a lazily-indexed array suitable for wrapping in an `xr.DataArray`.
+    Values are converted to Kelvins and no/missing data areas are masked with
+    `np.nan` only when they are accessed.
+
+    If `mask_and_scale` is False, the raw int16 data are returned instead, and
+    `dtype` is ignored. See `NSIDC_BINARY_TB_PACKED_ATTRS`.
+    """
+    grid_shape = get_binary_tb_grid_shape(hemisphere)
+    expected_size = NSIDC_BINARY_TB_DTYPE.itemsize * grid_shape[0] * grid_shape[1]
+
+    actual_size = filepath.stat().st_size
+    if actual_size != expected_size:
+        fill_value = _get_unreadable_fill_value(mask_and_scale=mask_and_scale)
+        _report_unreadable_file(
+            filepath=filepath,
+            error=ValueError(
+                f"Expected file of {expected_size} bytes. Got {actual_size} bytes."
+            ),
+            fill_value=fill_value,
+        )
+        # Represent the unreadable file as all-missing data, consistent with
+        # `read_binary_tb_file`.
+        return indexing.LazilyIndexedArray(
+            indexing.NumpyIndexingAdapter(
+                np.full(
+                    grid_shape,
+                    fill_value,
+                    dtype=dtype if mask_and_scale else NSIDC_BINARY_TB_DTYPE,
+                )
+            )
+        )
+
+    if not mask_and_scale:
+        raw = np.memmap(
+            filepath, dtype=NSIDC_BINARY_TB_DTYPE, mode="r", shape=grid_shape
+        )
+        return indexing.LazilyIndexedArray(indexing.NumpyIndexingAdapter(raw))
+
+    return indexing.LazilyIndexedArray(
+        ScaledInt16BinaryArray(
+            filepath=filepath,
+            shape=grid_shape,
+            scale_factor=NSIDC_BINARY_TB_SCALE_FACTOR,
+            missing_value=NSIDC_BINARY_TB_MISSING_VALUE,
+            dtype=dtype,
+        )
+    )
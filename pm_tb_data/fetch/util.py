@@ -0,0 +1,72 @@
+"""Helpers for selecting the TB variables and grid window to read."""
+
+import re
+from collections.abc import Hashable, Iterable, Sequence
+
+import xarray as xr
+
+from pm_tb_data._types import Window
+
+
+def get_tb_var_names(
+    *,
+    var_names: Iterable[Hashable],
+    var_pattern: re.Pattern,
+    channels: Sequence[str] | None = None,
+) -> dict[str, str]:
+    """Map 'standard' TB names to the matching names in `var_names`.
+
+    `var_pattern` must define `channel` and `polarization` groups. Matching
+    names are mapped to the 'standard' {polarization}{channel} name. E.g.,
+    `TB_F17_19H` becomes `h19`.
+
+    If `channels` (e.g., `["v19", "h37"]`) is given, only those channels are
+    included in the result, and a `ValueError` is raised if any of them are not
+    found in `var_names`.
+    """
+    tb_var_names = {}
+    for var_name in var_names:
+        if match := var_pattern.match(str(var_name)):
+            standard_name = (
+                f"{match.group('polarization').lower()}{match.group('channel')}"
+            )
+            tb_var_names[standard_name] = str(var_name)
+
+    if channels is None:
+        return tb_var_names
+
+    missing_channels = [channel for channel in channels if channel not in tb_var_names]
+    if missing_channels:
+        raise ValueError(
+            f"Requested channels {missing_channels} not found."
+            f" Available channels: {sorted(tb_var_names)}."
+        )
+
+    return {channel: tb_var_names[channel] for channel in channels}
+
+
+def validate_window(window: Window, *, grid_shape: tuple[int, int]) -> None:
+    """Raise a `ValueError` if `window` is not within a grid of `grid_shape`."""
+    num_rows, num_cols = grid_shape
+    window_in_bounds = (
+        0 <= window.row_start < window.row_stop <= num_rows
+        and 0 <= window.col_start < window.col_stop <= num_cols
+    )
+    if not window_in_bounds:
+        raise ValueError(f"{window=} is not within the {grid_shape} grid.")
+
+
+def select_window(data: xr.DataArray, window: Window | None) -> xr.DataArray:
+    """Select the `window` from the last two (row, column) dims of `data`.
+
+    Selection is lazy for lazily-loaded data, so only the window is read from
+    disk (e.g., as a netCDF/HDF5 hyperslab). `data` is returned unchanged if
+    `window` is None.
+    """
+    if window is None:
+        return data
+
+    row_dim, col_dim = data.dims[-2:]
+    validate_window(window, grid_shape=(data.sizes[row_dim], data.sizes[col_dim]))
+
+    return data.isel({row_dim: window.row_slice, col_dim: window.col_slice})
@@ -0,0 +1,141 @@
+import re
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+_RANGE_REGEX = re.compile(r"bytes=(?P<start>\d+)-$")
+
+
+class StandInServer:
+    """Local HTTP server that stands in for a remote data host.
+
+    Files are served from memory and support `Range: bytes=N-` requests
+    (conditional on `If-Range`) and conditional (`If-None-Match`) requests,
+    with an ETag derived from the file's contents. If a path is in
+    `truncate_after`, responses for it announce the full length but the
+    connection is dropped after that many bytes of the body. Range requests
+    for paths in `ignore_range_start` are answered from the start of the file
+    (as some misbehaving servers do). If a path is in `pause_after`, the
+    `paused` event is set after that many bytes of the body are sent, and the
+    rest is only sent once the `resume` event is set. Responses are delayed by
+    `response_delay` seconds, and the greatest number of requests handled at
+    once is recorded in `max_in_flight`.
+    """
+
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+        self.truncate_after: dict[str, int] = {}
+        self.ignore_range_start: set[str] = set()
+        self.pause_after: dict[str, int] = {}
+        self.paused = threading.Event()
+        self.resume = threading.Event()
+        self.requests: list[dict[str, str]] = []
+        self.response_delay = 0.0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def url_for(self, path: str) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}{path}"
+
+    def start(self):
+        self._thread.start()
+
+    @contextmanager
+    def track_in_flight(self) -> Iterator[None]:
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            time.sleep(self.response_delay)
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def _make_handler(server: StandInServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *_args):
+            pass
+
+        def do_GET(self):
+            server.requests.append(dict(self.headers))
+            with server.track_in_flight():
+                self._respond()
+
+        def _respond(self):
+            if (data := server.files.get(self.path)) is None:
+                self.send_error(404)
+                return
+
+            etag = f'"{zlib.crc32(data):08x}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            start = 0
+            range_header = self.headers.get("Range")
+            if_range = self.headers.get("If-Range")
+            if if_range is not None and if_range != etag:
+                # The file has changed. Send all of it.
+                range_header = None
+            if range_header:
+                if not (match := _RANGE_REGEX.match(range_header)):
+                    self.send_error(400)
+                    return
+                start = int(match.group("start"))
+                if self.path in server.ignore_range_start:
+                    start = 0
+                if start >= len(data):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(data)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header(
+                    "Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}"
+                )
+            else:
+                self.send_response(200)
+
+            body = data[start:]
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if (truncate_after := server.truncate_after.get(self.path)) is not None:
+                self.wfile.write(body[:truncate_after])
+                self.close_connection = True
+                return
+            if (pause_after := server.pause_after.get(self.path)) is not None:
+                self.wfile.write(body[:pause_after])
+                self.wfile.flush()
+                server.paused.set()
+                server.resume.wait(timeout=5)
+                body = body[pause_after:]
+            self.wfile.write(body)
+
+    return Handler
+
+
+@pytest.fixture
+def stand_in_server():
+    server = StandInServer()
+    server.start()
+    yield server
+    server.stop()
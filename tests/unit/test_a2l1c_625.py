@@ -0,0 +1,265 @@
+import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+import xarray as xr
+from netCDF4 import Dataset
+from numpy.testing import assert_array_equal
+
+from pm_tb_data._types import NORTH, Window
+from pm_tb_data.fetch import a2l1c_625
+
+_DATE = dt.date(2022, 1, 15)
+
+
+def _write_mock_dat_files(base_dir, *, tim="am"):
+    raw_by_chan = {}
+    for idx, chan in enumerate(("18v", "23v", "36h", "36v")):
+        raw = np.full((1680, 1680), 20000 + idx, dtype=a2l1c_625.A2L1C_625_RAW_DTYPE)
+        raw.tofile(base_dir / f"tb_a2im_sir_{chan}_{tim}_e2n6.25_{_DATE:%Y%m%d}.dat")
+        raw_by_chan[chan] = raw
+
+    return raw_by_chan
+
+
+def test_get_a2l1c_625_tbs_dat(tmp_path):
+    raw_by_chan = _write_mock_dat_files(tmp_path)
+
+    actual = a2l1c_625.get_a2l1c_625_tbs(
+        base_dir=tmp_path,
+        date=_DATE,
+        hemisphere=NORTH,
+        ncfn_template=None,
+        timeframe="M",
+    )
+
+    assert set(actual.data_vars) == {"v18", "v23", "h36", "v36"}
+    assert actual.v18.dtype == np.float64
+    assert_array_equal(actual.h36, raw_by_chan["36h"] / 100.0)
+
+
+def test_get_a2l1c_625_tbs_dat_packed(tmp_path):
+    _write_mock_dat_files(tmp_path)
+
+    packed = a2l1c_625.get_a2l1c_625_tbs(
+        base_dir=tmp_path,
+        date=_DATE,
+        hemisphere=NORTH,
+        ncfn_template=None,
+        timeframe="M",
+        mask_and_scale=False,
+    )
+    decoded = a2l1c_625.get_a2l1c_625_tbs(
+        base_dir=tmp_path,
+        date=_DATE,
+        hemisphere=NORTH,
+        ncfn_template=None,
+        timeframe="M",
+    )
+
+    assert packed.v36.dtype == np.int16
+    assert packed.v36.attrs["scale_factor"] == 0.01
+    assert packed.v36.attrs["_FillValue"] == 0
+    xr.testing.assert_allclose(xr.decode_cf(packed), decoded)
+
+
+def test_get_a2l1c_625_tbs_dat_missing(tmp_path):
+    raw_by_chan = _write_mock_dat_files(tmp_path)
+    raw_by_chan["18v"][0, :2] = 0
+    raw_by_chan["18v"].tofile(
+        tmp_path / f"tb_a2im_sir_18v_am_e2n6.25_{_DATE:%Y%m%d}.dat"
+    )
+
+    actual = a2l1c_625.get_a2l1c_625_tbs(
+        base_dir=tmp_path,
+        date=_DATE,
+        hemisphere=NORTH,
+        ncfn_template=None,
+        timeframe="M",
+    )
+
+    assert np.all(np.isnan(actual.v18[0, :2]))
+    assert not np.any(np.isnan(actual.v18[0, 2:]))
+
+
+def test_get_a2l1c_625_tbs_packed_requires_dat(tmp_path):
+    with pytest.raises(ValueError, match="raw binary a2l1c files"):
+        a2l1c_625.get_a2l1c_625_tbs(
+            base_dir=tmp_path,
+            date=_DATE,
+            hemisphere=NORTH,
+            ncfn_template=None,
+            timeframe="M",
+            mask_and_scale=False,
+        )
+
+
+_NCFN_TEMPLATE = "EASE2_{hemlet}{gridres}km-{year}{doy}-{capchan}-{tim}.nc"
+
+
+def _write_mock_nc_files(base_dir, *, dim):
+    """Write NSIDC-0763-like files for a hemispheric 6.25km grid of `dim`."""
+    for chan in ("18v", "23v", "36h", "36v"):
+        gridres, chan_dim = ("6.25", dim) if int(chan[:2]) < 30 else ("3.125", dim * 2)
+        filepath = base_dir / _NCFN_TEMPLATE.format(
+            hemlet="N",
+            gridres=gridres,
+            year=f"{_DATE:%Y}",
+            doy=f"{_DATE:%j}",
+            capchan=chan.upper(),
+            tim="M",
+        )
+        with Dataset(filepath, "w") as nc_ds:
+            nc_ds.createDimension("time", 1)
+            nc_ds.createDimension("y", chan_dim)
+            nc_ds.createDimension("x", chan_dim)
+            tb_var = nc_ds.createVariable("TB", "f4", ("time", "y", "x"))
+            # Each TB is its (native) flat index, so windows are easy to check.
+            tb_var[:] = np.arange(1, chan_dim * chan_dim + 1).reshape(
+                1, chan_dim, chan_dim
+            )
+
+
+def test_get_a2l1c_625_tbs_nc_window(tmp_path):
+    _write_mock_nc_files(tmp_path, dim=8)
+    window = Window(row_start=2, row_stop=6, col_start=4, col_stop=7)
+
+    actual = a2l1c_625.get_a2l1c_625_tbs(
+        base_dir=tmp_path,
+        date=_DATE,
+        hemisphere=NORTH,
+        ncfn_template=_NCFN_TEMPLATE,
+        timeframe="M",
+        window=window,
+    )
+
+    full_625 = np.arange(1, 8 * 8 + 1).reshape(8, 8)
+    assert_array_equal(actual.v18, full_625[2:6, 4:7])
+    # The 3.125km channels are read at twice the extent and block-averaged.
+    full_3125 = np.arange(1, 16 * 16 + 1).reshape(16, 16)
+    expected_36 = full_3125[4:12, 8:14].reshape(4, 2, 3, 2).mean(axis=(1, 3))
+    assert_array_equal(actual.v36, expected_36)
+
+
+def test_get_a2l1c_625_tbs_dat_window(tmp_path):
+    raw_by_chan = _write_mock_dat_files(tmp_path)
+    window = Window(row_start=700, row_stop=710, col_start=600, col_stop=620)
+
+    actual = a2l1c_625.get_a2l1c_625_tbs(
+        base_dir=tmp_path,
+        date=_DATE,
+        hemisphere=NORTH,
+        ncfn_template=None,
+        timeframe="M",
+        window=window,
+    )
+
+    assert actual.v23.shape == (10, 20)
+    assert_array_equal(actual.v23, raw_by_chan["23v"][100:110, 0:20] / 100.0)
+
+    # The raw binary files only cover the a2l1c subset.
+    with pytest.raises(ValueError):
+        a2l1c_625.get_a2l1c_625_tbs(
+            base_dir=tmp_path,
+            date=_DATE,
+            hemisphere=NORTH,
+            ncfn_template=None,
+            timeframe="M",
+            window=Window(row_start=0, row_stop=10, col_start=600, col_stop=620),
+        )
+
+
+@pytest.mark.parametrize("use_nc", [False, True])
+def test_get_a2l1c_625_tbs_max_workers(tmp_path, use_nc):
+    if use_nc:
+        _write_mock_nc_files(tmp_path, dim=8)
+        window = Window(row_start=0, row_stop=8, col_start=0, col_stop=8)
+    else:
+        _write_mock_dat_files(tmp_path)
+        window = a2l1c_625.A2L1C_625_SUBSET_WINDOW
+
+    tbs_by_max_workers = {
+        max_workers: a2l1c_625.get_a2l1c_625_tbs(
+            base_dir=tmp_path,
+            date=_DATE,
+            hemisphere=NORTH,
+            ncfn_template=_NCFN_TEMPLATE,
+            timeframe="M",
+            window=window,
+            max_workers=max_workers,
+        )
+        for max_workers in (1, 4)
+    }
+
+    xr.testing.assert_identical(tbs_by_max_workers[1], tbs_by_max_workers[4])
+
+
+def test_get_a2l1c_625_tbs_nc_executor(tmp_path):
+    _write_mock_nc_files(tmp_path, dim=8)
+    kwargs = dict(
+        base_dir=tmp_path,
+        date=_DATE,
+        hemisphere=NORTH,
+        ncfn_template=_NCFN_TEMPLATE,
+        timeframe="M",
+        window=Window(row_start=0, row_stop=8, col_start=0, col_stop=8),
+    )
+    expected = a2l1c_625.get_a2l1c_625_tbs(**kwargs)
+
+    # The same executor can be re-used across calls.
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for _ in range(2):
+            actual = a2l1c_625.get_a2l1c_625_tbs(**kwargs, executor=executor)
+            xr.testing.assert_identical(actual, expected)
+
+
+def test_get_a2l1c_625_tbs_dat_lazy(tmp_path):
+    raw_by_chan = _write_mock_dat_files(tmp_path)
+
+    actual = a2l1c_625.get_a2l1c_625_tbs(
+        base_dir=tmp_path,
+        date=_DATE,
+        hemisphere=NORTH,
+        ncfn_template=None,
+        timeframe="M",
+        dtype=np.float32,
+        lazy=True,
+    )
+
+    # The data are not read until they are accessed.
+    assert not actual.v18.variable._in_memory
+    pixels = actual.v18.isel(x=[0, 100], y=[5, 6])
+    assert pixels.dtype == np.float32
+    assert_array_equal(pixels, raw_by_chan["18v"][[0, 100]][:, [5, 6]] * 0.01)
+
+
+def test_open_a2l1c_625_dat_file_validates_size(tmp_path):
+    filepath = tmp_path / f"tb_a2im_sir_18v_am_e2n6.25_{_DATE:%Y%m%d}.dat"
+    np.zeros((10, 10), dtype=a2l1c_625.A2L1C_625_RAW_DTYPE).tofile(filepath)
+
+    with pytest.raises(ValueError, match="800 bytes"):
+        a2l1c_625.open_a2l1c_625_dat_file(filepath=filepath, dim=20)
+
+    with pytest.raises(FileNotFoundError):
+        a2l1c_625.open_a2l1c_625_dat_file(filepath=tmp_path / "missing.dat")
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_open_a2l1c_625_dat_file_divides_by_100(tmp_path, dtype):
+    filepath = tmp_path / "tb_a2im_sir_18v_am_e2n6.25_20220115.dat"
+    # Every non-negative int16 value.
+    dim = 182
+    raw = (np.arange(dim * dim) % 32768).astype(a2l1c_625.A2L1C_625_RAW_DTYPE)
+    raw.tofile(filepath)
+
+    actual = np.asarray(
+        a2l1c_625.open_a2l1c_625_dat_file(filepath=filepath, dim=dim, dtype=dtype)
+    ).ravel()
+
+    # Decoded TBs are exactly the raw values divided by 100, which is not
+    # always the same as multiplying them by the packed scale factor (0.01).
+    expected = np.divide(raw, np.array(100.0, dtype=dtype), dtype=dtype)
+    expected[raw == 0] = np.nan
+    assert actual.dtype == dtype
+    assert_array_equal(actual, expected)
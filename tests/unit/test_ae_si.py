@@ -0,0 +1,126 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from pm_tb_data._types import NORTH, SOUTH
+from pm_tb_data.fetch.amsr import ae_si
+
+
+def _write_mock_ae_si_file(filepath):
+    # AE_SI files contain the variables for every grid, without subgroups.
+    data_vars = {}
+    for hem_letter in ("N", "S"):
+        for resolution in ("12", "25"):
+            data_vars[f"SI_{resolution}km_{hem_letter}H_89V_DAY"] = (
+                (f"YDim_{resolution}", f"XDim_{resolution}"),
+                np.full((3, 4), 2000, dtype=np.int16),
+            )
+    xr.Dataset(data_vars).to_netcdf(filepath)
+
+
+def test_get_ae_si_tbs_by_grid_from_disk(tmp_path):
+    data_dir = tmp_path
+    date = dt.date(2011, 1, 1)
+    data_filepath = data_dir / "2011.01.01" / "AMSR_E_L3_SeaIce12km_V15_20110101.hdf"
+    data_filepath.parent.mkdir()
+    _write_mock_ae_si_file(data_filepath)
+
+    assert (
+        ae_si.get_ae_si_fp_on_disk(data_dir=data_dir, date=date, resolution="12")
+        == data_filepath
+    )
+
+    actual = ae_si.get_ae_si_tbs_by_grid_from_disk(
+        data_filepath=data_filepath,
+        resolutions=["12", "25"],
+    )
+
+    assert set(actual) == {NORTH, SOUTH}
+    for tbs_by_resolution in actual.values():
+        assert set(tbs_by_resolution) == {"12", "25"}
+        for tbs in tbs_by_resolution.values():
+            np.testing.assert_array_equal(tbs.v89.values, 200.0)
+
+
+def test_get_ae_si_tbs_by_grid_from_disk_missing_grid(tmp_path):
+    data_filepath = tmp_path / "AMSR_E_L3_SeaIce12km_V15_20110101.hdf"
+    xr.Dataset(
+        {"SI_12km_NH_89V_DAY": (("YDim", "XDim"), np.ones((3, 4), dtype=np.int16))}
+    ).to_netcdf(data_filepath)
+
+    with pytest.raises(FileNotFoundError):
+        ae_si.get_ae_si_tbs_by_grid_from_disk(
+            data_filepath=data_filepath,
+            resolutions=["12", "25"],
+            hemispheres=[NORTH],
+        )
+
+
+def _mock_open_ae_si_data_fields(monkeypatch, data_filepath):
+    """Open `data_filepath` in memory, recording each close of the dataset."""
+    closed = []
+
+    def _open(data_filepath, *, chunks=None):
+        ds = xr.load_dataset(data_filepath)
+        ds.set_close(lambda: closed.append(data_filepath))
+        return ds
+
+    monkeypatch.setattr(ae_si, "_open_ae_si_data_fields", _open)
+
+    return closed
+
+
+def test_get_ae_si_tbs_from_disk_missing_channel_closes_file(tmp_path, monkeypatch):
+    data_filepath = tmp_path / "2011.01.01" / "AMSR_E_L3_SeaIce12km_V15_20110101.hdf"
+    data_filepath.parent.mkdir()
+    _write_mock_ae_si_file(data_filepath)
+    closed = _mock_open_ae_si_data_fields(monkeypatch, data_filepath)
+
+    with pytest.raises(ValueError):
+        ae_si.get_ae_si_tbs_from_disk(
+            date=dt.date(2011, 1, 1),
+            hemisphere=NORTH,
+            data_dir=tmp_path,
+            resolution="12",
+            channels=["h36"],
+        )
+
+    assert closed == [data_filepath]
+
+
+def test_get_ae_si_tbs_by_grid_from_disk_missing_channel_closes_file(
+    tmp_path, monkeypatch
+):
+    data_filepath = tmp_path / "AMSR_E_L3_SeaIce12km_V15_20110101.hdf"
+    _write_mock_ae_si_file(data_filepath)
+    closed = _mock_open_ae_si_data_fields(monkeypatch, data_filepath)
+
+    with pytest.raises(ValueError):
+        ae_si.get_ae_si_tbs_by_grid_from_disk(
+            data_filepath=data_filepath,
+            resolutions=["12", "25"],
+            channels=["h36"],
+        )
+
+    assert closed == [data_filepath]
+
+
+def test_get_ae_si_tbs_from_disk_chunks(tmp_path):
+    pytest.importorskip("dask")
+    data_dir = tmp_path
+    date = dt.date(2011, 1, 1)
+    data_filepath = data_dir / "2011.01.01" / "AMSR_E_L3_SeaIce12km_V15_20110101.hdf"
+    data_filepath.parent.mkdir()
+    _write_mock_ae_si_file(data_filepath)
+
+    kwargs = dict(date=date, hemisphere=NORTH, data_dir=data_dir, resolution="12")
+    eager = ae_si.get_ae_si_tbs_from_disk(**kwargs)
+    lazy = ae_si.get_ae_si_tbs_from_disk(**kwargs, chunks={}, dtype=np.float32)
+
+    assert eager.v89.chunks is None
+    assert lazy.v89.chunks is not None
+    assert lazy.v89.dtype == np.float32
+    np.testing.assert_array_equal(lazy.v89.values, eager.v89.values)
+    lazy.close()
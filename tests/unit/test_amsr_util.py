@@ -1,9 +1,16 @@
+import importlib.util
+
 import numpy as np
+import pytest
 import xarray as xr
 from xarray.testing import assert_equal
 
-from pm_tb_data._types import NORTH
-from pm_tb_data.fetch.amsr.util import normalize_amsr_tbs
+from pm_tb_data._types import NORTH, Window
+from pm_tb_data.fetch.amsr.util import (
+    close_or_defer_close,
+    normalize_amsr_tbs,
+    require_dask_for_chunks,
+)
 
 
 def test_normalize_amsr_tbs_au_si():
@@ -66,3 +73,165 @@ def test_normalize_amsr_tbs_ae_si():
     )
 
     assert_equal(actual, expected)
+
+
+def test_normalize_amsr_tbs_ae_si_float32():
+    mock_ae_si_data_fields = xr.Dataset(
+        data_vars={
+            "SI_25km_NH_06H_DAY": (
+                ("Y", "X"),
+                np.arange(0, 6, dtype=np.int16).reshape(2, 3),
+            ),
+        },
+    )
+
+    actual = normalize_amsr_tbs(
+        data_fields=mock_ae_si_data_fields,
+        resolution="25",
+        hemisphere=NORTH,
+        data_product="AE_SI",
+        dtype=np.float32,
+    )
+
+    assert actual.h06.dtype == np.float32
+    assert np.isnan(actual.h06[0, 0])
+    assert actual.h06[1, 2] == np.float32(0.5)
+
+
+def test_normalize_amsr_tbs_ae_si_packed():
+    mock_ae_si_data_fields = xr.Dataset(
+        data_vars={
+            "SI_25km_NH_06H_DAY": (
+                ("Y", "X"),
+                np.arange(0, 6, dtype=np.int16).reshape(2, 3),
+                {"units": "K"},
+            ),
+        },
+    )
+
+    actual = normalize_amsr_tbs(
+        data_fields=mock_ae_si_data_fields,
+        resolution="25",
+        hemisphere=NORTH,
+        data_product="AE_SI",
+        mask_and_scale=False,
+    )
+
+    assert actual.h06.dtype == np.int16
+    assert actual.h06.attrs == {"units": "K", "scale_factor": 0.1, "_FillValue": 0}
+
+    decoded = xr.decode_cf(actual)
+    assert np.isnan(decoded.h06[0, 0])
+    assert decoded.h06[1, 2] == 0.5
+
+
+def test_normalize_amsr_tbs_ae_si_window():
+    mock_ae_si_data_fields = xr.Dataset(
+        data_vars={
+            "SI_12km_NH_18V_DAY": (
+                ("YDim", "XDim"),
+                np.arange(0, 12, dtype=np.int16).reshape(3, 4),
+            ),
+        },
+    )
+
+    actual = normalize_amsr_tbs(
+        data_fields=mock_ae_si_data_fields,
+        resolution="12",
+        hemisphere=NORTH,
+        data_product="AE_SI",
+        window=Window(row_start=1, row_stop=3, col_start=2, col_stop=4),
+    )
+
+    assert actual.v18.shape == (2, 2)
+    assert actual.v18.values.tolist() == [[0.6, 0.7], [1.0, 1.1]]
+
+
+def test_normalize_amsr_tbs_ae_si_shares_decoded_block():
+    mock_ae_si_data_fields = xr.Dataset(
+        data_vars={
+            "SI_25km_NH_06H_DAY": (("Y", "X"), np.array([[0, 10]], dtype=np.int16)),
+            "SI_25km_NH_06V_DAY": (("Y", "X"), np.array([[20, 0]], dtype=np.int16)),
+        },
+    )
+
+    actual = normalize_amsr_tbs(
+        data_fields=mock_ae_si_data_fields,
+        resolution="25",
+        hemisphere=NORTH,
+        data_product="AE_SI",
+        dtype=np.float32,
+    )
+
+    np.testing.assert_array_equal(actual.h06.values, [[np.nan, 1.0]])
+    np.testing.assert_array_equal(actual.v06.values, [[2.0, np.nan]])
+    assert actual.h06.values.base is actual.v06.values.base
+
+
+def test_normalize_amsr_tbs_pass_type():
+    mock_au_si_data_fields = xr.Dataset(
+        data_vars={
+            "SI_25km_NH_06H_DAY": (("Y", "X"), np.full((2, 3), 1.0)),
+            "SI_25km_NH_06H_ASC": (("Y", "X"), np.full((2, 3), 2.0)),
+            "SI_25km_NH_06H_DSC": (("Y", "X"), np.full((2, 3), 3.0)),
+        },
+    )
+
+    actual = normalize_amsr_tbs(
+        data_fields=mock_au_si_data_fields,
+        resolution="25",
+        hemisphere=NORTH,
+        data_product="AU_SI",
+        pass_type=["day", "asc", "dsc"],
+    )
+
+    assert list(actual.data_vars) == ["h06", "h06_asc", "h06_dsc"]
+    assert actual.h06_asc[0, 0] == 2.0
+    assert actual.h06_dsc[0, 0] == 3.0
+
+    asc_only = normalize_amsr_tbs(
+        data_fields=mock_au_si_data_fields,
+        resolution="25",
+        hemisphere=NORTH,
+        data_product="AU_SI",
+        pass_type="asc",
+    )
+    assert list(asc_only.data_vars) == ["h06_asc"]
+
+
+def test_close_or_defer_close_eager():
+    closed = []
+    tbs = xr.Dataset({"h06": (("fake_y", "fake_x"), np.zeros((2, 3)))})
+
+    close_or_defer_close(lambda: closed.append(True), tbs=[tbs])
+
+    assert closed == [True]
+
+
+def test_close_or_defer_close_closes_once_all_are_closed():
+    pytest.importorskip("dask")
+    closed = []
+    tbs = [
+        xr.Dataset({"h06": (("fake_y", "fake_x"), np.zeros((2, 3)))}).chunk()
+        for _ in range(2)
+    ]
+
+    close_or_defer_close(lambda: closed.append(True), tbs=tbs)
+    assert not closed
+
+    tbs[0].close()
+    # Closing the same dataset again does not count twice.
+    tbs[0].close()
+    assert not closed
+
+    tbs[1].close()
+    assert closed == [True]
+
+
+def test_require_dask_for_chunks(monkeypatch):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+
+    # Nothing is required without `chunks`.
+    require_dask_for_chunks(None)
+    with pytest.raises(ImportError, match="dask"):
+        require_dask_for_chunks({})
@@ -1,6 +1,13 @@
 import datetime as dt
 from pathlib import Path
 
+import numpy as np
+import pytest
+import xarray as xr
+from netCDF4 import Dataset
+from numpy.testing import assert_allclose
+
+from pm_tb_data._types import NORTH, SOUTH
 from pm_tb_data.fetch.amsr import au_si
 
 
@@ -24,3 +31,165 @@ def test_get_au_si_fp_on_disk(fs):
     )
 
     assert expected_file == actual
+
+
+def test_get_au_si_fp_on_disk_file_index(tmp_path):
+    data_dir = tmp_path / "AU_SI12.001"
+    filenames = [
+        "2023.10.02/AMSR_U2_L3_SeaIce12km_P04_20231002.he5",
+        "2023.10.03/AMSR_U2_L3_SeaIce12km_R04_20231003.he5",
+        "misplaced/nested/AMSR_U2_L3_SeaIce12km_P04_20231004.he5",
+    ]
+    for filename in filenames:
+        (data_dir / filename).parent.mkdir(parents=True, exist_ok=True)
+        (data_dir / filename).touch()
+    file_index = au_si.build_au_si_file_index(
+        data_dir=data_dir, index_path=tmp_path / "index.json"
+    )
+
+    actual = au_si.get_au_si_fp_on_disk(
+        data_dir=data_dir,
+        date=dt.date(2023, 10, 4),
+        resolution="12",
+        file_index=file_index,
+    )
+    assert actual == data_dir / filenames[2]
+
+    files_by_date = au_si.get_au_si_files_by_date(
+        file_index=file_index, resolution="12"
+    )
+    assert files_by_date[dt.date(2023, 10, 3)] == [
+        {
+            "filepath": data_dir / filenames[1],
+            "file_type": "R",
+            "file_version": "04",
+        }
+    ]
+    assert set(files_by_date) == {
+        dt.date(2023, 10, 2),
+        dt.date(2023, 10, 3),
+        dt.date(2023, 10, 4),
+    }
+
+
+def _write_mock_au_si_file(filepath, *, grids):
+    with Dataset(filepath, "w") as nc_ds:
+        for hemisphere, resolution in grids:
+            group = nc_ds.createGroup(
+                f"HDFEOS/GRIDS/{hemisphere[0].upper()}pPolarGrid{resolution}km"
+                "/Data Fields"
+            )
+            group.createDimension("YDim", 3)
+            group.createDimension("XDim", 4)
+            var = group.createVariable(
+                f"SI_{resolution}km_{hemisphere[0].upper()}H_18V_DAY",
+                "i2",
+                ("YDim", "XDim"),
+            )
+            var.scale_factor = 0.1
+            var[:] = np.full((3, 4), 200.0)
+
+
+def test_get_au_si_tbs_by_grid_from_disk(tmp_path):
+    data_filepath = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231003.he5"
+    _write_mock_au_si_file(
+        data_filepath,
+        grids=[(NORTH, "12"), (SOUTH, "12"), (NORTH, "25"), (SOUTH, "25")],
+    )
+
+    actual = au_si.get_au_si_tbs_by_grid_from_disk(
+        data_filepath=data_filepath,
+        resolutions=["12", "25"],
+    )
+
+    assert set(actual) == {NORTH, SOUTH}
+    for tbs_by_resolution in actual.values():
+        assert set(tbs_by_resolution) == {"12", "25"}
+        for tbs in tbs_by_resolution.values():
+            assert list(tbs.data_vars) == ["v18"]
+            assert_allclose(tbs.v18.values, 200.0)
+
+
+def test_get_au_si_tbs_by_grid_from_disk_missing_grid(tmp_path):
+    data_filepath = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231003.he5"
+    _write_mock_au_si_file(data_filepath, grids=[(NORTH, "12")])
+
+    with pytest.raises(FileNotFoundError):
+        au_si.get_au_si_tbs_by_grid_from_disk(
+            data_filepath=data_filepath,
+            resolutions=["12"],
+        )
+
+
+def test_get_au_si_tbs_from_disk_missing_channel_closes_file(tmp_path, monkeypatch):
+    data_filepath = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231003.he5"
+    _write_mock_au_si_file(data_filepath, grids=[(NORTH, "12")])
+    opened: list[xr.Dataset] = []
+
+    def _get_au_si_data_fields(**kwargs):
+        data_fields = xr.load_dataset(
+            kwargs["data_filepath"],
+            group=au_si._get_au_si_data_fields_group(
+                hemisphere=kwargs["hemisphere"], resolution=kwargs["resolution"]
+            ),
+        )
+        data_fields.set_close(lambda: opened.remove(data_fields))
+        opened.append(data_fields)
+        return data_fields
+
+    monkeypatch.setattr(au_si, "_get_au_si_data_fields", _get_au_si_data_fields)
+
+    with pytest.raises(ValueError):
+        au_si.get_au_si_tbs_from_disk(
+            hemisphere=NORTH,
+            resolution="12",
+            data_filepath=data_filepath,
+            channels=["h36"],
+        )
+
+    assert opened == []
+
+
+def test_get_au_si_tbs_by_grid_from_disk_missing_channel_closes_file(
+    tmp_path, monkeypatch
+):
+    data_filepath = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231003.he5"
+    _write_mock_au_si_file(data_filepath, grids=[(NORTH, "12"), (SOUTH, "12")])
+    opened = []
+
+    def _open_nc_ds(*args, **kwargs):
+        nc_ds = Dataset(*args, **kwargs)
+        opened.append(nc_ds)
+        return nc_ds
+
+    monkeypatch.setattr(au_si, "Dataset", _open_nc_ds)
+
+    with pytest.raises(ValueError):
+        au_si.get_au_si_tbs_by_grid_from_disk(
+            data_filepath=data_filepath,
+            resolutions=["12"],
+            channels=["h36"],
+        )
+
+    assert len(opened) == 1
+    assert not opened[0].isopen()
+
+
+def test_get_au_si_tbs_by_grid_from_disk_chunks(tmp_path):
+    pytest.importorskip("dask")
+    data_filepath = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231003.he5"
+    _write_mock_au_si_file(data_filepath, grids=[(NORTH, "12"), (SOUTH, "12")])
+
+    actual = au_si.get_au_si_tbs_by_grid_from_disk(
+        data_filepath=data_filepath,
+        resolutions=["12"],
+        chunks={},
+    )
+
+    tbs = actual[NORTH]["12"]
+    assert tbs.v18.chunks is not None
+    assert_allclose(tbs.v18.values, 200.0)
+    tbs.close()
+    # Closing one grid's TBs does not close the file for the other grids.
+    assert_allclose(actual[SOUTH]["12"].v18.values, 200.0)
+    actual[SOUTH]["12"].close()
@@ -0,0 +1,94 @@
+import datetime as dt
+import io
+import os
+import threading
+
+from pm_tb_data.fetch.cache import GranuleCache, _lock
+
+
+def _set_mtime(filepath, mtime):
+    os.utime(filepath, (mtime, mtime))
+
+
+def test_put_and_get(tmp_path):
+    cache = GranuleCache(cache_dir=tmp_path)
+    date = dt.date(2021, 1, 1)
+    filename = "NSIDC0001_TB_PS_N25km_20210101_v6.0.nc"
+
+    assert cache.get(date=date, filename=filename) is None
+
+    filepath = cache.put(date=date, filename=filename, fileobj=io.BytesIO(b"data"))
+
+    assert filepath == tmp_path / "2021.01.01" / filename
+    assert filepath.read_bytes() == b"data"
+    assert cache.get(date=date, filename=filename) == filepath
+    # No temporary files are left behind.
+    assert list(filepath.parent.iterdir()) == [filepath]
+
+
+def test_put_keeps_existing(tmp_path):
+    cache = GranuleCache(cache_dir=tmp_path)
+    date = dt.date(2021, 1, 1)
+    cache.put(date=date, filename="a.nc", fileobj=io.BytesIO(b"first"))
+
+    filepath = cache.put(date=date, filename="a.nc", fileobj=io.BytesIO(b"second"))
+
+    assert filepath.read_bytes() == b"first"
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = GranuleCache(cache_dir=tmp_path, max_bytes=10)
+    date = dt.date(2021, 1, 1)
+    oldest = cache.put(date=date, filename="a.nc", fileobj=io.BytesIO(b"aaaa"))
+    newest = cache.put(date=date, filename="b.nc", fileobj=io.BytesIO(b"bbbb"))
+    _set_mtime(oldest, 1_000)
+    _set_mtime(newest, 2_000)
+
+    # Using the oldest granule makes it the most recently used.
+    cache.get(date=date, filename="a.nc")
+    added = cache.put(
+        date=dt.date(2021, 1, 2), filename="c.nc", fileobj=io.BytesIO(b"cccc")
+    )
+
+    assert oldest.is_file()
+    assert not newest.is_file()
+    assert added.is_file()
+
+
+def test_evict_keeps_new_granule_larger_than_budget(tmp_path):
+    cache = GranuleCache(cache_dir=tmp_path, max_bytes=2)
+    date = dt.date(2021, 1, 1)
+    existing = cache.put(date=date, filename="a.nc", fileobj=io.BytesIO(b"a"))
+
+    added = cache.put(date=date, filename="b.nc", fileobj=io.BytesIO(b"bbbb"))
+
+    assert not existing.is_file()
+    assert added.is_file()
+
+
+def test_put_removes_granule_lock_files(tmp_path):
+    cache = GranuleCache(cache_dir=tmp_path, max_bytes=100)
+    date = dt.date(2021, 1, 1)
+    cache.put(date=date, filename="a.nc", fileobj=io.BytesIO(b"a"))
+    cache.put(date=date, filename="b.nc", fileobj=io.BytesIO(b"b"))
+
+    assert not list((tmp_path / ".locks").glob("*.nc.lock"))
+
+
+def test_get_waits_for_eviction(tmp_path):
+    cache = GranuleCache(cache_dir=tmp_path, max_bytes=100)
+    date = dt.date(2021, 1, 1)
+    filepath = cache.put(date=date, filename="a.nc", fileobj=io.BytesIO(b"a"))
+    results = []
+
+    with _lock(tmp_path / ".locks" / ".eviction.lock"):
+        getter = threading.Thread(
+            target=lambda: results.append(cache.get(date=date, filename="a.nc"))
+        )
+        getter.start()
+        getter.join(timeout=0.2)
+        # The granule cannot be served while an eviction is in progress.
+        assert getter.is_alive()
+
+    getter.join()
+    assert results == [filepath]
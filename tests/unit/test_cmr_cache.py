@@ -0,0 +1,108 @@
+import datetime as dt
+
+import pytest
+from earthaccess.results import DataGranule
+
+from pm_tb_data.fetch import cmr_cache
+from pm_tb_data.fetch.cmr_cache import CMRSearchCache
+
+
+def _mock_granule(filename):
+    return DataGranule(
+        {
+            "meta": {"native-id": filename},
+            "umm": {
+                "RelatedUrls": [
+                    {
+                        "URL": f"https://lance.itsc.uah.edu/{filename}",
+                        "Type": "GET DATA",
+                    }
+                ]
+            },
+        },
+        cloud_hosted=False,
+    )
+
+
+@pytest.fixture
+def mock_search_data(monkeypatch):
+    searches = []
+
+    def _mock_search_data(**kwargs):
+        searches.append(kwargs)
+        return [_mock_granule("AMSR_U2_L3_SeaIce12km_R04_20231009.he5")]
+
+    monkeypatch.setattr(cmr_cache.earthaccess, "search_data", _mock_search_data)
+
+    return searches
+
+
+def test_search_data_cached(tmp_path, mock_search_data):
+    search_cache = CMRSearchCache(cache_dir=tmp_path)
+
+    first = search_cache.search_data(short_name="AU_SI12_NRT_R04")
+    second = search_cache.search_data(short_name="AU_SI12_NRT_R04")
+
+    assert len(mock_search_data) == 1
+    # Cached results are rehydrated into `DataGranule`s.
+    assert isinstance(second[0], DataGranule)
+    assert second[0]["meta"] == first[0]["meta"]
+    assert second[0].data_links(access="external") == first[0].data_links(
+        access="external"
+    )
+
+    # Different search parameters are cached separately.
+    search_cache.search_data(short_name="AU_SI12_NRT_R04", version="1")
+    assert len(mock_search_data) == 2
+
+
+def test_search_data_refresh(tmp_path, mock_search_data):
+    search_cache = CMRSearchCache(cache_dir=tmp_path)
+    search_cache.search_data(short_name="AU_SI12_NRT_R04")
+
+    search_cache.search_data(short_name="AU_SI12_NRT_R04", refresh=True)
+    assert len(mock_search_data) == 2
+
+    assert search_cache.clear() == 1
+    search_cache.search_data(short_name="AU_SI12_NRT_R04")
+    assert len(mock_search_data) == 3
+
+
+def test_search_data_ttl(tmp_path, mock_search_data):
+    search_cache = CMRSearchCache(cache_dir=tmp_path, ttl=dt.timedelta(0))
+
+    search_cache.search_data(short_name="AU_SI12_NRT_R04")
+    search_cache.search_data(short_name="AU_SI12_NRT_R04")
+
+    assert len(mock_search_data) == 2
+
+
+def test_search_data_does_not_cache_empty_results(tmp_path, monkeypatch):
+    searches = []
+
+    def _mock_search_data(**kwargs):
+        searches.append(kwargs)
+        return []
+
+    monkeypatch.setattr(cmr_cache.earthaccess, "search_data", _mock_search_data)
+    search_cache = CMRSearchCache(cache_dir=tmp_path)
+
+    assert search_cache.search_data(short_name="AU_SI12_NRT_R04") == []
+    assert search_cache.search_data(short_name="AU_SI12_NRT_R04") == []
+
+    assert len(searches) == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("contents", ['{"version": 1, "granu', '{"version": 1}'])
+def test_search_data_corrupt_cache(tmp_path, mock_search_data, contents):
+    search_cache = CMRSearchCache(cache_dir=tmp_path)
+    search_cache.path_for(short_name="AU_SI12_NRT_R04").write_text(contents)
+
+    actual = search_cache.search_data(short_name="AU_SI12_NRT_R04")
+
+    # The corrupt cached results are treated as missing, and replaced.
+    assert len(mock_search_data) == 1
+    assert len(actual) == 1
+    search_cache.search_data(short_name="AU_SI12_NRT_R04")
+    assert len(mock_search_data) == 1
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+import xarray as xr
+from numpy.testing import assert_allclose, assert_array_equal
+
+from pm_tb_data.downsample import block_downsample, block_downsample_tbs
+
+
+def test_block_downsample_rectangular():
+    data = np.arange(4 * 6, dtype=np.float64).reshape(4, 6)
+
+    actual = block_downsample(data, factor=(2, 3))
+
+    assert actual.dtype == np.float32
+    expected = data.reshape(2, 2, 2, 3).mean(axis=(1, 3))
+    assert_allclose(actual, expected)
+
+
+def test_block_downsample_nans():
+    data = np.array(
+        [
+            [1.0, np.nan, np.nan, np.nan],
+            [3.0, np.nan, np.nan, 8.0],
+        ]
+    )
+
+    actual = block_downsample(data, factor=2, dtype=np.float64)
+    assert_array_equal(actual, [[2.0, 8.0]])
+
+    # Blocks with fewer than `min_valid` valid cells are NaN.
+    actual = block_downsample(data, factor=2, min_valid=2, dtype=np.float64)
+    assert_array_equal(actual, [[2.0, np.nan]])
+
+
+def test_block_downsample_all_nan_block():
+    data = np.full((3, 3), np.nan)
+
+    with np.errstate(all="raise"):
+        actual = block_downsample(data, factor=3)
+
+    assert np.isnan(actual).all()
+
+
+def test_block_downsample_invalid():
+    with pytest.raises(ValueError, match="not divisible"):
+        block_downsample(np.zeros((4, 5)), factor=2)
+
+    with pytest.raises(ValueError, match="min_valid"):
+        block_downsample(np.zeros((4, 4)), factor=2, min_valid=5)
+
+
+def test_block_downsample_tbs():
+    tbs = xr.Dataset(
+        {"v91": (("fake_y", "fake_x"), np.ones((4, 4)), {"units": "K"})},
+    )
+
+    actual = block_downsample_tbs(tbs, factor=2)
+
+    assert actual.v91.shape == (2, 2)
+    assert actual.v91.dims == ("fake_y", "fake_x")
+    assert actual.v91.attrs == {"units": "K"}
+    assert_array_equal(actual.v91, 1.0)
+
+
+def test_block_downsample_tbs_coords_and_other_vars():
+    tbs = xr.Dataset(
+        {
+            "h37": (("y", "x"), np.ones((4, 6))),
+            "crs": ((), 0, {"grid_mapping_name": "polar_stereographic"}),
+            "time_bnds": (("nv",), np.array([0, 1])),
+        },
+        coords={
+            "y": ("y", np.arange(4.0), {"units": "m"}),
+            "x": np.arange(6.0),
+        },
+        attrs={"source": "test"},
+    )
+
+    actual = block_downsample_tbs(tbs, factor=2)
+
+    assert actual.h37.shape == (2, 3)
+    # Coordinates are averaged over each block.
+    assert_array_equal(actual.y, [0.5, 2.5])
+    assert_array_equal(actual.x, [0.5, 2.5, 4.5])
+    assert actual.y.attrs == {"units": "m"}
+    # Variables without the grid dims are kept as they are.
+    xr.testing.assert_identical(actual.crs, tbs.crs)
+    xr.testing.assert_identical(actual.time_bnds, tbs.time_bnds)
+    assert actual.attrs == {"source": "test"}
+
+
+def test_block_downsample_tbs_grid_dims_not_last():
+    tbs = xr.Dataset(
+        {
+            "h37": (("y", "x"), np.ones((4, 4))),
+            "transposed": (("x", "time"), np.ones((4, 1))),
+        },
+    )
+
+    with pytest.raises(ValueError, match="last two dims"):
+        block_downsample_tbs(tbs, factor=2)
+
+
+@pytest.mark.parametrize("dtype", [np.int16, bool])
+def test_block_downsample_non_floating_dtype(dtype):
+    with pytest.raises(ValueError, match="floating point"):
+        block_downsample(np.ones((4, 4)), factor=2, dtype=dtype)
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from pm_tb_data.fetch.file_index import FileIndex
+
+
+def test_file_index_refresh_and_load(tmp_path):
+    root = tmp_path / "data"
+    dir_a = root / "a"
+    dir_b = root / "b"
+    dir_a.mkdir(parents=True)
+    dir_b.mkdir(parents=True)
+    (dir_a / "foo.bin").write_bytes(b"1234")
+    (dir_b / "bar.bin").write_bytes(b"12")
+    index_path = tmp_path / "index.json"
+
+    file_index = FileIndex.load(root=root, index_path=index_path)
+    assert file_index.refresh([dir_a, dir_b]) == 2
+    file_index.save()
+
+    loaded = FileIndex.load(root=root, index_path=index_path)
+    assert loaded.files_in(dir_a) == {"foo.bin": 4}
+    assert loaded.files_in(dir_b) == {"bar.bin": 2}
+    assert loaded.files_in(root / "missing") == {}
+
+    # Nothing has changed, so nothing gets re-listed.
+    assert loaded.refresh([dir_a, dir_b]) == 0
+
+    # Only the directory that changed is re-listed.
+    (dir_a / "baz.bin").write_bytes(b"123")
+    assert loaded.refresh([dir_a, dir_b]) == 1
+    assert loaded.files_in(dir_a) == {"foo.bin": 4, "baz.bin": 3}
+
+
+def test_file_index_load_different_root(tmp_path):
+    index_path = tmp_path / "index.json"
+    FileIndex(
+        root=tmp_path / "data",
+        index_path=index_path,
+        listings={"a": {"mtime_ns": 0, "files": {"foo.bin": 4}, "dirs": []}},
+    ).save()
+
+    loaded = FileIndex.load(root=tmp_path / "other", index_path=index_path)
+
+    assert loaded.listings == {}
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [
+        '{"version": 2, "root": ',
+        "[]",
+        json.dumps({"version": 2, "root": "ROOT"}),
+        json.dumps({"version": 99, "root": "ROOT", "listings": {}}),
+    ],
+)
+def test_file_index_load_unreadable(tmp_path, contents):
+    root = tmp_path / "data"
+    (root / "a").mkdir(parents=True)
+    (root / "a" / "foo.bin").write_bytes(b"1234")
+    index_path = tmp_path / "index.json"
+    index_path.write_text(contents.replace("ROOT", str(root)))
+
+    loaded = FileIndex.load(root=root, index_path=index_path)
+
+    # Truncated, corrupt or incompatible indexes are treated as empty, and
+    # rebuilt by the next refresh.
+    assert loaded.listings == {}
+    assert loaded.refresh_tree() == 2
+    assert loaded.files_in(root / "a") == {"foo.bin": 4}
+
+
+def test_file_index_refresh_tree_and_find(tmp_path):
+    root = tmp_path / "data"
+    nested_dir = root / "a" / "b"
+    nested_dir.mkdir(parents=True)
+    (root / "a" / "foo.he5").write_bytes(b"1")
+    (nested_dir / "bar.he5").write_bytes(b"12")
+    (nested_dir / "bar.txt").write_bytes(b"123")
+
+    file_index = FileIndex(root=root, index_path=tmp_path / "index.json")
+    assert file_index.refresh_tree() == 3
+    assert set(file_index.find("*.he5")) == {
+        root / "a" / "foo.he5",
+        nested_dir / "bar.he5",
+    }
+    assert list(file_index.find("*.he5", directory=nested_dir)) == [
+        nested_dir / "bar.he5"
+    ]
+
+    # Nothing has changed, so nothing gets re-listed.
+    assert file_index.refresh_tree() == 0
+
+    # Removed directories are dropped from the index.
+    for filepath in nested_dir.iterdir():
+        filepath.unlink()
+    nested_dir.rmdir()
+    assert file_index.refresh_tree() == 2
+    assert list(file_index.find("bar.*")) == []
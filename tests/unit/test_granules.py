@@ -0,0 +1,122 @@
+import datetime as dt
+import io
+import re
+
+import pytest
+
+from pm_tb_data.fetch import granules
+from pm_tb_data.fetch.cache import GranuleCache
+from pm_tb_data.fetch.errors import FetchRemoteDataError
+
+_FN_DATE_REGEX = re.compile(r"NSIDC0001_TB_PS_N25km_(?P<date>\d{8})_v6\.0\.nc")
+
+
+def _mock_granule(filename):
+    return {"meta": {"native-id": filename}}
+
+
+def test_get_granules_by_date(monkeypatch):
+    mock_results = [
+        _mock_granule("NSIDC0001_TB_PS_N25km_20210101_v6.0.nc"),
+        _mock_granule("NSIDC0001_TB_PS_N25km_20210102_v6.0.nc"),
+        # Returned by the temporal search, but outside of the date range.
+        _mock_granule("NSIDC0001_TB_PS_N25km_20210104_v6.0.nc"),
+    ]
+    search_calls = []
+
+    def mock_search_data(**kwargs):
+        search_calls.append(kwargs)
+        return mock_results
+
+    monkeypatch.setattr(granules.earthaccess, "search_data", mock_search_data)
+
+    actual = granules.get_granules_by_date(
+        short_name="NSIDC-0001",
+        version="6",
+        start_date=dt.date(2021, 1, 1),
+        end_date=dt.date(2021, 1, 3),
+        granule_name="NSIDC0001_TB_PS_N25km_*_v6.0.nc",
+        fn_date_regex=_FN_DATE_REGEX,
+    )
+
+    assert len(search_calls) == 1
+    assert search_calls[0]["temporal"] == ("2021-01-01", "2021-01-03")
+    assert actual == {
+        dt.date(2021, 1, 1): mock_results[0],
+        dt.date(2021, 1, 2): mock_results[1],
+    }
+
+
+def test_get_granules_by_date_duplicate(monkeypatch):
+    mock_results = [
+        _mock_granule("NSIDC0001_TB_PS_N25km_20210101_v6.0.nc"),
+        _mock_granule("NSIDC0001_TB_PS_N25km_20210101_v6.0.nc"),
+    ]
+    monkeypatch.setattr(granules.earthaccess, "search_data", lambda **_: mock_results)
+
+    with pytest.raises(FetchRemoteDataError):
+        granules.get_granules_by_date(
+            short_name="NSIDC-0001",
+            version="6",
+            start_date=dt.date(2021, 1, 1),
+            end_date=dt.date(2021, 1, 1),
+            granule_name="NSIDC0001_TB_PS_N25km_*_v6.0.nc",
+            fn_date_regex=_FN_DATE_REGEX,
+        )
+
+
+def test_open_granules_for_date_range(monkeypatch):
+    open_calls = []
+
+    def mock_open(granules, **_):
+        open_calls.append(granules)
+        return [f"file-{granule}" for granule in granules]
+
+    monkeypatch.setattr(granules.earthaccess, "open", mock_open)
+
+    start_date = dt.date(2021, 1, 1)
+    # No granule for Jan. 3.
+    granules_by_date = {
+        dt.date(2021, 1, 5): "g5",
+        dt.date(2021, 1, 1): "g1",
+        dt.date(2021, 1, 2): "g2",
+        dt.date(2021, 1, 4): "g4",
+    }
+
+    actual = list(
+        granules.open_granules_for_date_range(
+            granules_by_date=granules_by_date,  # type: ignore[arg-type]
+            start_date=start_date,
+            end_date=dt.date(2021, 1, 5),
+            max_workers=2,
+        )
+    )
+
+    assert actual == [
+        (dt.date(2021, 1, 1), "file-g1"),
+        (dt.date(2021, 1, 2), "file-g2"),
+        (dt.date(2021, 1, 4), "file-g4"),
+        (dt.date(2021, 1, 5), "file-g5"),
+    ]
+    assert open_calls == [["g1", "g2"], ["g4", "g5"]]
+
+
+def test_open_granule_cached(monkeypatch, tmp_path):
+    def mock_search_data(**_):
+        raise AssertionError("CMR should not be searched for cached granules.")
+
+    monkeypatch.setattr(granules.earthaccess, "search_data", mock_search_data)
+    cache = GranuleCache(cache_dir=tmp_path)
+    date = dt.date(2021, 1, 1)
+    filename = "NSIDC0001_TB_PS_N25km_20210101_v6.0.nc"
+    expected = cache.put(date=date, filename=filename, fileobj=io.BytesIO(b"data"))
+
+    actual = granules.open_granule(
+        short_name="NSIDC-0001",
+        version="6",
+        date=date,
+        granule_name=filename,
+        cache=cache,
+    )
+
+    assert actual == expected
@@ -1,10 +1,18 @@
 """Tests related to AMSR2 LANCE data."""
 
+import asyncio
 import datetime as dt
+import json
+import threading
+import zlib
 
+import earthaccess
 import pytest
+import requests
 
 import pm_tb_data.fetch.amsr.lance_amsr2 as lance_amsr2
+from pm_tb_data.fetch.amsr import au_si
+from pm_tb_data.fetch.amsr.lance_manifest import SyncManifest
 from pm_tb_data.fetch.errors import FetchRemoteDataError
 
 
@@ -141,3 +149,571 @@ def test__get_granule_info_by_date_raises_error():
 
     with pytest.raises(FetchRemoteDataError):
         lance_amsr2._get_granule_info_by_date(data_granules=[mock_data_granule])  # type: ignore[list-item]
+
+
+def _mock_lance_granules(num_days):
+    latest_date = dt.date(2023, 10, 10)
+    mock_granules: lance_amsr2.GranuleInfoByDate = {}
+    for offset in range(num_days):
+        date = latest_date - dt.timedelta(days=offset)
+        filename = f"AMSR_U2_L3_SeaIce12km_R04_{date:%Y%m%d}.he5"
+        mock_granules[date] = {
+            "file_type": "R",
+            "filename": filename,
+            "data_urls": [
+                f"https://lance.nsstc.nasa.gov/amsr2-science/{filename}",
+                f"https://lance.itsc.uah.edu/amsr2-science/{filename}",
+            ],
+        }
+
+    return mock_granules
+
+
+def test_download_latest_lance_files_concurrent(monkeypatch, tmp_path):
+    mock_granules = _mock_lance_granules(6)
+    monkeypatch.setattr(earthaccess, "search_data", lambda **_: [])
+    monkeypatch.setattr(
+        lance_amsr2, "_get_granule_info_by_date", lambda **_: mock_granules
+    )
+
+    auth_probes = []
+
+    def mock_auth(session, *, hosts, verify):
+        auth_probes.extend(hosts)
+        return session
+
+    monkeypatch.setattr(
+        lance_amsr2, "_create_earthdata_authenticated_session", mock_auth
+    )
+
+    sessions = set()
+
+    def mock_download_data(*, data_url, output_path, overwrite, session):
+        sessions.add(id(session))
+        # The first mirror is down.
+        if "nsstc" in data_url:
+            raise ConnectionError(data_url)
+        return output_path
+
+    monkeypatch.setattr(lance_amsr2, "download_data", mock_download_data)
+
+    actual = lance_amsr2.download_latest_lance_files(
+        output_dir=tmp_path,
+        max_workers=4,
+    )
+
+    # All downloads share a session. No requests were made with it, so no host
+    # was authenticated with.
+    assert len(sessions) == 1
+    assert auth_probes == []
+    # Results are in the same order as the granules.
+    assert actual == [
+        tmp_path / granule_info["filename"] for granule_info in mock_granules.values()
+    ]
+
+
+def test__create_shared_download_session_authenticates_lazily(
+    monkeypatch, stand_in_server
+):
+    data_urls = [stand_in_server.url_for(f"/file{idx}.he5") for idx in range(3)]
+    for idx in range(3):
+        stand_in_server.files[f"/file{idx}.he5"] = _MOCK_HE5_DATA
+    auth_probes = []
+
+    def mock_auth(session, *, hosts, verify):
+        auth_probes.extend(hosts)
+        # Requests made while authenticating do not authenticate again.
+        session.get(hosts[0], timeout=1).close()
+        return session
+
+    monkeypatch.setattr(
+        lance_amsr2, "_create_earthdata_authenticated_session", mock_auth
+    )
+
+    session = lance_amsr2._create_shared_download_session(
+        data_urls=data_urls, max_workers=2
+    )
+    assert auth_probes == []
+
+    with session:
+        for data_url in data_urls:
+            session.get(data_url, timeout=1).close()
+
+    # The host is authenticated with once, with the first URL requested from it.
+    assert auth_probes == [data_urls[0]]
+
+
+def test_download_latest_lance_files_concurrent_fail_on_error(monkeypatch, tmp_path):
+    mock_granules = _mock_lance_granules(3)
+    monkeypatch.setattr(earthaccess, "search_data", lambda **_: [])
+    monkeypatch.setattr(
+        lance_amsr2, "_get_granule_info_by_date", lambda **_: mock_granules
+    )
+    monkeypatch.setattr(
+        lance_amsr2,
+        "_create_earthdata_authenticated_session",
+        lambda session, **_: session,
+    )
+
+    def mock_download_data(*, data_url, output_path, **_):
+        if "20231009" in data_url:
+            raise ConnectionError(data_url)
+        return output_path
+
+    monkeypatch.setattr(lance_amsr2, "download_data", mock_download_data)
+
+    with pytest.raises(RuntimeError, match="20231009"):
+        lance_amsr2.download_latest_lance_files(
+            output_dir=tmp_path,
+            fail_on_download_error=True,
+            max_workers=3,
+        )
+
+
+class _MockResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+
+class _MockMirrorSession:
+    """Session for which the `slow_host` hangs until released."""
+
+    def __init__(self, *, slow_host):
+        self.slow_host = slow_host
+        self.release = threading.Event()
+        self.requested_urls = []
+        self.requested_headers = []
+
+    def get(self, url, *, headers, **_kwargs):
+        self.requested_urls.append(url)
+        self.requested_headers.append(headers)
+        if self.slow_host in url:
+            self.release.wait(timeout=5)
+        return _MockResponse(status_code=206)
+
+
+def test__race_mirrors():
+    data_urls = [
+        "https://lance.nsstc.nasa.gov/AMSR_U2_L3_SeaIce12km_R04_20231009.he5",
+        "https://lance.itsc.uah.edu/AMSR_U2_L3_SeaIce12km_R04_20231009.he5",
+    ]
+    session = _MockMirrorSession(slow_host="nsstc")
+    host_health = lance_amsr2._HostHealth()
+
+    actual = lance_amsr2._race_mirrors(
+        data_urls=data_urls,
+        session=session,  # type: ignore[arg-type]
+        host_health=host_health,
+    )
+
+    # The fast mirror wins without waiting for the hanging one.
+    assert actual == [data_urls[1], data_urls[0]]
+    # Only the first byte of each file is requested.
+    assert all(headers["Range"] == "bytes=0-0" for headers in session.requested_headers)
+    assert host_health.is_healthy(data_urls[1])
+    assert host_health.is_healthy(data_urls[0]) is None
+
+    # The healthy host is remembered, so the mirrors are not probed again.
+    session.requested_urls.clear()
+    assert (
+        lance_amsr2._race_mirrors(
+            data_urls=data_urls,
+            session=session,  # type: ignore[arg-type]
+            host_health=host_health,
+        )
+        == actual
+    )
+    assert session.requested_urls == []
+    session.release.set()
+
+
+def _http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (requests.ConnectionError(), True),
+        (requests.Timeout(), True),
+        (_http_error(503), True),
+        (_http_error(404), False),
+        (FetchRemoteDataError("Incomplete download"), False),
+    ],
+)
+def test__is_host_failure(error, expected):
+    assert lance_amsr2._is_host_failure(error) is expected
+
+
+def test__download_granule_missing_granule_keeps_host_healthy(monkeypatch, tmp_path):
+    granule_info = _mock_lance_granules(1)[dt.date(2023, 10, 10)]
+
+    def mock_download_data(*, data_url, **_):
+        raise _http_error(404)
+
+    monkeypatch.setattr(lance_amsr2, "download_data", mock_download_data)
+    host_health = lance_amsr2._HostHealth()
+
+    actual = lance_amsr2._download_granule(
+        granule_info=granule_info,
+        output_dir=tmp_path,
+        overwrite=False,
+        session=requests.Session(),
+        host_health=host_health,
+    )
+
+    assert actual is None
+    # A granule missing from a host says nothing about the host's health.
+    assert all(
+        host_health.is_healthy(data_url) is None
+        for data_url in granule_info["data_urls"]
+    )
+
+
+def test__host_health_order():
+    data_urls = ["https://a.example.com/f", "https://b.example.com/f"]
+    host_health = lance_amsr2._HostHealth()
+    assert host_health.order(data_urls) == data_urls
+
+    host_health.record(data_urls[0], healthy=False)
+    assert host_health.order(data_urls) == [data_urls[1], data_urls[0]]
+
+
+_MOCK_HE5_DATA = lance_amsr2._HDF5_SIGNATURE + bytes(range(256)) * 64
+_MOCK_HE5_PATH = "/amsr2-science/AMSR_U2_L3_SeaIce12km_R04_20231010.he5"
+
+
+def _mock_etag(data):
+    # The ETag the stand-in server sends for `data`.
+    return f'"{zlib.crc32(data):08x}"'
+
+
+def test_download_data(stand_in_server, tmp_path):
+    stand_in_server.files[_MOCK_HE5_PATH] = _MOCK_HE5_DATA
+    output_path = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231010.he5"
+
+    actual = lance_amsr2.download_data(
+        data_url=stand_in_server.url_for(_MOCK_HE5_PATH),
+        output_path=output_path,
+        overwrite=False,
+        session=requests.Session(),
+    )
+
+    assert actual == output_path
+    assert output_path.read_bytes() == _MOCK_HE5_DATA
+    assert list(tmp_path.iterdir()) == [output_path]
+
+
+def test_download_data_resumes(monkeypatch, stand_in_server, tmp_path):
+    # Use chunks smaller than the data, so that some are written before the
+    # connection drops.
+    monkeypatch.setattr(lance_amsr2, "_CHUNK_SIZE", 4096)
+    stand_in_server.files[_MOCK_HE5_PATH] = _MOCK_HE5_DATA
+    stand_in_server.truncate_after[_MOCK_HE5_PATH] = 10_000
+    output_path = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231010.he5"
+    part_path = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231010.he5.part"
+    data_url = stand_in_server.url_for(_MOCK_HE5_PATH)
+
+    # The connection drops part-way through the first download.
+    with pytest.raises(requests.exceptions.RequestException):
+        lance_amsr2.download_data(
+            data_url=data_url,
+            output_path=output_path,
+            overwrite=False,
+            session=requests.Session(),
+        )
+    assert not output_path.exists()
+    # Only whole chunks received before the connection dropped are kept.
+    resume_from = part_path.stat().st_size
+    assert 0 < resume_from <= 10_000
+
+    del stand_in_server.truncate_after[_MOCK_HE5_PATH]
+    lance_amsr2.download_data(
+        data_url=data_url,
+        output_path=output_path,
+        overwrite=False,
+        session=requests.Session(),
+    )
+
+    assert stand_in_server.requests[-1]["Range"] == f"bytes={resume_from}-"
+    # The resumed download is conditional on the file being unchanged.
+    assert stand_in_server.requests[-1]["If-Range"] == _mock_etag(_MOCK_HE5_DATA)
+    assert output_path.read_bytes() == _MOCK_HE5_DATA
+    assert list(tmp_path.iterdir()) == [output_path]
+
+
+def _write_partial_download(part_path, data, *, etag):
+    part_path.write_bytes(data)
+    lance_amsr2._get_validators_path(part_path).write_text(
+        json.dumps({"etag": etag, "last_modified": None})
+    )
+
+
+def test_download_data_restarts_unresumable_download(stand_in_server, tmp_path):
+    stand_in_server.files[_MOCK_HE5_PATH] = _MOCK_HE5_DATA
+    output_path = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231010.he5"
+    # A partial download that is longer than the file on the server.
+    part_path = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231010.he5.part"
+    _write_partial_download(
+        part_path,
+        bytes(len(_MOCK_HE5_DATA) + 1),
+        etag=_mock_etag(_MOCK_HE5_DATA),
+    )
+
+    lance_amsr2.download_data(
+        data_url=stand_in_server.url_for(_MOCK_HE5_PATH),
+        output_path=output_path,
+        overwrite=False,
+        session=requests.Session(),
+    )
+
+    assert output_path.read_bytes() == _MOCK_HE5_DATA
+    assert list(tmp_path.iterdir()) == [output_path]
+
+
+@pytest.mark.parametrize(
+    "etag",
+    [
+        # The partial download was started from an older version of the file.
+        '"00000000"',
+        # No validators were recorded for the partial download.
+        None,
+    ],
+)
+def test_download_data_restarts_changed_download(stand_in_server, tmp_path, etag):
+    stand_in_server.files[_MOCK_HE5_PATH] = _MOCK_HE5_DATA
+    output_path = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231010.he5"
+    part_path = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231010.he5.part"
+    _write_partial_download(part_path, b"x" * 100, etag=etag)
+
+    lance_amsr2.download_data(
+        data_url=stand_in_server.url_for(_MOCK_HE5_PATH),
+        output_path=output_path,
+        overwrite=False,
+        session=requests.Session(),
+    )
+
+    assert output_path.read_bytes() == _MOCK_HE5_DATA
+    assert len(stand_in_server.requests) == 1
+
+
+def test_download_data_restarts_misaligned_resume(stand_in_server, tmp_path):
+    stand_in_server.files[_MOCK_HE5_PATH] = _MOCK_HE5_DATA
+    stand_in_server.ignore_range_start.add(_MOCK_HE5_PATH)
+    output_path = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231010.he5"
+    part_path = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231010.he5.part"
+    _write_partial_download(
+        part_path, _MOCK_HE5_DATA[:100], etag=_mock_etag(_MOCK_HE5_DATA)
+    )
+
+    lance_amsr2.download_data(
+        data_url=stand_in_server.url_for(_MOCK_HE5_PATH),
+        output_path=output_path,
+        overwrite=False,
+        session=requests.Session(),
+    )
+
+    # The server resumed from the wrong byte, so the download was restarted.
+    assert [headers.get("Range") for headers in stand_in_server.requests] == [
+        "bytes=100-",
+        None,
+    ]
+    assert output_path.read_bytes() == _MOCK_HE5_DATA
+
+
+def test_download_data_rejects_non_hdf5_data(stand_in_server, tmp_path):
+    # E.g., an HTML error or login page served with a 200 status.
+    stand_in_server.files[_MOCK_HE5_PATH] = b"<html>Please log in</html>"
+    output_path = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231010.he5"
+
+    with pytest.raises(FetchRemoteDataError, match="not an HDF5 file"):
+        lance_amsr2.download_data(
+            data_url=stand_in_server.url_for(_MOCK_HE5_PATH),
+            output_path=output_path,
+            overwrite=False,
+            session=requests.Session(),
+        )
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test__verify_download_incomplete(tmp_path):
+    part_path = tmp_path / "AMSR_U2_L3_SeaIce12km_R04_20231010.he5.part"
+    part_path.write_bytes(_MOCK_HE5_DATA[:100])
+
+    with pytest.raises(FetchRemoteDataError, match="Incomplete"):
+        lance_amsr2._verify_download(part_path, expected_size=len(_MOCK_HE5_DATA))
+
+    # Incomplete downloads are kept, so that they can be resumed.
+    assert part_path.exists()
+
+
+def _mock_lance_sync(monkeypatch, *, stand_in_server, filenames):
+    """Serve `filenames` from the stand-in server as the latest LANCE granules."""
+    granules_by_date: lance_amsr2.GranuleInfoByDate = {}
+    for filename in filenames:
+        match = au_si.AU_SI_FN_REGEX.match(filename)
+        assert match is not None
+        path = f"/amsr2-science/{filename}"
+        stand_in_server.files[path] = _MOCK_HE5_DATA + filename.encode()
+        granules_by_date[dt.datetime.strptime(match["file_date"], "%Y%m%d").date()] = {
+            "file_type": "R" if match["file_type"] == "R" else "P",
+            "filename": filename,
+            "data_urls": [stand_in_server.url_for(path)],
+        }
+
+    monkeypatch.setattr(earthaccess, "search_data", lambda **_: [])
+    monkeypatch.setattr(
+        lance_amsr2, "_get_granule_info_by_date", lambda **_: granules_by_date
+    )
+    monkeypatch.setattr(
+        lance_amsr2,
+        "_create_earthdata_authenticated_session",
+        lambda session, **_: session,
+    )
+
+
+def test_download_latest_lance_files_sync_manifest(
+    monkeypatch, stand_in_server, tmp_path
+):
+    filenames = [
+        "AMSR_U2_L3_SeaIce12km_R04_20231008.he5",
+        "AMSR_U2_L3_SeaIce12km_R04_20231009.he5",
+    ]
+    _mock_lance_sync(monkeypatch, stand_in_server=stand_in_server, filenames=filenames)
+
+    first_paths = lance_amsr2.download_latest_lance_files(
+        output_dir=tmp_path, use_sync_manifest=True
+    )
+    assert first_paths == [tmp_path / filename for filename in filenames]
+    manifest = SyncManifest.load(output_dir=tmp_path)
+    assert [entry["filename"] for entry in manifest.entries.values()] == filenames
+
+    # On the next run, unchanged granules are not downloaded again.
+    stand_in_server.requests.clear()
+    mtimes = [path.stat().st_mtime_ns for path in first_paths]
+    second_paths = lance_amsr2.download_latest_lance_files(
+        output_dir=tmp_path, use_sync_manifest=True
+    )
+
+    assert second_paths == first_paths
+    assert [path.stat().st_mtime_ns for path in second_paths] == mtimes
+    assert len(stand_in_server.requests) == 2
+    assert all("If-None-Match" in headers for headers in stand_in_server.requests)
+
+
+def test_download_latest_lance_files_sync_manifest_without_validators(
+    monkeypatch, stand_in_server, tmp_path
+):
+    filename = "AMSR_U2_L3_SeaIce12km_R04_20231009.he5"
+    _mock_lance_sync(monkeypatch, stand_in_server=stand_in_server, filenames=[filename])
+    lance_amsr2.download_latest_lance_files(output_dir=tmp_path, use_sync_manifest=True)
+    # E.g., the server sent no ETag or Last-Modified headers.
+    manifest = SyncManifest.load(output_dir=tmp_path)
+    for entry in manifest.entries.values():
+        entry["etag"] = None
+        entry["last_modified"] = None
+    manifest.save()
+
+    # The file changes on the server.
+    updated_data = _MOCK_HE5_DATA + b"updated"
+    stand_in_server.files[f"/amsr2-science/{filename}"] = updated_data
+    stand_in_server.requests.clear()
+    lance_amsr2.download_latest_lance_files(output_dir=tmp_path, use_sync_manifest=True)
+
+    # The granule is still checked, with a request conditional on the file's
+    # modification time.
+    assert len(stand_in_server.requests) == 1
+    assert "If-Modified-Since" in stand_in_server.requests[0]
+    assert (tmp_path / filename).read_bytes() == updated_data
+
+
+def test_download_latest_lance_files_sync_manifest_upgrade(
+    monkeypatch, stand_in_server, tmp_path
+):
+    p_filename = "AMSR_U2_L3_SeaIce12km_P04_20231009.he5"
+    r_filename = "AMSR_U2_L3_SeaIce12km_R04_20231009.he5"
+    # The latest P file is not ready for NRT, so it is filtered out.
+    latest_filename = "AMSR_U2_L3_SeaIce12km_P04_20231010.he5"
+    _mock_lance_sync(
+        monkeypatch,
+        stand_in_server=stand_in_server,
+        filenames=[p_filename, latest_filename],
+    )
+    lance_amsr2.download_latest_lance_files(output_dir=tmp_path, use_sync_manifest=True)
+    assert (tmp_path / p_filename).is_file()
+
+    # The P file is replaced by an R file.
+    _mock_lance_sync(
+        monkeypatch,
+        stand_in_server=stand_in_server,
+        filenames=[r_filename, latest_filename],
+    )
+    actual = lance_amsr2.download_latest_lance_files(
+        output_dir=tmp_path, use_sync_manifest=True
+    )
+
+    assert actual == [tmp_path / r_filename]
+    assert not (tmp_path / p_filename).exists()
+    manifest = SyncManifest.load(output_dir=tmp_path)
+    assert manifest.entries[dt.date(2023, 10, 9)]["filename"] == r_filename
+    assert manifest.entries[dt.date(2023, 10, 9)]["file_type"] == "R"
+
+
+def test_download_latest_lance_files_async(monkeypatch, stand_in_server, tmp_path):
+    filenames = [
+        f"AMSR_U2_L3_SeaIce12km_R04_202310{day:02d}.he5" for day in range(1, 7)
+    ]
+    _mock_lance_sync(monkeypatch, stand_in_server=stand_in_server, filenames=filenames)
+    stand_in_server.response_delay = 0.1
+
+    actual = asyncio.run(
+        lance_amsr2.download_latest_lance_files_async(
+            output_dir=tmp_path,
+            max_concurrency=6,
+            max_connections_per_host=2,
+        )
+    )
+
+    assert actual == [tmp_path / filename for filename in filenames]
+    for filename in filenames:
+        assert (tmp_path / filename).read_bytes() == _MOCK_HE5_DATA + filename.encode()
+    assert stand_in_server.max_in_flight == 2
+
+
+def test_download_latest_lance_files_async_cancel(
+    monkeypatch, stand_in_server, tmp_path
+):
+    monkeypatch.setattr(lance_amsr2, "_CHUNK_SIZE", 4096)
+    filename = "AMSR_U2_L3_SeaIce12km_R04_20231009.he5"
+    _mock_lance_sync(monkeypatch, stand_in_server=stand_in_server, filenames=[filename])
+    # The server stops part-way through the file until it is resumed.
+    stand_in_server.pause_after[f"/amsr2-science/{filename}"] = 10_000
+
+    async def _download_then_cancel():
+        task = asyncio.create_task(
+            lance_amsr2.download_latest_lance_files_async(output_dir=tmp_path)
+        )
+        await asyncio.to_thread(stand_in_server.paused.wait, 5)
+        task.cancel()
+        # Let the blocked read return, so that the cancellation is seen before
+        # the next chunk is written.
+        stand_in_server.resume.set()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(_download_then_cancel())
+
+    # The download was stopped before it completed, and the partial download
+    # is kept so that it can be resumed.
+    assert not (tmp_path / filename).exists()
+    assert (tmp_path / f"{filename}.part").is_file()
@@ -2,9 +2,12 @@ import datetime as dt
 from pathlib import Path
 
 import numpy as np
+import pytest
 import xarray as xr
+from numpy.testing import assert_array_equal
 from xarray.testing import assert_equal
 
+from pm_tb_data._types import Window
 from pm_tb_data.fetch import nsidc_0001
 
 
@@ -53,3 +56,179 @@ def test_get_nsidc_0001_fp_on_disk(fs):
     )
 
     assert expected_file == actual
+
+
+def test__normalize_nsidc_0001_tbs_dtype():
+    mock_nsidc_0001_ds = xr.Dataset(
+        data_vars={
+            "TB_F17_19H": (
+                ("time", "y", "x"),
+                [np.arange(0, 6, dtype=np.float64).reshape(2, 3)],
+            ),
+        },
+    )
+
+    actual = nsidc_0001._normalize_nsidc_0001_tbs(
+        ds=mock_nsidc_0001_ds,
+        sat="F17",
+        dtype=np.float32,
+    )
+
+    assert actual.h19.dtype == np.float32
+
+
+def _write_mock_nsidc_0001_file(tmp_path):
+    data_dir = tmp_path / "2019.10.05"
+    data_dir.mkdir()
+    # As in the real data files, the x/y coordinates are in the root group.
+    tree = xr.DataTree.from_dict(
+        {
+            "/": xr.Dataset(coords={"y": [12.5, -12.5], "x": [-25.0, 0.0, 25.0]}),
+            **{
+                f"/{sat}": xr.Dataset(
+                    data_vars={
+                        f"TB_{sat}_19H": (
+                            ("time", "y", "x"),
+                            [np.full((2, 3), offset, dtype=np.float32)],
+                        ),
+                    },
+                )
+                for offset, sat in enumerate(("F13", "F17", "F18"))
+            },
+        }
+    )
+    tree.to_netcdf(data_dir / "NSIDC0001_TB_PS_N25km_20191005_v6.0.nc")
+
+
+def _record_netcdf_closes(monkeypatch):
+    closed = []
+    close = xr.backends.NetCDF4DataStore.close
+
+    def _close(self, **kwargs):
+        closed.append(self)
+        return close(self, **kwargs)
+
+    monkeypatch.setattr(xr.backends.NetCDF4DataStore, "close", _close)
+
+    return closed
+
+
+def test_get_nsidc_0001_tbs_by_sat_from_disk(tmp_path):
+    _write_mock_nsidc_0001_file(tmp_path)
+
+    actual = nsidc_0001.get_nsidc_0001_tbs_by_sat_from_disk(
+        date=dt.date(2019, 10, 5),
+        hemisphere="north",
+        data_dir=tmp_path,
+        resolution="25",
+        sats=["F17", "F18"],
+    )
+
+    assert list(actual.keys()) == ["F17", "F18"]
+    assert (actual["F17"].h19 == 1).all()
+    assert (actual["F18"].h19 == 2).all()
+
+    with pytest.raises(FileNotFoundError):
+        nsidc_0001.get_nsidc_0001_tbs_by_sat_from_disk(
+            date=dt.date(2019, 10, 5),
+            hemisphere="north",
+            data_dir=tmp_path,
+            resolution="25",
+            sats=["F08"],
+        )
+
+
+def test_get_nsidc_0001_tbs_by_sat_from_disk_closes_file(tmp_path, monkeypatch):
+    _write_mock_nsidc_0001_file(tmp_path)
+    closed = _record_netcdf_closes(monkeypatch)
+
+    actual = nsidc_0001.get_nsidc_0001_tbs_by_sat_from_disk(
+        date=dt.date(2019, 10, 5),
+        hemisphere="north",
+        data_dir=tmp_path,
+        resolution="25",
+        sats=["F17"],
+    )
+
+    # The data file (each group of the datatree) is closed, and the TBs are
+    # already in memory.
+    assert len(closed) == 4
+    assert actual["F17"].h19.variable._in_memory
+    assert (actual["F17"].h19 == 1).all()
+
+
+def _write_mock_nsidc_0001_window_file(tmp_path, *, sats):
+    data_dir = tmp_path / "2019.10.05"
+    data_dir.mkdir()
+    tb_data = np.arange(24, dtype=np.float64).reshape(4, 6)
+    xr.DataTree.from_dict(
+        {
+            f"/{sat}": xr.Dataset({f"TB_{sat}_19H": (("time", "y", "x"), [tb_data])})
+            for sat in sats
+        }
+    ).to_netcdf(data_dir / "NSIDC0001_TB_PS_N25km_20191005_v6.0.nc")
+
+    return tb_data
+
+
+def test_get_nsidc_0001_tbs_from_disk_window_and_dtype(tmp_path):
+    tb_data = _write_mock_nsidc_0001_window_file(tmp_path, sats=["F17"])
+    window = Window(row_start=1, row_stop=3, col_start=2, col_stop=5)
+
+    actual = nsidc_0001.get_nsidc_0001_tbs_from_disk(
+        date=dt.date(2019, 10, 5),
+        hemisphere="north",
+        data_dir=tmp_path,
+        resolution="25",
+        sat="F17",
+        dtype=np.float32,
+        window=window,
+    )
+
+    assert actual.h19.dims == ("fake_y", "fake_x")
+    assert actual.h19.shape == (2, 3)
+    assert actual.h19.dtype == np.float32
+    assert_array_equal(actual.h19, tb_data[1:3, 2:5])
+
+
+def test_get_nsidc_0001_tbs_by_sat_from_disk_window_and_dtype(tmp_path):
+    tb_data = _write_mock_nsidc_0001_window_file(tmp_path, sats=["F17", "F18"])
+    window = Window(row_start=0, row_stop=2, col_start=4, col_stop=6)
+
+    actual = nsidc_0001.get_nsidc_0001_tbs_by_sat_from_disk(
+        date=dt.date(2019, 10, 5),
+        hemisphere="north",
+        data_dir=tmp_path,
+        resolution="25",
+        sats=["F17", "F18"],
+        dtype=np.float32,
+        window=window,
+    )
+
+    for tbs in actual.values():
+        assert tbs.h19.shape == (2, 2)
+        assert tbs.h19.dtype == np.float32
+        assert_array_equal(tbs.h19, tb_data[0:2, 4:6])
+
+
+def test__normalize_nsidc_0001_tbs_channels():
+    mock_nsidc_0001_ds = xr.Dataset(
+        data_vars={
+            "TB_F17_19H": (("time", "y", "x"), [np.arange(0, 6).reshape(2, 3)]),
+            "TB_F17_37V": (("time", "y", "x"), [np.arange(5, 11).reshape(2, 3)]),
+        },
+    )
+
+    actual = nsidc_0001._normalize_nsidc_0001_tbs(
+        ds=mock_nsidc_0001_ds,
+        sat="F17",
+        channels=["v37"],
+    )
+    assert list(actual.data_vars) == ["v37"]
+
+    with pytest.raises(ValueError):
+        nsidc_0001._normalize_nsidc_0001_tbs(
+            ds=mock_nsidc_0001_ds,
+            sat="F17",
+            channels=["v37", "v19"],
+        )
@@ -0,0 +1,256 @@
+import datetime as dt
+import os
+
+import numpy as np
+import pytest
+import xarray as xr
+from numpy.testing import assert_array_equal
+
+from pm_tb_data._types import SOUTH, Window
+from pm_tb_data.fetch import nsidc_0007
+
+
+def _write_mock_tb_files(data_dir, *, filenames, fill_value=1577):
+    for filepath in filenames:
+        filepath = data_dir / filepath
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        np.full((332, 316), fill_value, dtype="<i2").tofile(filepath)
+
+
+def test_get_nsidc_0007_tbs_from_disk(tmp_path):
+    _write_mock_tb_files(
+        tmp_path,
+        filenames=[
+            "TBS/1980/SEP/800929S.37H",
+            "TBS/1980/SEP/800929S.37V",
+            "TBS/1980/SEP/800929N.37H",
+        ],
+    )
+
+    actual = nsidc_0007.get_nsidc_0007_tbs_from_disk(
+        date=dt.date(1980, 9, 29),
+        hemisphere=SOUTH,
+        data_dir=tmp_path,
+    )
+
+    assert set(actual.data_vars) == {"h37", "v37"}
+    assert actual.h37.attrs["source_filename"] == "800929S.37H"
+    assert_array_equal(actual.h37, 1577 * 0.1)
+
+
+@pytest.mark.parametrize("mask_and_scale", [True, False])
+def test_get_nsidc_0007_tbs_from_disk_lazy(tmp_path, mask_and_scale):
+    _write_mock_tb_files(
+        tmp_path,
+        filenames=["TBS/1980/SEP/800929S.37H", "TBS/1980/SEP/800929S.37V"],
+    )
+    kwargs = dict(
+        date=dt.date(1980, 9, 29),
+        hemisphere=SOUTH,
+        data_dir=tmp_path,
+        dtype=np.float32,
+        mask_and_scale=mask_and_scale,
+        window=Window(row_start=10, row_stop=20, col_start=0, col_stop=5),
+    )
+    eager = nsidc_0007.get_nsidc_0007_tbs_from_disk(**kwargs)
+
+    actual = nsidc_0007.get_nsidc_0007_tbs_from_disk(**kwargs, lazy=True)
+
+    assert not actual.h37.variable._in_memory
+    xr.testing.assert_identical(actual.load(), eager)
+
+
+def test_get_nsidc_0007_tbs_from_disk_for_date_range(tmp_path):
+    # SMMR data are available every other day. This range crosses a month
+    # boundary.
+    _write_mock_tb_files(
+        tmp_path,
+        filenames=[
+            "TBS/1980/SEP/800929S.37H",
+            "TBS/1980/SEP/800929S.37V",
+            "TBS/1980/OCT/801001S.37H",
+            "TBS/1980/OCT/801001S.37V",
+            "TBS/1980/OCT/801003S.37H",
+        ],
+    )
+
+    actual = nsidc_0007.get_nsidc_0007_tbs_from_disk_for_date_range(
+        start_date=dt.date(1980, 9, 29),
+        end_date=dt.date(1980, 10, 3),
+        hemisphere=SOUTH,
+        data_dir=tmp_path,
+        max_workers=2,
+    )
+
+    assert set(actual.data_vars) == {"h37", "v37"}
+    assert actual.h37.dims == ("time", "fake_y", "fake_x")
+    assert actual.time.size == 5
+
+    assert_array_equal(actual.h37.isel(time=[0, 2, 4]), 1577 * 0.1)
+    assert np.all(np.isnan(actual.h37.isel(time=[1, 3])))
+    # The v37 channel is missing on the last day.
+    assert np.all(np.isnan(actual.v37.isel(time=4)))
+
+
+def test_get_nsidc_0007_tbs_from_disk_for_date_range_is_lazy(tmp_path):
+    _write_mock_tb_files(
+        tmp_path,
+        filenames=[
+            "TBS/1980/SEP/800929S.37H",
+            "TBS/1980/OCT/801001S.37H",
+        ],
+    )
+
+    actual = nsidc_0007.get_nsidc_0007_tbs_from_disk_for_date_range(
+        start_date=dt.date(1980, 9, 29),
+        end_date=dt.date(1980, 10, 1),
+        hemisphere=SOUTH,
+        data_dir=tmp_path,
+    )
+    assert not actual.h37.variable._in_memory
+
+    # Only the indexed day is read, so removing another day's file after
+    # opening the range does not affect it.
+    (tmp_path / "TBS/1980/OCT/801001S.37H").unlink()
+    assert_array_equal(actual.h37.isel(time=0), 1577 * 0.1)
+    assert_array_equal(actual.h37.isel(time=0, fake_y=slice(0, 2)).shape, (2, 316))
+
+
+def test_get_nsidc_0007_tbs_from_disk_with_file_index(tmp_path):
+    data_dir = tmp_path / "nsidc0007"
+    index_path = tmp_path / "nsidc0007_index.json"
+    _write_mock_tb_files(
+        data_dir,
+        filenames=[
+            "TBS/1980/SEP/800929S.37H",
+            "TBS/1980/OCT/801001S.37H",
+        ],
+    )
+
+    file_index = nsidc_0007.build_nsidc_0007_file_index(
+        data_dir=data_dir,
+        index_path=index_path,
+    )
+    assert index_path.is_file()
+    assert file_index.files_in(data_dir / "TBS/1980/SEP") == {
+        "800929S.37H": 332 * 316 * 2
+    }
+
+    actual = nsidc_0007.get_nsidc_0007_tbs_from_disk(
+        date=dt.date(1980, 9, 29),
+        hemisphere=SOUTH,
+        data_dir=data_dir,
+        file_index=file_index,
+    )
+    assert set(actual.data_vars) == {"h37"}
+
+    # Files added after the index was built are found, because the changed
+    # month directory is re-listed. Its mtime is set explicitly, because it may
+    # not change between quick successive writes on coarse-grained clocks.
+    _write_mock_tb_files(data_dir, filenames=["TBS/1980/SEP/800929S.37V"])
+    os.utime(data_dir / "TBS/1980/SEP", ns=(0, 0))
+    actual = nsidc_0007.get_nsidc_0007_tbs_from_disk(
+        date=dt.date(1980, 9, 29),
+        hemisphere=SOUTH,
+        data_dir=data_dir,
+        file_index=file_index,
+    )
+    assert set(actual.data_vars) == {"h37", "v37"}
+
+    actual = nsidc_0007.get_nsidc_0007_tbs_from_disk_for_date_range(
+        start_date=dt.date(1980, 9, 29),
+        end_date=dt.date(1980, 10, 1),
+        hemisphere=SOUTH,
+        data_dir=data_dir,
+        file_index=file_index,
+    )
+    assert set(actual.data_vars) == {"h37", "v37"}
+    assert actual.time.size == 3
+
+
+def test_get_nsidc_0007_tbs_from_disk_float32(tmp_path):
+    _write_mock_tb_files(tmp_path, filenames=["TBS/1980/SEP/800929S.37H"])
+
+    actual = nsidc_0007.get_nsidc_0007_tbs_from_disk(
+        date=dt.date(1980, 9, 29),
+        hemisphere=SOUTH,
+        data_dir=tmp_path,
+        dtype=np.float32,
+    )
+
+    assert actual.h37.dtype == np.float32
+    assert_array_equal(actual.h37, np.float32(157.7))
+
+
+def test_get_nsidc_0007_tbs_from_disk_packed(tmp_path):
+    _write_mock_tb_files(
+        tmp_path,
+        filenames=["TBS/1980/SEP/800929S.37H", "TBS/1980/OCT/801001S.37H"],
+    )
+
+    packed = nsidc_0007.get_nsidc_0007_tbs_from_disk(
+        date=dt.date(1980, 9, 29),
+        hemisphere=SOUTH,
+        data_dir=tmp_path,
+        mask_and_scale=False,
+    )
+    assert packed.h37.dtype == np.int16
+    assert packed.h37.attrs["scale_factor"] == 0.1
+    assert packed.h37.attrs["_FillValue"] == 0
+
+    decoded = nsidc_0007.get_nsidc_0007_tbs_from_disk(
+        date=dt.date(1980, 9, 29),
+        hemisphere=SOUTH,
+        data_dir=tmp_path,
+    )
+    assert_array_equal(xr.decode_cf(packed).h37, decoded.h37)
+
+    packed_range = nsidc_0007.get_nsidc_0007_tbs_from_disk_for_date_range(
+        start_date=dt.date(1980, 9, 29),
+        end_date=dt.date(1980, 10, 1),
+        hemisphere=SOUTH,
+        data_dir=tmp_path,
+        mask_and_scale=False,
+    )
+    assert packed_range.h37.dtype == np.int16
+    decoded_range = xr.decode_cf(packed_range)
+    assert np.all(np.isnan(decoded_range.h37.isel(time=1)))
+    assert_array_equal(decoded_range.h37.isel(time=0), decoded.h37)
+
+
+def test_get_nsidc_0007_tbs_from_disk_channels(tmp_path):
+    _write_mock_tb_files(
+        tmp_path,
+        filenames=[
+            "TBS/1980/SEP/800929S.18V",
+            "TBS/1980/SEP/800929S.37H",
+            "TBS/1980/SEP/800929S.37V",
+            "TBS/1980/OCT/801001S.37H",
+        ],
+    )
+
+    actual = nsidc_0007.get_nsidc_0007_tbs_from_disk(
+        date=dt.date(1980, 9, 29),
+        hemisphere=SOUTH,
+        data_dir=tmp_path,
+        channels=["v18", "h37"],
+    )
+    assert set(actual.data_vars) == {"v18", "h37"}
+
+    actual = nsidc_0007.get_nsidc_0007_tbs_from_disk_for_date_range(
+        start_date=dt.date(1980, 9, 29),
+        end_date=dt.date(1980, 10, 1),
+        hemisphere=SOUTH,
+        data_dir=tmp_path,
+        channels=["h37"],
+    )
+    assert set(actual.data_vars) == {"h37"}
+
+    with pytest.raises(ValueError):
+        nsidc_0007.get_nsidc_0007_tbs_from_disk_for_date_range(
+            start_date=dt.date(1980, 9, 29),
+            end_date=dt.date(1980, 10, 1),
+            hemisphere=SOUTH,
+            data_dir=tmp_path,
+            channels=["h18"],
+        )
@@ -54,3 +54,74 @@ def test_get_nsidc_0080_fp_on_disk(fs):
     )
 
     assert expected_file == actual
+
+
+def _write_mock_nsidc_0080_file(tmp_path):
+    data_dir = tmp_path / "2024.09.05"
+    data_dir.mkdir()
+    # As in the real data files, the x/y coordinates are in the root group.
+    tree = xr.DataTree.from_dict(
+        {
+            "/": xr.Dataset(coords={"y": [12.5, -12.5], "x": [-25.0, 0.0, 25.0]}),
+            **{
+                f"/{platform_id}": xr.Dataset(
+                    data_vars={
+                        f"TB_{platform_id}_NH_19H": (
+                            ("time", "y", "x"),
+                            [np.full((2, 3), offset, dtype=np.float32)],
+                        ),
+                    },
+                )
+                for offset, platform_id in enumerate(("F16", "F17", "F18"))
+            },
+        }
+    )
+    tree.to_netcdf(data_dir / "NSIDC0080_TB_PS_N25km_20240905_v2.0.nc")
+
+
+def _record_netcdf_closes(monkeypatch):
+    closed = []
+    close = xr.backends.NetCDF4DataStore.close
+
+    def _close(self, **kwargs):
+        closed.append(self)
+        return close(self, **kwargs)
+
+    monkeypatch.setattr(xr.backends.NetCDF4DataStore, "close", _close)
+
+    return closed
+
+
+def test_get_nsidc_0080_tbs_by_platform_from_disk(tmp_path):
+    _write_mock_nsidc_0080_file(tmp_path)
+
+    actual = nsidc_0080.get_nsidc_0080_tbs_by_platform_from_disk(
+        hemisphere="north",
+        date=dt.date(2024, 9, 5),
+        resolution="25",
+        platform_ids=["F16", "F18"],
+        data_dir=tmp_path,
+    )
+
+    assert list(actual.keys()) == ["F16", "F18"]
+    assert (actual["F16"].h19 == 0).all()
+    assert (actual["F18"].h19 == 2).all()
+
+
+def test_get_nsidc_0080_tbs_by_platform_from_disk_closes_file(tmp_path, monkeypatch):
+    _write_mock_nsidc_0080_file(tmp_path)
+    closed = _record_netcdf_closes(monkeypatch)
+
+    actual = nsidc_0080.get_nsidc_0080_tbs_by_platform_from_disk(
+        hemisphere="north",
+        date=dt.date(2024, 9, 5),
+        resolution="25",
+        platform_ids=["F17"],
+        data_dir=tmp_path,
+    )
+
+    # The data file (each group of the datatree) is closed, and the TBs are
+    # already in memory.
+    assert len(closed) == 4
+    assert actual["F17"].h19.variable._in_memory
+    assert (actual["F17"].h19 == 1).all()
@@ -0,0 +1,67 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+import xarray as xr
+from numpy.testing import assert_array_equal
+
+from pm_tb_data._types import NORTH, Window
+from pm_tb_data.fetch.amsr import nsidc_0802
+
+_DATE = dt.date(2023, 1, 1)
+
+
+def _write_mock_nsidc_0802_file(data_dir):
+    mock_ds = xr.Dataset(
+        data_vars={
+            "tb_19h": (
+                ("time", "y", "x"),
+                [np.arange(24, dtype=np.float64).reshape(4, 6)],
+            ),
+            "crs": ((), np.int32(0)),
+        },
+        coords={
+            "time": [np.datetime64("2023-01-01")],
+            "y": [37.5, 12.5, -12.5, -37.5],
+            "x": [-62.5, -37.5, -12.5, 12.5, 37.5, 62.5],
+        },
+    )
+    filepath = data_dir / "2023" / f"NSIDC-0802_TB_AMSR2_N_{_DATE:%Y%m%d}_v2.0.nc"
+    filepath.parent.mkdir(parents=True)
+    mock_ds.to_netcdf(filepath)
+
+    return mock_ds.squeeze()
+
+
+def test_get_nsidc_0802_tbs_from_disk_window_and_dtype(tmp_path):
+    mock_ds = _write_mock_nsidc_0802_file(tmp_path)
+    window = Window(row_start=1, row_stop=3, col_start=2, col_stop=5)
+
+    actual = nsidc_0802.get_nsidc_0802_tbs_from_disk(
+        date=_DATE,
+        hemisphere=NORTH,
+        data_dir=tmp_path,
+        dtype=np.float32,
+        window=window,
+    )
+
+    assert actual.tb_19h.dims == ("y", "x")
+    assert actual.tb_19h.shape == (2, 3)
+    assert_array_equal(actual.y, [12.5, -12.5])
+    assert_array_equal(actual.x, [-12.5, 12.5, 37.5])
+    assert_array_equal(actual.tb_19h, mock_ds.tb_19h[1:3, 2:5])
+    # Only floating point variables (the TBs) are cast.
+    assert actual.tb_19h.dtype == np.float32
+    assert actual.crs.dtype == np.int32
+
+
+def test_get_nsidc_0802_tbs_from_disk_window_out_of_bounds(tmp_path):
+    _write_mock_nsidc_0802_file(tmp_path)
+
+    with pytest.raises(ValueError):
+        nsidc_0802.get_nsidc_0802_tbs_from_disk(
+            date=_DATE,
+            hemisphere=NORTH,
+            data_dir=tmp_path,
+            window=Window(row_start=0, row_stop=5, col_start=0, col_stop=6),
+        )
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+import xarray as xr
+from numpy.testing import assert_array_equal
+from xarray.core import indexing
+
+from pm_tb_data._types import NORTH, SOUTH, Window
+from pm_tb_data.fetch import nsidc_binary
+
+
+def _write_mock_binary_tb_file(filepath, *, shape):
+    # Values in 0.1K, with a single missing (0) value in the upper-left corner.
+    raw = (np.arange(shape[0] * shape[1]) % 3000).astype("<i2").reshape(shape) + 500
+    raw[0, 0] = 0
+    raw.tofile(filepath)
+
+    return raw
+
+
+def test_read_binary_tb_file(tmp_path):
+    filepath = tmp_path / "800929S.37H"
+    raw = _write_mock_binary_tb_file(filepath, shape=(332, 316))
+
+    actual = nsidc_binary.read_binary_tb_file(filepath=filepath, hemisphere=SOUTH)
+
+    assert actual.dtype == np.float64
+    assert np.isnan(actual[0, 0])
+    assert_array_equal(actual.ravel()[1:], raw.ravel()[1:] * 0.1)
+
+
+def test_open_binary_tb_file_matches_read(tmp_path):
+    filepath = tmp_path / "800929N.37H"
+    _write_mock_binary_tb_file(filepath, shape=(448, 304))
+
+    eager = nsidc_binary.read_binary_tb_file(filepath=filepath, hemisphere=NORTH)
+    lazy = nsidc_binary.open_binary_tb_file(filepath=filepath, hemisphere=NORTH)
+    da = xr.DataArray(lazy, dims=("fake_y", "fake_x"))
+
+    assert_array_equal(da.isel(fake_y=slice(10, 20)).values, eager[10:20])
+    assert_array_equal(da.values, eager)
+
+
+def test_open_binary_tb_file_float32(tmp_path):
+    filepath = tmp_path / "800929N.37H"
+    raw = _write_mock_binary_tb_file(filepath, shape=(448, 304))
+
+    lazy = nsidc_binary.open_binary_tb_file(
+        filepath=filepath, hemisphere=NORTH, dtype=np.float32
+    )
+    actual = np.asarray(lazy)
+
+    assert actual.dtype == np.float32
+    assert np.isnan(actual[0, 0])
+    assert_array_equal(actual[1:], raw[1:] * np.float32(0.1))
+
+
+def test_scaled_int16_binary_array_raw_dtype(tmp_path):
+    filepath = tmp_path / "big_endian.dat"
+    raw = np.array([[0, 2500], [2600, 2700]], dtype=">i2")
+    raw.tofile(filepath)
+
+    lazy = nsidc_binary.ScaledInt16BinaryArray(
+        filepath=filepath,
+        shape=(2, 2),
+        scale_factor=0.1,
+        missing_value=0,
+        raw_dtype=">i2",
+    )
+    actual = xr.DataArray(indexing.LazilyIndexedArray(lazy), dims=("y", "x")).values
+
+    assert np.isnan(actual[0, 0])
+    assert_array_equal(actual.ravel()[1:], [250.0, 260.0, 270.0])
+
+
+def test_open_binary_tb_file_wrong_size(tmp_path):
+    filepath = tmp_path / "850804S.37H"
+    np.zeros(10, dtype="<i2").tofile(filepath)
+
+    actual = np.asarray(
+        nsidc_binary.open_binary_tb_file(filepath=filepath, hemisphere=SOUTH)
+    )
+
+    assert actual.shape == (332, 316)
+    assert np.all(np.isnan(actual))
+
+
+def test_open_binary_tb_file_raw(tmp_path):
+    filepath = tmp_path / "800929N.37H"
+    raw = _write_mock_binary_tb_file(filepath, shape=(448, 304))
+
+    actual = np.asarray(
+        nsidc_binary.open_binary_tb_file(
+            filepath=filepath, hemisphere=NORTH, mask_and_scale=False
+        )
+    )
+
+    assert actual.dtype == nsidc_binary.NSIDC_BINARY_TB_DTYPE
+    assert_array_equal(actual, raw)
+
+
+def test_read_binary_tb_file_window(tmp_path):
+    filepath = tmp_path / "800929N.37H"
+    _write_mock_binary_tb_file(filepath, shape=(448, 304))
+    window = Window(row_start=0, row_stop=100, col_start=50, col_stop=75)
+
+    full = nsidc_binary.read_binary_tb_file(filepath=filepath, hemisphere=NORTH)
+    actual = nsidc_binary.read_binary_tb_file(
+        filepath=filepath, hemisphere=NORTH, window=window
+    )
+
+    assert actual.shape == (100, 25)
+    assert_array_equal(actual, full[window.row_slice, window.col_slice])
+
+
+def test_read_binary_tb_file_window_out_of_bounds(tmp_path):
+    filepath = tmp_path / "800929N.37H"
+    _write_mock_binary_tb_file(filepath, shape=(448, 304))
+
+    with pytest.raises(ValueError):
+        nsidc_binary.read_binary_tb_file(
+            filepath=filepath,
+            hemisphere=NORTH,
+            window=Window(row_start=400, row_stop=500, col_start=0, col_stop=10),
+        )
+
+
+def test_decode_scaled_int16_needs_one_scale():
+    with pytest.raises(ValueError):
+        nsidc_binary.decode_scaled_int16([1], missing_value=None)
+    with pytest.raises(ValueError):
+        nsidc_binary.decode_scaled_int16(
+            [1], scale_factor=0.01, scale_divisor=100.0, missing_value=None
+        )
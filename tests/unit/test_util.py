@@ -0,0 +1,54 @@
+import re
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from pm_tb_data._types import Window
+from pm_tb_data.fetch.util import get_tb_var_names, select_window
+
+_VAR_PATTERN = re.compile(r"TB_F17_(?P<channel>\d{2})(?P<polarization>H|V)")
+_VAR_NAMES = ["TB_F17_19H", "TB_F17_19V", "TB_F17_37V", "TB_F18_19H", "crs"]
+
+
+def test_get_tb_var_names():
+    actual = get_tb_var_names(var_names=_VAR_NAMES, var_pattern=_VAR_PATTERN)
+
+    assert actual == {"h19": "TB_F17_19H", "v19": "TB_F17_19V", "v37": "TB_F17_37V"}
+
+
+def test_get_tb_var_names_channels():
+    actual = get_tb_var_names(
+        var_names=_VAR_NAMES,
+        var_pattern=_VAR_PATTERN,
+        channels=["v37", "h19"],
+    )
+
+    assert actual == {"v37": "TB_F17_37V", "h19": "TB_F17_19H"}
+
+
+def test_get_tb_var_names_missing_channels():
+    with pytest.raises(ValueError, match="h37"):
+        get_tb_var_names(
+            var_names=_VAR_NAMES,
+            var_pattern=_VAR_PATTERN,
+            channels=["v19", "h37"],
+        )
+
+
+def test_select_window():
+    data = xr.DataArray(np.arange(24).reshape(2, 3, 4), dims=("time", "y", "x"))
+    window = Window(row_start=1, row_stop=3, col_start=0, col_stop=2)
+
+    actual = select_window(data, window)
+
+    assert actual.dims == ("time", "y", "x")
+    assert actual.shape == (2, 2, 2)
+    assert actual.values.tolist() == [[[4, 5], [8, 9]], [[16, 17], [20, 21]]]
+
+
+def test_select_window_out_of_bounds():
+    data = xr.DataArray(np.zeros((3, 4)), dims=("y", "x"))
+
+    with pytest.raises(ValueError):
+        select_window(data, Window(row_start=0, row_stop=3, col_start=2, col_stop=5))